@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Nomefile: acJobsAction.py
+# -*- coding: utf-8 -*-
+
+"""
+acJobsAction - Record precalcolato di un'azione di JOBS_TAB_ACTIONS
+I gruppi di azioni e utenti sono maschere di bit: il controllo dei
+permessi è un AND fra interi.
+"""
+
+import os
+from typing import Dict, Any, Optional, Union, List
+import aiSys
+
+
+def GroupsMask(sGroups: str, dictGroupsBit: Dict[str, int]) -> int:
+    """
+    Ritorna la maschera di bit di un elenco di gruppi separati da virgola.
+    Un gruppo non presente in dictGroupsBit riceve un nuovo bit.
+
+    Args:
+        sGroups: Gruppi separati da virgola (es. USER_GROUPS, ACT_GROUPS)
+        dictGroupsBit: Gruppo -> bit, aggiornato con i gruppi nuovi
+
+    Returns:
+        int: Maschera dei gruppi, 0 se nessun gruppo
+    """
+    nMask = 0
+    for sGroup in aiSys.StringToArray(sGroups, ","):
+        nBit = dictGroupsBit.get(sGroup)
+        if nBit is None:
+            nBit = 1 << len(dictGroupsBit)
+            dictGroupsBit[sGroup] = nBit
+        nMask |= nBit
+    return nMask
+
+
+class acJobsAction:
+    """
+    Dati di un'azione usati all'esecuzione dei job (sola lettura).
+    """
+
+    __slots__ = ("sId", "sName", "nGroups", "bGroups", "bEnabled",
+                 "sScript", "sPath", "sParams", "nTimeout", "bResident")
+
+    def __init__(self, dictAction: Dict[str, Any], dictGroupsBit: Dict[str, int]):
+        """
+        Crea il record da una riga di JOBS_TAB_ACTIONS (già espansa).
+
+        Args:
+            dictAction: Riga della tabella azioni
+            dictGroupsBit: Gruppo -> bit
+        """
+        sGroups = dictAction.get("ACT_GROUPS", "")
+        sScript = dictAction.get("ACT_SCRIPT", "")
+
+        self.sId = dictAction.get("ACT_ID", "")
+        self.sName = dictAction.get("ACT_NAME", "")
+        self.nGroups = GroupsMask(sGroups, dictGroupsBit)
+        self.bGroups = bool(aiSys.StringToArray(sGroups, ","))     # False = azione per tutti
+        self.bEnabled = aiSys.StringBool(dictAction.get("ACT_ENABLED", "False"))
+        # Path assoluto: lo script verificato è quello avviato dalla cartella del job
+        self.sScript = os.path.abspath(sScript) if sScript else ""
+        self.sPath = dictAction.get("ACT_PATH", "")
+        self.sParams = dictAction.get("ACT_PARAMS", "")
+        self.nTimeout = aiSys.StringToNum(dictAction.get("ACT_TIMEOUT", ""))
+        # Colonna facoltativa: job eseguiti dal worker residente (acJobsResident)
+        self.bResident = aiSys.StringBool(dictAction.get("ACT_RESIDENT", "False"))
+
+    def isAllowed(self, nUserGroups: int) -> bool:
+        """
+        Ritorna True se un utente con la maschera nUserGroups può eseguire l'azione.
+        """
+        return not self.bGroups or bool(self.nGroups & nUserGroups)
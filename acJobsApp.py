@@ -8,10 +8,16 @@ Una ntJobApp è un'applicazione batch che:
 2. Esegue uno o più comandi (jobs) tramite callback
 3. Restituisce un file .end con i risultati
 4. Termina con codice: 0=OK, 1=Errore INI, 2=Errore job
+
+Con il parametro --serve l'applicazione resta attiva (worker residente):
+legge da stdin una richiesta JSON per riga e risponde su stdout, una riga
+per richiesta, con il contenuto del file .end (vedi Serve).
 """
 
 import sys
 import os
+import json
+import shlex
 import aiSys
 
 class acJobsApp:
@@ -92,6 +98,35 @@ class acJobsApp:
         
         print(f"Letto {self.sJobIni}")
         
+        sResult = self.Load()
+        if sResult != "":
+            return self._return_with_convention(sResult)
+        
+        # Avvia sistema di log
+        sResult = self.jLog.Start(self.sLogFile)
+        if sResult != "":
+            return self._return_with_convention(sResult)
+        
+        sResult = self.Check()
+        
+        # Log finale e ritorno
+        self.Log0(sResult)
+        return self._return_with_convention(sResult)
+    
+    # =========================================================================
+    # METODO: Load
+    # =========================================================================
+    def Load(self):
+        """
+        Verifica ed espande i jobs letti in self.dictJobs e ne estrae
+        i parametri di configurazione.
+        
+        Returns:
+            str: "" se successo, messaggio di errore altrimenti
+        """
+        self.sProc = "Load"
+        sResult = ""
+        
         # Verifica chiavi riservate nelle sezioni (eccetto CONFIG)
         reserved_keys = ["TS.START", "TS.END", "RETURN.TYPE", "RETURN.VALUE"]
         reserved_prefix = "RETURN.FILE."
@@ -164,10 +199,20 @@ class acJobsApp:
         self.sName = self.Config("NAME")
         self.bErrExit = aiSys.StringBool(self.Config("EXIT"))
         
-        # Avvia sistema di log
-        sResult = self.jLog.Start(self.sLogFile)
-        if sResult != "":
-            return self._return_with_convention(sResult)
+        return self._return_with_convention(sResult)
+    
+    # =========================================================================
+    # METODO: Check
+    # =========================================================================
+    def Check(self):
+        """
+        Rimuove la password dalla configurazione e verifica NAME e TYPE.
+        
+        Returns:
+            str: "" se successo, messaggio di errore altrimenti
+        """
+        self.sProc = "Check"
+        sResult = ""
         
         # Rimuove password dalla configurazione (se presente)
         if "PASSWORD" in self.dictJobs.get("CONFIG", {}):
@@ -180,8 +225,6 @@ class acJobsApp:
         if self.sType is not None and not str(self.sType).startswith("NTJOBS.APP."):
             sResult = "Type INI non NTJOBSAPP"
         
-        # Log finale e ritorno
-        self.Log0(sResult)
         return self._return_with_convention(sResult)
     
     # =========================================================================
@@ -407,6 +450,34 @@ class acJobsApp:
             int: Codice di uscita (0=OK, 1=Errore INI, 2=Errore job)
         """
         self.sProc = "End"
+        
+        nResult = self.EndDict(sResult)
+        
+        # Fase 3: Salva file .end
+        sSaveResult = aiSys.save_dict_to_ini(self.dictJobs, self.sJobEnd)
+        if sSaveResult == "":
+            print(f"Creato file {self.sJobEnd}")
+        
+        # Log finale
+        self.Log(sSaveResult, f"Fine applicazione {self.sName}")
+        
+        # Ritorna codice di uscita
+        return nResult
+    
+    # =========================================================================
+    # METODO: EndDict
+    # =========================================================================
+    def EndDict(self, sResult):
+        """
+        Completa self.dictJobs con esito e timestamp nella sezione CONFIG,
+        come nel file .end.
+        
+        Args:
+            sResult (str): Risultato finale dell'esecuzione
+            
+        Returns:
+            int: Codice di uscita (0=OK, 1=Errore INI, 2=Errore job)
+        """
         bIsFatalError = False
         nResult = 0
         
@@ -442,16 +513,111 @@ class acJobsApp:
         # Unisci con priorità a dictTemp (sovrascrive se esiste già)
         self.dictJobs["CONFIG"].update(dictTemp)
         
-        # Fase 3: Salva file .end
-        sSaveResult = aiSys.save_dict_to_ini(self.dictJobs, self.sJobEnd)
-        if sSaveResult == "":
-            print(f"Creato file {self.sJobEnd}")
+        return nResult
+    
+    # =========================================================================
+    # METODO: Serve
+    # =========================================================================
+    def Serve(self, cbCommands, hIn=None, hOut=None):
+        """
+        Modalità worker residente: esegue le richieste lette da hIn senza
+        riavviare l'interprete per ogni job.
         
-        # Log finale
-        self.Log(sSaveResult, f"Fine applicazione {self.sName}")
+        Ogni riga di hIn è un oggetto JSON:
+            {"id": ..., "cwd": cartella del job, "params": ACT_PARAMS dell'azione,
+             "ini": dizionario del file .ini}
+        Per ogni richiesta scrive su hOut una riga JSON:
+            {"id": ..., "code": codice di uscita, "end": dizionario del file .end}
+        Le stampe dell'applicazione vanno su stderr. Termina a fine input.
         
-        # Ritorna codice di uscita
-        return nResult
+        Args:
+            cbCommands (function): Funzione callback da chiamare per ogni job
+            hIn: Stream delle richieste (default sys.stdin)
+            hOut: Stream delle risposte (default sys.stdout)
+            
+        Returns:
+            int: Codice di uscita (0=OK, 1=Errore avvio)
+        """
+        self.sProc = "Serve"
+        
+        hIn = sys.stdin if hIn is None else hIn
+        hOut = sys.stdout if hOut is None else hOut
+        sys.stdout = sys.stderr
+        
+        sResult = self.jLog.Start(self.sLogFile)
+        if sResult != "":
+            self._return_with_convention(sResult)
+            return 1
+        
+        for sLine in hIn:
+            if not sLine.strip():
+                continue
+            
+            try:
+                dictRequest = json.loads(sLine)
+                dictResponse = self.ServeJob(dictRequest, cbCommands)
+            except Exception as e:
+                dictResponse = {
+                    "id": None,
+                    "code": 1,
+                    "end": {"CONFIG": {"RETURN.TYPE": "E", "RETURN.VALUE": f"Richiesta non valida: {str(e)}"}}
+                }
+            
+            hOut.write(json.dumps(dictResponse, ensure_ascii=False) + "\n")
+            hOut.flush()
+        
+        return 0
+    
+    # =========================================================================
+    # METODO: ServeJob
+    # =========================================================================
+    def ServeJob(self, dictRequest, cbCommands):
+        """
+        Esegue una richiesta del worker residente come Start, Run ed End,
+        senza leggere o scrivere file .ini/.end. Durante Run sys.argv
+        contiene i parametri dell'azione, come nell'esecuzione non residente.
+        
+        Args:
+            dictRequest (dict): Richiesta {"id", "cwd", "params", "ini"}
+            cbCommands (function): Funzione callback da chiamare per ogni job
+            
+        Returns:
+            dict: Risposta {"id", "code", "end"}
+        """
+        # I file dei job sono relativi alla cartella del job
+        sCwd = dictRequest.get("cwd", "")
+        if sCwd:
+            os.chdir(sCwd)
+        
+        self.tsStart = aiSys.Timestamp()
+        self.dictJob = {}
+        self.dictJobs = dictRequest.get("ini", {})
+        self.sJobIni = os.path.abspath("ntjobsapp.ini")
+        self.sJobEnd = os.path.abspath("ntjobsapp.end")
+        
+        try:
+            asParams = shlex.split(dictRequest.get("params", ""))
+            sResult = ""
+        except ValueError as e:
+            sResult = f"Parametri non validi: {str(e)}"
+        if sResult == "":
+            sResult = "Richiesta senza jobs" if not self.dictJobs else self.Load()
+        if sResult == "":
+            sResult = self.Check()
+        if sResult == "":
+            asArgv = sys.argv
+            sys.argv = [asArgv[0]] + asParams
+            try:
+                sResult = self.Run(cbCommands)
+            except Exception as e:
+                sResult = f"Errore non gestito: {str(e)}"
+            finally:
+                sys.argv = asArgv
+        
+        nResult = self.EndDict(sResult)
+        self.Log(sResult, f"Fine richiesta {dictRequest.get('id')} applicazione {self.sName}")
+        
+        return {"id": dictRequest.get("id"), "code": nResult, "end": self.dictJobs}
     
     # =========================================================================
     # METODI DI LOG (remapping)
@@ -575,6 +741,10 @@ def main():
     global jData
     jData = acJobsApp()
     
+    # Worker residente: richieste JSON su stdin, risposte su stdout
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        sys.exit(jData.Serve(esempio_callback))
+    
     # 2. Esegui sResult=jData.Start()
     sResult = jData.Start()
     
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# Nomefile: acJobsBilling.py
+# -*- coding: utf-8 -*-
+
+"""
+acJobsBilling - Scrittura bufferizzata del file di billing
+Mantiene il file CSV aperto, accumula i record in memoria e li scrive
+a blocchi (per numero di record o per tempo), con rotazione del file
+per giorno o per dimensione.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any, Optional, Union, List
+import aiSys
+
+
+class acJobsBilling:
+    """
+    Writer del file di billing condiviso tra i worker (thread safe).
+    """
+
+    def __init__(self):
+        """Inizializza il writer."""
+        self.sFile = ""
+        self.asHeader = []
+        self.sDelimiter = ";"
+        self.nFlushRecords = 100       # Record in buffer che forzano la scrittura
+        self.nFlushTime = 10.0         # Secondi massimi di un record in buffer
+        self.bSync = True              # fsync ad ogni scrittura del buffer
+        self.sRotate = ""              # "", "DAY" o "SIZE"
+        self.nRotateSize = 10485760    # Byte massimi del file con rotazione SIZE
+        self.hFile = None
+        self.sDay = ""                 # Giorno (AAAAMMGG) dei record del file aperto
+        self.asBuffer = []
+        self.nBufferTime = 0.0         # Istante del primo record in buffer (monotonic)
+        self.lock = threading.Lock()
+        self.evEnd = threading.Event()
+        self.jThread = None
+
+    def Start(self, sFile: str, asHeader: List[str], sDelimiter: str = ";",
+              nFlushRecords: int = 100, nFlushTime: float = 10.0, bSync: bool = True,
+              sRotate: str = "", nRotateSize: int = 10485760) -> str:
+        """
+        Apre il file di billing e avvia la scrittura periodica del buffer.
+
+        Args:
+            sFile: File CSV di billing
+            asHeader: Campi del record
+            sDelimiter: Delimitatore CSV
+            nFlushRecords: Record in buffer che forzano la scrittura
+            nFlushTime: Secondi massimi di attesa di un record in buffer
+            bSync: fsync del file ad ogni scrittura
+            sRotate: Rotazione "DAY", "SIZE" o "" (nessuna)
+            nRotateSize: Byte massimi del file per la rotazione SIZE
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Start"
+        sResult = ""
+
+        self.sFile = sFile
+        self.asHeader = list(asHeader)
+        self.sDelimiter = sDelimiter
+        self.nFlushRecords = max(1, int(nFlushRecords))
+        self.nFlushTime = max(0.1, float(nFlushTime))
+        self.bSync = bSync
+        self.sRotate = sRotate.upper()
+        self.nRotateSize = int(nRotateSize)
+
+        if self.sRotate not in ["", "DAY", "SIZE"]:
+            sResult = f"Rotazione billing non valida: {sRotate}"
+
+        if sResult == "":
+            with self.lock:
+                sResult = self.FileOpen()
+
+        if sResult == "":
+            self.evEnd.clear()
+            self.jThread = threading.Thread(target=self._run, name="acJobsBilling", daemon=True)
+            self.jThread.start()
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def _run(self) -> None:
+        """Scrive il buffer quando il record più vecchio supera nFlushTime."""
+        while not self.evEnd.wait(min(1.0, self.nFlushTime)):
+            with self.lock:
+                if self.asBuffer and time.monotonic() - self.nBufferTime >= self.nFlushTime:
+                    self.FlushBuffer()
+
+    def FileOpen(self) -> str:
+        """
+        Apre il file in append, scrivendo l'header se vuoto (con lock acquisito).
+        """
+        sProc = "FileOpen"
+        sResult = ""
+
+        try:
+            sDir = os.path.dirname(self.sFile)
+            if sDir:
+                os.makedirs(sDir, exist_ok=True)
+            self.hFile = open(self.sFile, 'a', encoding='utf-8', newline='')
+            if self.hFile.tell() == 0:
+                self.hFile.write(self.sDelimiter.join(self.asHeader) + '\n')
+                self.hFile.flush()
+                self.sDay = time.strftime("%Y%m%d")
+            else:
+                self.sDay = time.strftime("%Y%m%d", time.localtime(os.path.getmtime(self.sFile)))
+        except Exception as e:
+            self.hFile = None
+            sResult = f"Errore apertura file billing {self.sFile}: {str(e)}"
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def FileRotate(self) -> str:
+        """
+        Chiude il file corrente, lo rinomina con giorno o timestamp e ne apre uno nuovo
+        (con lock acquisito).
+        """
+        sProc = "FileRotate"
+        sResult = ""
+
+        sBase, sExt = os.path.splitext(self.sFile)
+        if self.sRotate == "DAY":
+            sFileOld = f"{sBase}_{self.sDay}{sExt}"
+        else:
+            sFileOld = f"{sBase}_{aiSys.Timestamp().replace(':', '')}{sExt}"
+
+        try:
+            self.hFile.close()
+            self.hFile = None
+            # Rotazione DAY ripetuta nello stesso giorno (es. riavvio): non sovrascrive
+            nCounter = 0
+            sFileDst = sFileOld
+            while os.path.exists(sFileDst):
+                nCounter += 1
+                sFileDst = f"{os.path.splitext(sFileOld)[0]}_{nCounter}{sExt}"
+            os.replace(self.sFile, sFileDst)
+        except Exception as e:
+            sResult = f"Errore rotazione file billing {self.sFile}: {str(e)}"
+
+        # Il billing continua comunque sul file (nuovo o vecchio)
+        sResultOpen = self.FileOpen()
+        if sResultOpen != "":
+            sResult = aiSys.StringAppend(sResult, sResultOpen, ". ")
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Write(self, dictRecord: Dict[str, Any]) -> str:
+        """
+        Accoda un record al buffer, scritto al raggiungimento di nFlushRecords.
+
+        Args:
+            dictRecord: Record con i campi dell'header
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Write"
+        sResult = ""
+
+        sLinea = aiSys.csv_line_from_dict(self.asHeader, dictRecord, self.sDelimiter)
+
+        with self.lock:
+            if not self.asBuffer:
+                self.nBufferTime = time.monotonic()
+            self.asBuffer.append(sLinea + '\n')
+            if len(self.asBuffer) >= self.nFlushRecords:
+                sResult = self.FlushBuffer()
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Flush(self) -> str:
+        """
+        Scrive su file i record in buffer.
+
+        Returns:
+            str: sResult
+        """
+        with self.lock:
+            return self.FlushBuffer()
+
+    def FlushBuffer(self) -> str:
+        """
+        Scrive il buffer su file, ruotando il file se necessario (con lock acquisito).
+        """
+        sProc = "FlushBuffer"
+        sResult = ""
+
+        if not self.asBuffer:
+            return sResult
+
+        if self.hFile is None:
+            sResult = self.FileOpen()
+
+        if sResult == "" and self.sRotate == "DAY" and self.sDay != time.strftime("%Y%m%d"):
+            sResult = self.FileRotate()
+        elif sResult == "" and self.sRotate == "SIZE" and self.hFile.tell() >= self.nRotateSize:
+            sResult = self.FileRotate()
+
+        # Errore di rotazione: si scrive comunque se il file è aperto
+        if self.hFile is not None:
+            try:
+                self.hFile.write("".join(self.asBuffer))
+                self.hFile.flush()
+                if self.bSync:
+                    os.fsync(self.hFile.fileno())
+                self.asBuffer = []
+            except Exception as e:
+                sResult = f"Errore scrittura file billing {self.sFile}: {str(e)}"
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def End(self) -> str:
+        """
+        Scrive il buffer residuo e chiude il file.
+
+        Returns:
+            str: sResult
+        """
+        self.evEnd.set()
+        if self.jThread is not None:
+            self.jThread.join(5)
+            self.jThread = None
+
+        with self.lock:
+            sResult = self.FlushBuffer()
+            if self.hFile is not None:
+                try:
+                    self.hFile.close()
+                except Exception:
+                    pass
+                self.hFile = None
+
+        return sResult
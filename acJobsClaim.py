@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# Nomefile: acJobsClaim.py
+# -*- coding: utf-8 -*-
+
+"""
+acJobsClaim - Lease delle cartelle jobs per più nodi aiJobsOS sulla stessa inbox
+Un nodo lavora una cartella solo dopo averne creato il file jobs.claim
+(O_EXCL: uno solo riesce) con il proprio id. Il nodo rinnova il lease
+aggiornando la data di modifica del file (heartbeat); un claim non
+rinnovato entro il lease è scaduto (nodo terminato) e può essere
+rilevato da un altro nodo con una rename atomica.
+Le date sono quelle del file system condiviso: il lease deve essere
+molto più lungo degli scarti di orologio tra i nodi.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any, Optional, Union, List
+import aiSys
+
+CLAIM_FILE = "jobs.claim"
+
+
+class acJobsClaim:
+    """
+    Claim delle cartelle tenute da questo nodo e thread di heartbeat.
+    Thread safe: usato anche dai worker del pool.
+    """
+
+    def __init__(self):
+        """Inizializza l'elenco dei claim."""
+        self.sNode = ""
+        self.nLease = 60.0
+        self.jLog = None
+        self.dictHeld = {}             # Cartella -> file jobs.claim tenuto da questo nodo
+        self.lock = threading.Lock()
+        self.evStop = threading.Event()
+        self.jThread = None
+
+    def Start(self, sNode: str, nLease: float = 60, jLog: Any = None) -> str:
+        """
+        Imposta l'id del nodo (unico tra i nodi) e la durata del lease in
+        secondi; avvia l'heartbeat, ogni nLease/4 secondi.
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Start"
+        sResult = ""
+
+        self.sNode = sNode
+        self.nLease = nLease
+        self.jLog = jLog
+
+        if not sNode or "\t" in sNode or "\n" in sNode:
+            sResult = f"Id nodo non valido: {sNode!r}"
+        elif nLease <= 0:
+            sResult = f"Durata lease non valida: {nLease}"
+        else:
+            self.evStop.clear()
+            self.jThread = threading.Thread(target=self._heartbeat, name="acJobsClaim", daemon=True)
+            self.jThread.start()
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Log(self, sText: str, sType: str = "INFO") -> None:
+        """Scrive sul log, se presente (sType "ERR" per gli errori)."""
+        if self.jLog is not None:
+            self.jLog.Log(sType, sText)
+
+    def Claim(self, sPath: str) -> bool:
+        """
+        Acquisisce il lease della cartella: True se ora è di questo nodo
+        (anche se lo era già), False se è di un altro nodo attivo o se la
+        cartella non esiste più.
+        """
+        sFile = aiSys.PathMake(sPath, CLAIM_FILE)
+
+        with self.lock:
+            if sPath in self.dictHeld:
+                return True
+
+        # Al massimo un tentativo di rilevare un claim scaduto
+        for nTry in range(2):
+            try:
+                nFd = os.open(sFile, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if nTry == 0 and self.Takeover(sFile):
+                    continue
+                return False
+            except OSError:
+                return False
+
+            try:
+                os.write(nFd, f"{self.sNode}\t{os.getpid()}\t{aiSys.Timestamp()}\n".encode("utf-8"))
+                os.fsync(nFd)
+            finally:
+                os.close(nFd)
+            with self.lock:
+                self.dictHeld[sPath] = sFile
+            return True
+
+        return False
+
+    def Owner(self, sFile: str) -> str:
+        """
+        Ritorna l'id del nodo che ha scritto il file di claim, "" se non leggibile.
+        """
+        try:
+            with open(sFile, 'r', encoding='utf-8') as hFile:
+                return hFile.readline().split("\t")[0].strip()
+        except (OSError, UnicodeDecodeError):
+            return ""
+
+    def isStale(self, sFile: str) -> bool:
+        """
+        True se il claim è scaduto, o se è di questo nodo ma non è tenuto
+        (esecuzione precedente del nodo, interrotta).
+        """
+        try:
+            nAge = time.time() - os.stat(sFile).st_mtime
+        except OSError:
+            return False
+        if nAge > self.nLease:
+            return True
+        return self.Owner(sFile) == self.sNode
+
+    def Takeover(self, sFile: str) -> bool:
+        """
+        Rimuove un claim scaduto. La rename su nome univoco riesce a un solo
+        nodo; se nel frattempo il claim è stato rinnovato o sostituito
+        (non più scaduto) è ripristinato.
+
+        Returns:
+            bool: True se il claim è stato rimosso
+        """
+        if not self.isStale(sFile):
+            return False
+
+        sOwner = self.Owner(sFile)
+        sFileTemp = f"{sFile}.{self.sNode}.{time.time_ns()}"
+        try:
+            os.rename(sFile, sFileTemp)
+        except OSError:
+            return False
+
+        try:
+            if not self.isStale(sFileTemp):
+                # Claim nuovo di un altro nodo: rimesso al suo posto (senza sovrascrivere)
+                try:
+                    os.link(sFileTemp, sFile)
+                except OSError:
+                    pass
+                return False
+        finally:
+            try:
+                os.remove(sFileTemp)
+            except OSError:
+                pass
+
+        self.Log(f"Rilevato claim scaduto del nodo {sOwner or '?'}: {sFile}")
+        return True
+
+    def Release(self, sPath: str, sPathClaim: str = "") -> None:
+        """
+        Rilascia il lease della cartella sPath e ne rimuove il file di claim,
+        che si trova in sPathClaim se la cartella è stata spostata.
+        """
+        with self.lock:
+            self.dictHeld.pop(sPath, None)
+
+        sFile = aiSys.PathMake(sPathClaim or sPath, CLAIM_FILE)
+        if self.Owner(sFile) == self.sNode:
+            try:
+                os.remove(sFile)
+            except OSError:
+                pass
+
+    def _heartbeat(self) -> None:
+        """
+        Rinnova i claim tenuti. Un claim rimosso o rilevato da un altro
+        nodo (heartbeat fermo oltre il lease) non è più tenuto.
+        """
+        while not self.evStop.wait(self.nLease / 4):
+            with self.lock:
+                asItems = list(self.dictHeld.items())
+            for sPath, sFile in asItems:
+                if self.Owner(sFile) == self.sNode:
+                    try:
+                        os.utime(sFile)
+                        continue
+                    except OSError:
+                        pass
+                with self.lock:
+                    if self.dictHeld.get(sPath) != sFile:
+                        continue
+                    self.dictHeld.pop(sPath, None)
+                self.Log(f"Claim perso: {sFile}", "ERR")
+
+    def End(self) -> None:
+        """
+        Ferma l'heartbeat. I claim ancora tenuti scadono dopo il lease.
+        """
+        self.evStop.set()
+        if self.jThread is not None:
+            self.jThread.join(5)
+            self.jThread = None
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# Nomefile: acJobsInbox.py
+# -*- coding: utf-8 -*-
+
+"""
+acJobsInbox - Indice dello stato delle cartelle jobs.ini nella inbox
+Mantiene lo stato in memoria e lo registra in un journal append-only
+(inbox.jrn nella cartella inbox), ricostruibile dal disco.
+Con inbox condivisa tra più nodi ogni nodo ha il proprio journal e
+riallinea l'indice al disco ad ogni ciclo (Refresh).
+"""
+
+import os
+import threading
+from typing import Dict, Any, Optional, Union, List
+import aiSys
+
+# Stati di una cartella della inbox
+INBOX_QUEUED = "QUEUED"        # jobs.ini da eseguire
+INBOX_RUNNING = "RUNNING"      # jobs.ini in esecuzione
+INBOX_ENDED = "ENDED"          # jobs.end scritto, da archiviare
+INBOX_ERROR = "ERROR"          # Esecuzione non conclusa dopo EXEC.RETRY tentativi
+INBOX_ARCHIVED = "ARCHIVED"    # Spostata in archivio, rimossa dall'indice
+
+INBOX_STATES = [INBOX_QUEUED, INBOX_RUNNING, INBOX_ENDED, INBOX_ERROR, INBOX_ARCHIVED]
+
+
+class acJobsInbox:
+    """
+    Indice delle cartelle della inbox e del loro stato.
+    Thread safe: aggiornato anche dai worker del pool.
+    """
+
+    def __init__(self):
+        """Inizializza l'indice."""
+        self.sPathInbox = ""
+        self.sFileJrn = ""
+        self.dictState = {}            # Nome cartella -> stato
+        self.hJrn = None
+        self.nJrnLines = 0             # Righe del journal, per la compattazione
+        self.lock = threading.Lock()
+
+    def Start(self, sPathInbox: str, bRebuild: bool = False, sName: str = "inbox") -> str:
+        """
+        Carica l'indice dal journal sName.jrn, o lo ricostruisce dal disco
+        se il journal manca o se richiesto. Le cartelle rimaste RUNNING
+        tornano QUEUED; quelle in ERROR restano tali fino alla ricostruzione
+        (INBOX.REBUILD), che le rimette in coda.
+        """
+        sProc = "Start"
+        sResult = ""
+
+        self.sPathInbox = sPathInbox
+        self.sFileJrn = aiSys.PathMake(sPathInbox, sName, "jrn")
+
+        try:
+            os.makedirs(sPathInbox, exist_ok=True)
+        except Exception as e:
+            sResult = f"Errore creazione path inbox {sPathInbox}: {str(e)}"
+
+        if sResult == "":
+            if bRebuild or not aiSys.FileExists(self.sFileJrn):
+                sResult = self.Rebuild()
+            else:
+                sResult = self.Load()
+
+        if sResult == "":
+            for sName, sState in self.dictState.items():
+                if sState == INBOX_RUNNING:
+                    self.dictState[sName] = INBOX_QUEUED
+            sResult = self.Compact()
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Load(self) -> str:
+        """
+        Rilegge il journal: vale l'ultimo stato registrato per ogni cartella.
+        """
+        sProc = "Load"
+        sResult = ""
+
+        dictState = {}
+        try:
+            with open(self.sFileJrn, 'r', encoding='utf-8') as hFile:
+                for sLine in hFile:
+                    asFields = sLine.rstrip("\n").split("\t")
+                    # Riga incompleta (scrittura interrotta): ignorata
+                    if len(asFields) != 3 or asFields[1] not in INBOX_STATES:
+                        continue
+                    sState, sName = asFields[1], asFields[2]
+                    if sState == INBOX_ARCHIVED:
+                        dictState.pop(sName, None)
+                    else:
+                        dictState[sName] = sState
+        except Exception as e:
+            sResult = f"Errore lettura journal {self.sFileJrn}: {str(e)}"
+
+        if sResult == "":
+            self.dictState = dictState
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Rebuild(self) -> str:
+        """
+        Ricostruisce l'indice dalle cartelle presenti nella inbox.
+        """
+        sProc = "Rebuild"
+        sResult = ""
+
+        dictState = {}
+        try:
+            for sItem in sorted(os.listdir(self.sPathInbox)):
+                sPath = aiSys.PathMake(self.sPathInbox, sItem)
+                if not os.path.isdir(sPath):
+                    continue
+                if not aiSys.FileExists(aiSys.PathMake(sPath, "jobs", "ini")):
+                    continue
+                if aiSys.FileExists(aiSys.PathMake(sPath, "jobs", "end")):
+                    dictState[sItem] = INBOX_ENDED
+                else:
+                    dictState[sItem] = INBOX_QUEUED
+        except Exception as e:
+            sResult = f"Errore scansione inbox {self.sPathInbox}: {str(e)}"
+
+        if sResult == "":
+            self.dictState = dictState
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Refresh(self) -> str:
+        """
+        Riallinea l'indice alle cartelle della inbox (inbox condivisa):
+        aggiunge quelle portate da altri nodi e toglie quelle non più
+        presenti (archiviate da altri nodi). Lo stato delle cartelle già in
+        indice non cambia.
+        """
+        sProc = "Refresh"
+        sResult = ""
+
+        try:
+            with os.scandir(self.sPathInbox) as jScan:
+                asItems = sorted(jEntry.name for jEntry in jScan if jEntry.is_dir())
+        except Exception as e:
+            sResult = f"Errore scansione inbox {self.sPathInbox}: {str(e)}"
+            return aiSys.ErrorProc(sResult, sProc)
+
+        with self.lock:
+            dictState = dict(self.dictState)
+        setItems = set(asItems)
+
+        dictNew = {}
+        for sItem in asItems:
+            if sItem in dictState:
+                continue
+            sPath = aiSys.PathMake(self.sPathInbox, sItem)
+            # Cartella senza jobs.ini: in preparazione (Move) o non di aiJobsOS
+            if not aiSys.FileExists(aiSys.PathMake(sPath, "jobs", "ini")):
+                continue
+            if aiSys.FileExists(aiSys.PathMake(sPath, "jobs", "end")):
+                dictNew[sItem] = INBOX_ENDED
+            else:
+                dictNew[sItem] = INBOX_QUEUED
+        for sItem, sState in dictState.items():
+            if sItem not in setItems and sState != INBOX_RUNNING:
+                dictNew[sItem] = INBOX_ARCHIVED
+
+        for sItem, sState in dictNew.items():
+            sResult = self.Set(sItem, sState)
+            if sResult != "":
+                break
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Compact(self) -> str:
+        """
+        Riscrive il journal con il solo stato corrente (sostituzione atomica).
+        """
+        sProc = "Compact"
+        sResult = ""
+
+        sFileTemp = self.sFileJrn + ".tmp"
+        sTs = aiSys.Timestamp()
+
+        with self.lock:
+            self.JrnClose()
+            try:
+                with open(sFileTemp, 'w', encoding='utf-8') as hFile:
+                    for sName, sState in self.dictState.items():
+                        hFile.write(f"{sTs}\t{sState}\t{sName}\n")
+                    hFile.flush()
+                    os.fsync(hFile.fileno())
+                os.replace(sFileTemp, self.sFileJrn)
+                self.nJrnLines = len(self.dictState)
+                self.hJrn = open(self.sFileJrn, 'a', encoding='utf-8')
+            except Exception as e:
+                sResult = f"Errore scrittura journal {self.sFileJrn}: {str(e)}"
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Set(self, sPath: str, sState: str) -> str:
+        """
+        Registra il nuovo stato di una cartella (path completo o nome).
+        """
+        sProc = "Set"
+        sResult = ""
+
+        sName = os.path.basename(os.path.normpath(sPath))
+
+        with self.lock:
+            if sState == INBOX_ARCHIVED:
+                self.dictState.pop(sName, None)
+            else:
+                self.dictState[sName] = sState
+
+            if self.hJrn is not None:
+                try:
+                    self.hJrn.write(f"{aiSys.Timestamp()}\t{sState}\t{sName}\n")
+                    self.hJrn.flush()
+                    os.fsync(self.hJrn.fileno())
+                    self.nJrnLines += 1
+                except Exception as e:
+                    sResult = f"Errore scrittura journal {self.sFileJrn}: {str(e)}"
+
+            bCompact = self.nJrnLines > 1000 + 4 * len(self.dictState)
+
+        if sResult == "" and bCompact:
+            sResult = self.Compact()
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def State(self, sPath: str) -> str:
+        """
+        Ritorna lo stato di una cartella, "" se non presente.
+        """
+        sName = os.path.basename(os.path.normpath(sPath))
+        with self.lock:
+            return self.dictState.get(sName, "")
+
+    def List(self, sState: str) -> List[str]:
+        """
+        Ritorna i nomi delle cartelle nello stato indicato, in ordine di arrivo.
+        """
+        with self.lock:
+            return [sName for sName, sValue in self.dictState.items() if sValue == sState]
+
+    def JrnClose(self) -> None:
+        """Chiude il journal (chiamato con lock acquisito)."""
+        if self.hJrn is not None:
+            try:
+                self.hJrn.close()
+            except Exception:
+                pass
+            self.hJrn = None
+
+    def End(self) -> None:
+        """Chiude il journal."""
+        with self.lock:
+            self.JrnClose()
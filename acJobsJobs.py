@@ -9,11 +9,12 @@ acJobsJobs - Classe mixin per il controllo esecuzione dei jobs
 
 import os
 import sys
+import select
 import subprocess
 import time
 from typing import Dict, Any, Optional, Union, List
-from copy import deepcopy
 import aiSys
+from acJobsInbox import INBOX_ENDED
 
 
 class acJobsJobs:
@@ -37,19 +38,25 @@ class acJobsJobs:
             sResult = f"Errore lettura path {self.sJobsFile}"
         
         if sResult == "":
-            self.dictJobs = deepcopy(dictTemp)
+            self.dictJobs = dictTemp
             self.sJobsPath = sJobPath
-            self.tsJobsStart = aiSys.TimeStamp()
+            self.asJobs = [sKey for sKey in self.dictJobs.keys() if sKey != "CONFIG"]
+            self.tsJobsStart = aiSys.Timestamp()
             
             sResult = self.ConfigUpdate()
             
             if sResult == "":
                 sResult = self.JobsUserLogin()
         
+        # Ripresa dei jobs già completati prima di un'interruzione
+        if sResult == "":
+            sResult = self.JobsJournalStart()
+        
         if sResult == "":
             self.Log0(sResult, f"Caricato jobs.ini {sJobPath}")
         else:
-            self.Log1(sResult)
+            self.JobsJournalEnd()
+            self.Log("ERR", sResult)
         
         return aiSys.ErrorProc(sResult, sProc)
     
@@ -62,11 +69,19 @@ class acJobsJobs:
         
         sFileEnd = self.JobsFileEnd()
         
+        # Billing del jobs.ini su disco prima di dichiararlo concluso
+        if self.jBill is not None:
+            sResultBill = self.jBill.Flush()
+            if sResultBill != "":
+                self.Log("ERR", sResultBill)
+        
         if sFileEnd:
-            sResult = aiSys.save_dict_to_ini(self.dictJobs, sFileEnd)
+            sResult = self.JobsJournalFinish(sFileEnd)
+            if sResult == "":
+                self.jInbox.Set(self.sJobsPath, INBOX_ENDED)
         
         if sResult == "":
-            sResult = self.JobsMail()
+            sResult = self.JobsMailEnd(sFileEnd, sResultJobs)
         
         self.JobsUserLogoff()
         
@@ -84,37 +99,173 @@ class acJobsJobs:
         self.Log0(sResult, f"Salvato {sFileEnd}")
         return aiSys.ErrorProc(sResult, sProc)
     
+    def JobsJournalStart(self) -> str:
+        """
+        Apre il journal jobs.jrn del jobs.ini corrente.
+        Se presente (esecuzione interrotta) i jobs già completati sono
+        riportati in self.dictJobs e tolti da self.asJobs; il journal è
+        riscritto con la sezione CONFIG e le sole sezioni complete.
+        Il journal è un file INI valido, con i risultati parziali leggibili
+        durante l'esecuzione (es. OLK); a fine esecuzione diventa jobs.end.
+        """
+        sProc = "JobsJournalStart"
+        sResult = ""
+        
+        sFileJrn = aiSys.PathMake(self.sJobsPath, "jobs", "jrn")
+        dictDone = {}
+        
+        if self.jStat.FileExists(sFileJrn):
+            try:
+                with open(sFileJrn, 'r', encoding='utf-8') as hFile:
+                    sText = hFile.read()
+                # Ogni sezione termina con una riga vuota: scarta la coda troncata
+                if not sText.endswith("\n\n"):
+                    nPos = sText.rfind("\n\n")
+                    sText = sText[:nPos + 2] if nPos >= 0 else ""
+                # Un job ripetuto (ripresa già interrotta): vale l'ultima sezione
+                sResult, dictJrn = aiSys.ini_text_to_dict(sText, bStrict=False)
+                for sJob, dictSect in dictJrn.items():
+                    if sJob in self.asJobs and "RETURN.TYPE" in dictSect and "RETURN.VALUE" in dictSect:
+                        dictDone[sJob] = dictSect
+            except Exception as e:
+                sResult = f"Errore lettura journal {sFileJrn}: {str(e)}"
+        
+        if sResult == "" and dictDone:
+            for sJob, dictSect in dictDone.items():
+                self.dictJobs[sJob] = dictSect
+            self.asJobs = [sJob for sJob in self.asJobs if sJob not in dictDone]
+            self.Log0("", f"Ripresa {self.sJobsPath}: {len(dictDone)} jobs già eseguiti, {len(self.asJobs)} da eseguire")
+        
+        # Riscrive il journal con le sole sezioni complete e lo riapre in append
+        if sResult == "":
+            sFileTemp = sFileJrn + ".tmp"
+            try:
+                with open(sFileTemp, 'w', encoding='utf-8') as hFile:
+                    if "CONFIG" in self.dictJobs:
+                        hFile.write(self.JobsJournalText("CONFIG", self.dictJobs["CONFIG"]))
+                    for sJob, dictSect in dictDone.items():
+                        hFile.write(self.JobsJournalText(sJob, dictSect))
+                    hFile.flush()
+                    os.fsync(hFile.fileno())
+                os.replace(sFileTemp, sFileJrn)
+                self.jStat.Invalidate(sFileJrn)
+                self.hJobsJrn = open(sFileJrn, 'a', encoding='utf-8')
+                self.asJobsJrn = {"CONFIG", *dictDone}
+            except Exception as e:
+                sResult = f"Errore scrittura journal {sFileJrn}: {str(e)}"
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsJournalText(self, sJob: str, dictJob: Dict[str, Any]) -> str:
+        """
+        Ritorna la sezione INI di un job, terminata da una riga vuota.
+        """
+        return aiSys.ini_text_from_dict({sJob: dictJob})
+    
+    def JobsJournalWrite(self, sJob: str, dictJob: Dict[str, Any]) -> str:
+        """
+        Accoda al journal la sezione del job concluso (scrittura sincrona su disco).
+        """
+        sProc = "JobsJournalWrite"
+        sResult = ""
+        
+        if self.hJobsJrn is None:
+            return sResult
+        
+        try:
+            self.hJobsJrn.write(self.JobsJournalText(sJob, dictJob))
+            self.hJobsJrn.flush()
+            os.fsync(self.hJobsJrn.fileno())
+            self.asJobsJrn.add(sJob)
+        except Exception as e:
+            sResult = f"Errore scrittura journal job {sJob}: {str(e)}"
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsJournalFinish(self, sFileEnd: str) -> str:
+        """
+        Completa il journal con le sezioni non ancora scritte (jobs non
+        eseguiti) e lo rinomina atomicamente in jobs.end. Senza journal
+        aperto jobs.end è scritto su file temporaneo e poi rinominato.
+        """
+        sProc = "JobsJournalFinish"
+        sResult = ""
+        
+        sFileJrn = aiSys.PathMake(self.sJobsPath, "jobs", "jrn")
+        
+        try:
+            if self.hJobsJrn is not None:
+                for sJob, dictJob in self.dictJobs.items():
+                    if sJob not in self.asJobsJrn:
+                        self.hJobsJrn.write(self.JobsJournalText(sJob, dictJob))
+                self.hJobsJrn.flush()
+                os.fsync(self.hJobsJrn.fileno())
+                self.JobsJournalEnd()
+                os.replace(sFileJrn, sFileEnd)
+            else:
+                sFileTemp = sFileEnd + ".tmp"
+                with open(sFileTemp, 'w', encoding='utf-8') as hFile:
+                    hFile.write(aiSys.ini_text_from_dict(self.dictJobs))
+                    hFile.flush()
+                    os.fsync(hFile.fileno())
+                os.replace(sFileTemp, sFileEnd)
+        except Exception as e:
+            sResult = f"Errore scrittura {sFileEnd}: {str(e)}"
+        
+        self.JobsJournalEnd()
+        self.jStat.Invalidate(sFileEnd)
+        aiSys.ini_cache_drop(os.path.abspath(sFileEnd))
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsJournalEnd(self) -> None:
+        """
+        Chiude il journal del jobs.ini corrente.
+        """
+        if self.hJobsJrn is not None:
+            try:
+                self.hJobsJrn.close()
+            except Exception:
+                pass
+            self.hJobsJrn = None
+        self.asJobsJrn = set()
+    
     def JobsFileEnd(self) -> str:
         """
         Restituisce il path del file jobs.end.
         """
         if not self.sJobsFile:
-            self.Log1("Errore interno, sJobsFile non avvalorato")
+            self.Log("ERR", "Errore interno, sJobsFile non avvalorato")
             return ""
         
         sDir = os.path.dirname(self.sJobsFile)
         sBase = os.path.splitext(os.path.basename(self.sJobsFile))[0]
         return aiSys.PathMake(sDir, sBase, "end")
     
-    def JobsMail(self) -> str:
+    def JobsMailEnd(self, sFileEnd: str, sResultJobs: str = "") -> str:
         """
         Invio mail per dichiarare all'utente la fine esecuzione di un file jobs.ini.
+        Senza errori la mail è raccolta nel digest dell'utente (MAIL.DIGEST
+        secondi, 0 = invio subito); con errori è inviata subito.
         """
-        sProc = "JobsMail"
+        sProc = "JobsMailEnd"
         sResult = ""
         
-        sText = sResult if sResult else ""
-        sTemp = ""
+        sText = sResultJobs
+        bError = sResultJobs != ""
         
         # Legge jobs.end se presente
-        sJobsEnd = aiSys.PathMake("", "jobs", "end")
-        if aiSys.FileExists(sJobsEnd):
-            sResultRead, dictTemp = aiSys.read_ini_to_dict(sJobsEnd)
+        if sFileEnd and aiSys.FileExists(sFileEnd):
+            sResultRead, dictTemp = aiSys.read_ini_to_dict(sFileEnd)
             if sResultRead == "":
-                sTemp = aiSys.DictToString(dictTemp, "ini.sect")
-                sText = sResult + "\n\n" + sTemp if sResult else sTemp
+                _, sTemp = aiSys.DictToString(dictTemp, "ini.sect")
+                sText = sText + "\n\n" + sTemp if sText else sTemp
+                bError = bError or any(dictSect.get("RETURN.TYPE") == "E" for dictSect in dictTemp.values())
         
-        sResult = self.JobsMailUser("Completamento jobs.ini", sText)
+        nDigest = 0 if bError else aiSys.StringToNum(self.Config("MAIL.DIGEST"))
+        sSubject = "Errori in jobs.ini" if bError else "Completamento jobs.ini"
+        
+        sResult = self.JobsMailUser(sSubject, sText, "", nDigest)
         return aiSys.ErrorProc(sResult, sProc)
     
     def JobAction(self) -> str:
@@ -132,21 +283,17 @@ class acJobsJobs:
         elif self.sAction not in self.asActions:
             sResult = f"Errore Azione non presente {self.sAction}"
         else:
-            self.dictAction = deepcopy(self.JOBS_TAB_ACTIONS[self.sAction])
-            bEnabled = aiSys.StringBool(self.dictAction.get("ACT_ENABLED", "False"))
+            self.jAction = self.dictActionsRec[self.sAction]
             
-            if not bEnabled:
+            if not self.jAction.bEnabled:
                 sResult = f"Action {self.sAction} disabilitata"
         
         if sResult == "":
-            # Verifica permessi gruppi
-            user_groups = self.dictUser.get("USER_GROUPS", [])
-            action_groups = aiSys.StringToArray(self.dictAction.get("ACT_GROUPS", ""), ",")
-            
-            if action_groups and not aiSys.isGroups(user_groups, action_groups):
+            # Verifica permessi gruppi (maschere di bit)
+            if not self.jAction.isAllowed(self.nUserGroups):
                 sResult = f"Azione non eseguibile per gruppi incompatibili {self.sAction}"
             
-            self.sScript = self.dictAction.get("ACT_SCRIPT", "")
+            self.sScript = self.jAction.sScript
             if not self.sScript:
                 sResult = "Script non assegnato"
         
@@ -162,8 +309,8 @@ class acJobsJobs:
         try:
             # 1. INIZIALIZZAZIONE JOB
             self.sJob = sJob
-            self.dictJob = deepcopy(self.dictJobs[sJob])
-            self.tsJobStart = aiSys.TimeStamp()
+            self.dictJob = dict(self.dictJobs[sJob])
+            self.tsJobStart = aiSys.Timestamp()
             
             # 2. VALIDAZIONE PRE-ESECUZIONE
             sResult = self.JobValidate()
@@ -185,21 +332,33 @@ class acJobsJobs:
                 sResult = self.JobInternal(self.sAction)
                 return self.JobEnd(sResult, "")
             
-            # 6. AVVIO PROCESSO ESTERNO
+            # 6. WORKER RESIDENTE (ACT_RESIDENT): nessun nuovo processo
+            if self.JobIsResident():
+                sResult, sOut = self.JobResident()
+                if sResult == "":
+                    sResult = self.JobBilling()
+                return self.JobEnd(sResult, sOut)
+            
+            # 7. AVVIO PROCESSO ESTERNO
             sResult = self.JobStartProcess()
             if sResult != "":
                 return self.JobEnd(sResult, "")
             
-            # 7. ATTESA COMPLETAMENTO
+            # 8. ATTESA COMPLETAMENTO
             if sResult == "":
                 sResult = self.JobExecWait()
             
-            # 8. BILLING (solo per azioni esterne)
+            # 9. RACCOLTA OUTPUT (coda di stdout/stderr)
+            sOut, sErr = self.JobOutput()
+            if sResult != "" and sErr:
+                sResult += f" - {sErr}"
+            
+            # 10. BILLING (solo per azioni esterne)
             if sResult == "":
                 sResult = self.JobBilling()
             
-            # 9. TERMINA JOB
-            return self.JobEnd(sResult, "")
+            # 11. TERMINA JOB
+            return self.JobEnd(sResult, sOut)
             
         except Exception as e:
             return self.JobEnd(f"{sProc}: Errore non gestito - {str(e)}", "")
@@ -211,8 +370,73 @@ class acJobsJobs:
         sProc = "JobExecWait"
         sResult = ""
         
-        sTimeOut = self.dictAction.get("ACT_TIMEOUT", "")
-        nTimeout2 = aiSys.StringToNum(sTimeOut)
+        nTimeout = self.JobTimeout()
+        
+        sFileAppend = aiSys.PathMake(self.sJobsPath, "ntjobsapp", "end")
+        
+        # Attesa ad eventi: fine processo (pidfd) e arrivo ntjobsapp.end (inotify)
+        jWatch = aiSys.acWatch()
+        if jWatch.Start([self.sJobsPath], ["ntjobsapp.end"]) != "" or jWatch.asPathsPoll:
+            jWatch.End()
+            jWatch = None
+        
+        nPidFd = -1
+        if self.pidJob and hasattr(os, "pidfd_open"):
+            try:
+                nPidFd = os.pidfd_open(self.pidJob.pid)
+            except OSError:
+                nPidFd = -1
+        
+        # Senza eventi si verifica a intervalli brevi
+        nInterval = 0.5
+        tsTimeout = time.monotonic() + nTimeout
+        bTimeout = True
+        
+        try:
+            while True:
+                # Verifica file ntjobsapp.end
+                if aiSys.FileExists(sFileAppend):
+                    bTimeout = False
+                    break
+                
+                # Verifica se processo è terminato
+                if self.pidJob and self.pidJob.poll() is not None:
+                    bTimeout = False
+                    break
+                
+                nRemain = tsTimeout - time.monotonic()
+                if nRemain <= 0:
+                    break
+                
+                if nPidFd >= 0 and jWatch is not None:
+                    select.select([nPidFd, jWatch.nFd], [], [], nRemain)
+                    jWatch.Events()
+                elif nPidFd >= 0:
+                    select.select([nPidFd], [], [], min(nRemain, nInterval))
+                elif self.pidJob:
+                    try:
+                        self.pidJob.wait(timeout=min(nRemain, nInterval))
+                    except subprocess.TimeoutExpired:
+                        pass
+                else:
+                    time.sleep(min(nRemain, nInterval))
+        finally:
+            if nPidFd >= 0:
+                os.close(nPidFd)
+            if jWatch is not None:
+                jWatch.End()
+        
+        if bTimeout:
+            sResult = f"Timeout esecuzione {self.sJob},{self.sJobsFile}"
+            self.JobCleanup()
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobTimeout(self) -> float:
+        """
+        Timeout del job corrente: ACT_TIMEOUT dell'azione o TIMEOUT, minimo 50.
+        """
+        nTimeout2 = self.jAction.nTimeout
         
         if nTimeout2 == 0:
             nTimeout = aiSys.StringToNum(self.Config("TIMEOUT"))
@@ -223,28 +447,46 @@ class acJobsJobs:
             self.Log1(f"Timeout specificato per job {self.sJob} troppo basso, impostato a 50")
             nTimeout = 50
         
-        nElapsed = 0
-        nInterval = 10
+        return nTimeout
+    
+    def JobIsResident(self) -> bool:
+        """
+        True se il job corrente è eseguito sul worker residente dell'azione (ACT_RESIDENT).
+        """
+        return self.jAction is not None and self.jAction.bResident and self.jResident is not None
+    
+    def JobResident(self) -> tuple:
+        """
+        Esegue il job corrente sul worker residente dell'azione: il contenuto
+        di ntjobsapp.ini e ACT_PARAMS sono passati nella richiesta.
+        La risposta ha la forma del file .end: è salvata come ntjobsapp.end
+        nella cartella del job e l'esito della sezione del job (o di CONFIG)
+        diventa il risultato.
         
-        while nElapsed < nTimeout:
-            # Verifica file ntjobsapp.end
-            sFileAppend = aiSys.PathMake(self.sJobsPath, "ntjobsapp", "end")
-            if aiSys.FileExists(sFileAppend):
-                break
-            
-            # Verifica se processo è terminato
-            if hasattr(self, 'pidJob') and self.pidJob:
-                if self.pidJob.poll() is not None:
-                    break
-            
-            time.sleep(nInterval)
-            nElapsed += nInterval
+        Returns:
+            tuple: (sResult, sValue)
+        """
+        sProc = "JobResident"
+        sValue = ""
         
-        if nElapsed >= nTimeout:
-            sResult = f"Timeout esecuzione {self.sJob},{self.sJobsFile}"
-            self.JobCleanup()
+        sResult, dictEnd = self.jResident.Call(self.jAction, self.JobAppIni(),
+                                               self.sJobsPath, self.JobTimeout())
         
-        return aiSys.ErrorProc(sResult, sProc)
+        if sResult == "":
+            sFileEnd = aiSys.PathMake(self.sJobsPath, "ntjobsapp", "end")
+            sResult = aiSys.save_dict_to_ini(dictEnd, sFileEnd)
+        
+        if sResult == "":
+            dictReturn = dictEnd.get(self.sJob, {})
+            if not dictReturn.get("RETURN.TYPE"):
+                dictReturn = dictEnd.get("CONFIG", {})
+            
+            if dictReturn.get("RETURN.TYPE") == "E":
+                sResult = dictReturn.get("RETURN.VALUE", "") or "Errore worker residente"
+            else:
+                sValue = dictReturn.get("RETURN.VALUE", "")
+        
+        return (aiSys.ErrorProc(sResult, sProc), sValue)
     
     def JobCleanup(self) -> str:
         """
@@ -263,11 +505,34 @@ class acJobsJobs:
                         self.pidJob.kill()
                         self.pidJob.wait()
                 self.pidJob = None
+            # Coda conservata per JobOutput (es. errore di timeout)
+            self.tJobOutput = self.JobOutput()
         except Exception as e:
             sResult = f"{sProc}: Errore - {str(e)}"
         
         return aiSys.ErrorProc(sResult, sProc)
     
+    def JobOutput(self) -> tuple:
+        """
+        Attende i lettori di stdout/stderr del processo e ne ritorna la coda.
+        Se i lettori sono già stati raccolti da JobCleanup ritorna la coda
+        conservata.
+        """
+        sOut, sErr = self.tJobOutput
+        self.tJobOutput = ("", "")
+        
+        # Un processo figlio può tenere aperte le pipe: attesa limitata
+        if self.jPumpOut is not None:
+            self.jPumpOut.Join(5)
+            sOut = self.jPumpOut.Tail()
+        if self.jPumpErr is not None:
+            self.jPumpErr.Join(5)
+            sErr = self.jPumpErr.Tail()
+        
+        self.jPumpOut = None
+        self.jPumpErr = None
+        return (sOut, sErr)
+    
     def JobValidate(self) -> str:
         """
         Validazione del job prima dell'esecuzione.
@@ -284,7 +549,7 @@ class acJobsJobs:
         for sKey, sValue in self.dictJob.items():
             if sKey.startswith("FILE.") or sKey.startswith("RETURN.FILE."):
                 sJobFile = aiSys.PathMake(self.sJobsPath, sValue, "")
-                if not aiSys.FileExists(sJobFile):
+                if not self.jStat.FileExists(sJobFile):
                     return f"{sProc}: File {sKey}:{sJobFile} non trovato: {sValue} in job {self.sJob}"
                 else:
                     self.asJobFiles.append(sJobFile)
@@ -292,12 +557,9 @@ class acJobsJobs:
         # 3. Verifica permessi utente
         if hasattr(self, 'sUser') and self.sUser:
             sAction = self.dictJob.get("ACTION", "")
-            if sAction and sAction in self.JOBS_TAB_ACTIONS:
-                dictAction = self.JOBS_TAB_ACTIONS[sAction]
-                user_groups = self.dictUser.get("USER_GROUPS", [])
-                action_groups = aiSys.StringToArray(dictAction.get("ACT_GROUPS", ""), ",")
-                
-                if action_groups and not aiSys.isGroups(user_groups, action_groups):
+            jAction = self.dictActionsRec.get(sAction)
+            if jAction is not None:
+                if not jAction.isAllowed(self.nUserGroups):
                     sResult = f"{sProc}: Permessi insufficienti per azione {sAction}"
         
         return aiSys.ErrorProc(sResult, sProc)
@@ -311,7 +573,7 @@ class acJobsJobs:
         
         try:
             # 1. Imposta directory di lavoro
-            sCurDir = self.dictAction.get("ACT_PATH", "")
+            sCurDir = self.jAction.sPath
             if not sCurDir:
                 sCurDir = self.sJobsPath
             
@@ -332,11 +594,11 @@ class acJobsJobs:
             # 4. Aggiorna dictJob con valori espansi
             self.dictJob.update(dictExpanded)
             
-            # 5. Crea ntjobsapp.ini solo se azione esterna
-            if not self.sAction.startswith("SYS."):
-                dictTemp = {**self.dictConfig, **self.dictJob}
+            # 5. Crea ntjobsapp.ini solo se azione esterna: [CONFIG] espansa e sezione del job
+            #    (al worker residente il contenuto è passato nella richiesta)
+            if not self.sAction.startswith("SYS.") and not self.JobIsResident():
                 sFileIni = aiSys.PathMake(self.sJobsPath, "ntjobsapp", "ini")
-                sResult = aiSys.save_dict_to_ini(dictTemp, sFileIni)
+                sResult = aiSys.save_dict_to_ini(self.JobAppIni(), sFileIni)
                 if sResult != "":
                     sResult = f"{sProc}: Errore creazione ntjobsapp.ini: {sResult}"
         
@@ -345,29 +607,51 @@ class acJobsJobs:
         
         return aiSys.ErrorProc(sResult, sProc)
     
+    def JobAppIni(self) -> Dict[str, Any]:
+        """
+        Contenuto di ntjobsapp.ini del job corrente: [CONFIG] espansa e sezione del job.
+        """
+        return {
+            "CONFIG": {sKey: sValue for sKey, sValue in self.dictConfig.items() if isinstance(sValue, str)},
+            self.sJob: self.dictJob
+        }
+    
     def JobStartProcess(self) -> str:
         """
         Avvia il processo esterno per azioni non-sys.
         """
         sProc = "JobStartProcess"
         
-        if not aiSys.FileExists(self.sScript):
+        if not self.jStat.FileExists(self.sScript):
             return f"{sProc}: Script non trovato: {self.sScript}"
         
         try:
             sCmd = self.sScript
-            if self.dictAction.get("ACT_PARAMS", ""):
-                sCmd += " " + self.dictAction["ACT_PARAMS"]
+            if self.jAction.sParams:
+                sCmd += " " + self.jAction.sParams
             
             self.pidJob = subprocess.Popen(
                 sCmd,
                 shell=True,
                 cwd=self.sJobsPath,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stderr=subprocess.PIPE
             )
             
+            # Svuota le pipe su stdout.log/stderr.log della cartella del job
+            sTemp = self.Config("OUTPUT.MAX")
+            nMaxSize = 1048576 if not sTemp else aiSys.StringToNum(sTemp)
+            sTemp = self.Config("OUTPUT.TAIL")
+            nTail = 2000 if not sTemp else aiSys.StringToNum(sTemp)
+            sHeader = f"{self.sJob} {self.sAction} pid {self.pidJob.pid}"
+            
+            self.jPumpOut = aiSys.acPump()
+            self.jPumpOut.Start(self.pidJob.stdout, aiSys.PathMake(self.sJobsPath, "stdout", "log"),
+                                sHeader, nMaxSize, nTail)
+            self.jPumpErr = aiSys.acPump()
+            self.jPumpErr.Start(self.pidJob.stderr, aiSys.PathMake(self.sJobsPath, "stderr", "log"),
+                                sHeader, nMaxSize, nTail)
+            
             self.Log0("", f"Avviato processo {self.pidJob.pid} per job {self.sJob}")
             return ""
         
@@ -384,7 +668,7 @@ class acJobsJobs:
         
         # 1. AGGIORNA TIMESTAMP
         self.dictJob["TS.START"] = self.tsJobStart
-        self.dictJob["TS.END"] = aiSys.TimeStamp()
+        self.dictJob["TS.END"] = aiSys.Timestamp()
         
         # 2. IMPOSTA RISULTATO
         if sResult == "":
@@ -403,10 +687,16 @@ class acJobsJobs:
             else:
                 sFileIni = aiSys.PathMake(self.sJobsPath, "ntjobsapp", "ini")
                 if aiSys.FileExists(sFileIni):
-                    aiSys.FileDelete(sFileIni)
+                    os.remove(sFileIni)
+        
+        # La cartella del job può essere cambiata (file prodotti, ntjobsapp.*)
+        self.jStat.Invalidate(self.sJobsPath)
         
-        # 4. AGGIORNA DIZIONARIO PRINCIPALE
-        self.dictJobs[self.sJob] = deepcopy(self.dictJob)
+        # 4. AGGIORNA DIZIONARIO PRINCIPALE E JOURNAL
+        self.dictJobs[self.sJob] = self.dictJob
+        sResultJrn = self.JobsJournalWrite(self.sJob, self.dictJob)
+        if sResultJrn != "":
+            self.Log("ERR", sResultJrn)
         
         # 5. LOG E RESET
         sLogMsg = f"Job {self.sJob} completato"
@@ -419,8 +709,9 @@ class acJobsJobs:
         self.tsJobStart = ""
         self.dictJob = None
         self.sAction = ""
-        self.dictAction = None
+        self.jAction = None
         self.sScript = ""
+        self.tJobOutput = ("", "")
         if hasattr(self, 'pidJob'):
             self.pidJob = None
         
@@ -439,7 +730,7 @@ class acJobsJobs:
             sFileReload = aiSys.PathMake(self.sSys_PathRoot, "aiJobsOS", "reload")
             try:
                 with open(sFileReload, 'w') as f:
-                    f.write(aiSys.TimeStamp())
+                    f.write(aiSys.Timestamp())
                 self.Log0("", "Comando SYS.RELOAD eseguito")
             except Exception as e:
                 sResult = f"Errore creazione file reload: {str(e)}"
@@ -448,7 +739,7 @@ class acJobsJobs:
             sFileQuit = aiSys.PathMake(self.sSys_PathRoot, "aiJobsOS", "quit")
             try:
                 with open(sFileQuit, 'w') as f:
-                    f.write(aiSys.TimeStamp())
+                    f.write(aiSys.Timestamp())
                 self.bExitOS = True
                 self.Log0("", "Comando SYS.QUIT eseguito")
             except Exception as e:
@@ -458,7 +749,7 @@ class acJobsJobs:
             sFileShutdown = aiSys.PathMake(self.sSys_PathRoot, "aiJobsOS", "shutdown")
             try:
                 with open(sFileShutdown, 'w') as f:
-                    f.write(aiSys.TimeStamp())
+                    f.write(aiSys.Timestamp())
                 self.bExitOS = True
                 self.Log0("", "Comando SYS.SHUTDOWN eseguito")
             except Exception as e:
@@ -468,7 +759,7 @@ class acJobsJobs:
             sFileReboot = aiSys.PathMake(self.sSys_PathRoot, "aiJobsOS", "reboot")
             try:
                 with open(sFileReboot, 'w') as f:
-                    f.write(aiSys.TimeStamp())
+                    f.write(aiSys.Timestamp())
                 self.bExitOS = True
                 self.Log0("", "Comando SYS.REBOOT eseguito")
             except Exception as e:
@@ -492,14 +783,9 @@ class acJobsJobs:
         sProc = "JobBilling"
         sResult = ""
         
-        if not self.sSys_BillFile:
-            self.sSys_BillFile = aiSys.PathMake(self.sSys_PathRoot, "ntjobs_billing", "csv")
-        
-        asHeader = ("TS_START", "TS_END", "USER", "ACTION", "COMMAND", "TAGS", "NOTES")
-        
         dictRecord = {
             "TS_START": self.tsJobStart,
-            "TS_END": aiSys.TimeStamp(),
+            "TS_END": aiSys.Timestamp(),
             "USER": self.sUser if hasattr(self, 'sUser') else "",
             "ACTION": sAction if sAction else (self.sAction if hasattr(self, 'sAction') else ""),
             "COMMAND": sCommand if sCommand else (self.sCommand if hasattr(self, 'sCommand') else ""),
@@ -507,8 +793,8 @@ class acJobsJobs:
             "NOTES": sNotes
         }
         
-        dictBilling = {"BILL": dictRecord}
-        sResult = aiSys.save_dict_to_csv(self.sSys_BillFile, asHeader, dictBilling, "a", ";")
+        # Scrittura bufferizzata (acJobsBilling), flush a fine jobs.ini
+        sResult = self.jBill.Write(dictRecord)
         
         return aiSys.ErrorProc(sResult, sProc)
     
@@ -516,13 +802,17 @@ class acJobsJobs:
         """
         Ritorna una configurazione salvata in self.dictConfig.
         """
-        if not hasattr(self, 'dictConfig') or not self.dictConfig:
+        # Non "not self.dictConfig": su acConfigView conterebbe le chiavi di tutti i livelli
+        dictConfig = getattr(self, 'dictConfig', None)
+        if dictConfig is None:
             return ""
-        return aiSys.ConfigDefault(self.dictConfig, sKey, "")
+        return dictConfig.get(sKey, "")
     
     def ConfigUpdate(self) -> str:
         """
-        Aggiorna self.dictConfig con la fusione di JOBS_TAB_CONFIG e dictJobs["CONFIG"].
+        Aggiorna self.dictConfig come vista a livelli (acConfigView):
+        dictJobs["CONFIG"] sopra JOBS_TAB_CONFIG (sezione CONFIG, poi chiavi di primo livello).
+        Nessuna copia: i valori sono espansi alla prima lettura e tenuti in cache per livello.
         """
         sProc = "ConfigUpdate"
         sResult = ""
@@ -531,16 +821,21 @@ class acJobsJobs:
             sResult = "Tabella Config.ini non caricata"
         
         if sResult == "":
-            dictTemp = deepcopy(self.JOBS_TAB_CONFIG)
-            dictTemp2 = deepcopy(self.dictJobs.get("CONFIG", {}))
-            
-            dictTemp = aiSys.DictMerge(dictTemp, dictTemp2)
-            aiSys.ExpandDict(dictTemp, dictTemp)
+            # Vista di sistema condivisa, ricreata solo se JOBS_TAB_CONFIG è sostituito
+            if self.jConfigSys is None or self.jConfigSys.asLayers[-1] is not self.JOBS_TAB_CONFIG:
+                dictSection = self.JOBS_TAB_CONFIG.get("CONFIG", {})
+                if not isinstance(dictSection, dict):
+                    dictSection = {}
+                self.jConfigSys = aiSys.acConfigView(dictSection, self.JOBS_TAB_CONFIG)
             
-            self.dictConfig = deepcopy(dictTemp)
+            dictJobsConfig = self.dictJobs.get("CONFIG", {}) if self.dictJobs else {}
+            if dictJobsConfig:
+                self.dictConfig = self.jConfigSys.NewChild(dictJobsConfig)
+            else:
+                self.dictConfig = self.jConfigSys
         
         if sResult != "":
-            self.Log1(sResult)
+            self.Log("ERR", sResult)
         
         return aiSys.ErrorProc(sResult, sProc)
     
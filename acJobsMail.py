@@ -7,10 +7,7 @@
 acJobsMail - Classe mixin per l'invio di mail
 """
 
-import json
-import subprocess
 from typing import Dict, Any, Optional, Union, List
-from copy import deepcopy
 import aiSys
 
 
@@ -19,9 +16,13 @@ class acJobsMail:
     Mixin per l'invio di mail ad amministratore o utente corrente.
     """
     
-    def JobsMail(self, sTo: str, sSubject: str, sText: str, asFiles: List[str] = []) -> str:
+    def JobsMail(self, sTo: str, sSubject: str, sText: str, asFiles: List[str] = [],
+                 nDigest: float = 0) -> str:
         """
         Invia una mail tramite SMTP o OLK.
+        Con la coda attiva (MAIL.QUEUE) la mail è accodata nello spool
+        e inviata in background; con nDigest > 0 è raccolta con le altre
+        dello stesso destinatario e inviata in un'unica mail dopo nDigest secondi.
         """
         sProc = "JobsMail"
         sResult = ""
@@ -32,44 +33,34 @@ class acJobsMail:
                 sResult = "File allegati non tutti esistenti"
                 return aiSys.ErrorProc(sResult, sProc)
         
+        if self.jMailQueue is not None:
+            sResult = self.jMailQueue.Put(sTo, sSubject, sText, asFiles, nDigest)
+        else:
+            sResult = self.JobsMailSend(sTo, sSubject, sText, asFiles)
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsMailSend(self, sTo: str, sSubject: str, sText: str, asFiles: List[str] = []) -> str:
+        """
+        Invio sincrono di una mail con il motore configurato.
+        """
+        sProc = "JobsMailSend"
+        sResult = ""
+        
         if self.sMailEngine == "SMTP":
             if not hasattr(self, 'jMail') or self.jMail is None:
                 sResult = "Mail engine non inizializzato"
             else:
-                sResult = self.jMail.Send([sTo], sSubject, sText, asFiles, "TXT")
+                # Connessione SMTP condivisa tra i worker
+                with self.lockMail:
+                    sResult = self.jMail.Send([sTo], sSubject, asFiles, "TXT", sText)
         
         elif self.sMailEngine == "OLK":
-            # Crea file JSON per il processo esterno
-            sJsonFile = aiSys.PathMake(self.sSys_PathOlk, "ntjobs_mail", "json")
-            
-            dictJson = {
-                "config": {
-                    "nWaitStart": 3,
-                    "nWaitMail": 20,
-                    "bOlkStart": True,
-                    "bOlkEnd": False
-                },
-                "mail_1": {
-                    "id": "mail_001",
-                    "to": [sTo],
-                    "cc": [""],
-                    "ccn": [],
-                    "subject": sSubject,
-                    "format": "txt",
-                    "body": sText,
-                    "attach": asFiles
-                }
-            }
-            
-            try:
-                with open(sJsonFile, 'w', encoding='utf-8') as f:
-                    json.dump(dictJson, f, indent=2, ensure_ascii=False)
-                
-                sCmd = f"{self.sSys_PathOlk} {sJsonFile}"
-                subprocess.Popen(sCmd, shell=True)
-                
-            except Exception as e:
-                sResult = f"Errore invio mail OLK: {str(e)}"
+            # Accodata al prossimo lotto del comando OLK
+            if self.jOlkSpool is None:
+                sResult = "Spool OLK non inizializzato"
+            else:
+                sResult = self.jOlkSpool.Put(sTo, sSubject, sText, asFiles)
         
         else:
             sResult = "Mail Engine non inizializzato"
@@ -89,22 +80,25 @@ class acJobsMail:
         
         return aiSys.ErrorProc(sResult, sProc)
     
-    def JobsMailUser(self, sSubject: str, sText: str) -> str:
+    def JobsMailUser(self, sSubject: str, sText: str, sUser: str = "", nDigest: float = 0) -> str:
         """
-        Manda una mail all'utente corrente.
+        Manda una mail all'utente corrente o, se indicato, all'utente sUser.
         """
         sProc = "JobsMailUser"
         sResult = ""
         
-        if hasattr(self, 'dictUser') and self.dictUser:
-            sUserMail = self.dictUser.get("USER_MAIL", "")
+        if sUser:
+            dictUser = self.JOBS_TAB_USERS.get(sUser)
+        else:
+            dictUser = self.dictUser if hasattr(self, 'dictUser') else None
+        
+        if dictUser:
+            sUserMail = dictUser.get("USER_MAIL", "")
             if sUserMail:
-                sResult = self.JobsMail(sUserMail, sSubject, sText, [])
+                sResult = self.JobsMail(sUserMail, sSubject, sText, [], nDigest)
             else:
                 sResult = "USER_MAIL non definito per l'utente corrente"
         else:
             sResult = "Nessun utente corrente"
         
         return aiSys.ErrorProc(sResult, sProc)
-
-
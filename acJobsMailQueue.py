@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# Nomefile: acJobsMailQueue.py
+# -*- coding: utf-8 -*-
+
+"""
+acJobsMailQueue - Coda persistente delle mail in uscita
+Ogni mail è un file JSON nella cartella di spool, inviata da un thread
+in background con nuovi tentativi ad attesa crescente. Le mail non
+ancora inviate restano nello spool e sono riprese al riavvio.
+Le mail in digest sono raccolte per destinatario e, alla fine della
+finestra, riunite in una sola mail.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Any, Optional, Union, List, Callable
+import aiSys
+
+
+class acJobsMailQueue:
+    """
+    Coda delle mail servita da un thread di invio (thread safe).
+    """
+
+    def __init__(self):
+        """Inizializza la coda."""
+        self.sPathSpool = ""
+        self.sPathFailed = ""          # Mail scartate dopo nRetryMax tentativi
+        self.fnSend = None             # fnSend(sTo, sSubject, sText, asFiles) -> sResult
+        self.jLog = None
+        self.nRetryMax = 10            # Tentativi prima di scartare la mail
+        self.nRetryWait = 30.0         # Attesa dopo il primo errore, poi raddoppia
+        self.nRetryWaitMax = 3600.0    # Attesa massima fra due tentativi
+        self.dictPending = {}          # Nome file -> istante del prossimo tentativo (epoch)
+        self.dictDigest = {}           # Destinatario -> fine della finestra di digest aperta (epoch)
+        self.nCounter = 0
+        self.lock = threading.Lock()
+        self.evWake = threading.Event()
+        self.evEnd = threading.Event()
+        self.jThread = None
+
+    def Start(self, sPathSpool: str, fnSend: Callable[[str, str, str, List[str]], str],
+              jLog: Any = None, nRetryMax: int = 10, nRetryWait: float = 30.0) -> str:
+        """
+        Carica le mail rimaste nello spool e avvia il thread di invio.
+
+        Args:
+            sPathSpool: Cartella di spool
+            fnSend: Funzione di invio sincrono, ritorna sResult
+            jLog: Log (acLog) per esiti e scarti
+            nRetryMax: Tentativi prima di spostare la mail in failed
+            nRetryWait: Secondi di attesa dopo il primo errore
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Start"
+        sResult = ""
+
+        self.sPathSpool = sPathSpool
+        self.sPathFailed = aiSys.PathMake(sPathSpool, "failed")
+        self.fnSend = fnSend
+        self.jLog = jLog
+        self.nRetryMax = max(1, int(nRetryMax))
+        self.nRetryWait = max(1.0, float(nRetryWait))
+
+        try:
+            os.makedirs(self.sPathFailed, exist_ok=True)
+            for sItem in sorted(os.listdir(sPathSpool)):
+                sFile = aiSys.PathMake(sPathSpool, sItem)
+                if sItem.endswith(".tmp"):
+                    os.remove(sFile)
+                elif sItem.endswith(".json"):
+                    dictMail = self.MailRead(sItem)
+                    if dictMail is None:
+                        os.replace(sFile, aiSys.PathMake(self.sPathFailed, sItem))
+                    else:
+                        self.dictPending[sItem] = dictMail.get("next", 0)
+                        if dictMail.get("digest"):
+                            self.dictDigest[dictMail["to"]] = dictMail["next"]
+        except Exception as e:
+            sResult = f"Errore apertura spool mail {sPathSpool}: {str(e)}"
+
+        if sResult == "":
+            if self.dictPending:
+                self.Log(f"Spool mail: {len(self.dictPending)} mail da inviare")
+            self.evEnd.clear()
+            self.jThread = threading.Thread(target=self._run, name="acJobsMailQueue", daemon=True)
+            self.jThread.start()
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Log(self, sText: str, sType: str = "INFO") -> None:
+        """Scrive sul log, se presente (sType "ERR" per gli errori)."""
+        if self.jLog is not None:
+            self.jLog.Log(sType, sText)
+
+    def MailRead(self, sName: str) -> Optional[Dict[str, Any]]:
+        """Legge una mail dello spool, None se illeggibile."""
+        try:
+            with open(aiSys.PathMake(self.sPathSpool, sName), 'r', encoding='utf-8') as hFile:
+                return json.load(hFile)
+        except Exception:
+            return None
+
+    def MailWrite(self, sName: str, dictMail: Dict[str, Any]) -> None:
+        """Scrive una mail dello spool (file temporaneo, fsync e sostituzione atomica)."""
+        sFile = aiSys.PathMake(self.sPathSpool, sName)
+        sFileTemp = sFile + ".tmp"
+        with open(sFileTemp, 'w', encoding='utf-8') as hFile:
+            json.dump(dictMail, hFile, ensure_ascii=False)
+            hFile.flush()
+            os.fsync(hFile.fileno())
+        os.replace(sFileTemp, sFile)
+
+    def Put(self, sTo: str, sSubject: str, sText: str, asFiles: List[str] = [],
+            nDigest: float = 0) -> str:
+        """
+        Accoda una mail nello spool e ritorna subito.
+
+        Args:
+            sTo: Destinatario
+            sSubject: Oggetto
+            sText: Testo
+            asFiles: Allegati
+            nDigest: Secondi della finestra di digest del destinatario, 0 = invio subito
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Put"
+        sResult = ""
+
+        dictMail = {
+            "to": sTo,
+            "subject": sSubject,
+            "text": sText,
+            "files": [os.path.abspath(sFile) for sFile in asFiles],
+            "ts": aiSys.Timestamp(),
+            "try": 0,
+            "next": 0,
+            "error": "",
+            "digest": nDigest > 0,
+        }
+
+        with self.lock:
+            self.nCounter += 1
+            sName = f"mail_{time.time_ns()}_{self.nCounter}.json"
+            # La prima mail apre la finestra del destinatario, le altre vi si accodano
+            if nDigest > 0:
+                dictMail["next"] = self.dictDigest.setdefault(sTo, time.time() + nDigest)
+
+        try:
+            self.MailWrite(sName, dictMail)
+            with self.lock:
+                self.dictPending[sName] = dictMail["next"]
+            self.evWake.set()
+        except Exception as e:
+            sResult = f"Errore scrittura spool mail {sName}: {str(e)}"
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def DigestMerge(self, sTo: str, asNames: List[str]) -> bool:
+        """
+        Riunisce le mail in digest scadute di un destinatario in una sola
+        mail da inviare subito. La mail unica è scritta prima di rimuovere
+        le parti: un'interruzione può al più ripetere il riepilogo. Se la
+        mail unica non è scrivibile le parti sono riprovate dopo nRetryWait.
+
+        Returns:
+            bool: True se la mail unica è stata accodata
+        """
+        adictMails = []
+        for sName in sorted(asNames):
+            dictMail = self.MailRead(sName)
+            if dictMail is not None:
+                adictMails.append(dictMail)
+
+        if adictMails:
+            asText = []
+            for dictMail in adictMails:
+                asText.append(f"{dictMail['ts']} - {dictMail['subject']}\n\n{dictMail['text']}")
+            asFiles = [sFile for dictMail in adictMails for sFile in dictMail["files"]]
+            sSubject = adictMails[0]["subject"] if len(adictMails) == 1 \
+                else f"Riepilogo aiJobsOS: {len(adictMails)} notifiche"
+            sResult = self.Put(sTo, sSubject, f"\n\n{'-' * 60}\n\n".join(asText), asFiles)
+            if sResult != "":
+                with self.lock:
+                    for sName in asNames:
+                        self.dictPending[sName] = time.time() + self.nRetryWait
+                self.Log(f"Riepilogo mail per {sTo} non scritto, nuovo tentativo fra {int(self.nRetryWait)}s: {sResult}", "ERR")
+                return False
+
+        with self.lock:
+            if self.dictDigest.get(sTo, 0) <= time.time():
+                self.dictDigest.pop(sTo, None)
+            for sName in asNames:
+                self.dictPending.pop(sName, None)
+        for sName in asNames:
+            try:
+                os.remove(aiSys.PathMake(self.sPathSpool, sName))
+            except OSError:
+                pass
+        return bool(adictMails)
+
+    def _run(self) -> None:
+        """Invia le mail scadute, poi attende una nuova mail o il prossimo tentativo."""
+        while not self.evEnd.is_set():
+            nNow = time.time()
+            with self.lock:
+                asDue = sorted(sName for sName, nNext in self.dictPending.items() if nNext <= nNow)
+
+            # Mail in digest scadute: una mail unica per destinatario
+            dictDigestDue = {}
+            setDigest = set()
+            for sName in asDue:
+                dictMail = self.MailRead(sName)
+                if dictMail is not None and dictMail.get("digest"):
+                    dictDigestDue.setdefault(dictMail["to"], []).append(sName)
+                    setDigest.add(sName)
+            bMerged = False
+            for sTo, asNames in dictDigestDue.items():
+                bMerged = self.DigestMerge(sTo, asNames) or bMerged
+            # Le mail uniche appena accodate sono inviate subito
+            if bMerged:
+                continue
+            asDue = [sName for sName in asDue if sName not in setDigest]
+
+            for sName in asDue:
+                if self.evEnd.is_set():
+                    break
+                self.Process(sName)
+
+            with self.lock:
+                nWait = min(self.dictPending.values(), default=nNow + 60) - time.time()
+            self.evWake.wait(min(60.0, max(0.1, nWait)))
+            self.evWake.clear()
+
+    def Process(self, sName: str) -> None:
+        """
+        Invia una mail dello spool: se inviata la rimuove, altrimenti
+        programma un nuovo tentativo o, dopo nRetryMax, la sposta in failed.
+        """
+        dictMail = self.MailRead(sName)
+        sFile = aiSys.PathMake(self.sPathSpool, sName)
+
+        try:
+            if dictMail is None:
+                sResult = "Mail illeggibile"
+            else:
+                sResult = self.fnSend(dictMail["to"], dictMail["subject"], dictMail["text"], dictMail["files"])
+        except Exception as e:
+            sResult = f"Errore invio mail: {str(e)}"
+
+        try:
+            if sResult == "":
+                os.remove(sFile)
+                with self.lock:
+                    self.dictPending.pop(sName, None)
+                return
+
+            nTry = (dictMail or {}).get("try", 0) + 1
+            if dictMail is None or nTry >= self.nRetryMax:
+                os.replace(sFile, aiSys.PathMake(self.sPathFailed, sName))
+                with self.lock:
+                    self.dictPending.pop(sName, None)
+                self.Log(f"Mail {sName} scartata dopo {nTry} tentativi: {sResult}", "ERR")
+                return
+
+            nWait = min(self.nRetryWaitMax, self.nRetryWait * 2 ** (nTry - 1))
+            dictMail.update({"try": nTry, "next": time.time() + nWait, "error": sResult})
+            self.MailWrite(sName, dictMail)
+            with self.lock:
+                self.dictPending[sName] = dictMail["next"]
+            self.Log(f"Mail {sName} non inviata (tentativo {nTry}), nuovo tentativo fra {int(nWait)}s: {sResult}", "ERR")
+        except Exception as e:
+            # Spool non aggiornabile: la mail resta e viene ritentata più tardi
+            with self.lock:
+                self.dictPending[sName] = time.time() + self.nRetryWaitMax
+            self.Log(f"Errore aggiornamento spool mail {sName}: {str(e)}", "ERR")
+
+    def End(self, nTimeout: float = 10.0) -> None:
+        """
+        Ferma il thread di invio; le mail non inviate restano nello spool.
+        """
+        self.evEnd.set()
+        self.evWake.set()
+        if self.jThread is not None:
+            self.jThread.join(nTimeout)
+            self.jThread = None
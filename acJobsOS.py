@@ -11,14 +11,18 @@ Eredita da tutti i mixin per comporre le funzionalità complete.
 import os
 import sys
 import time
+import shutil
+import threading
 from typing import Dict, Any, Optional, Union, List
-from copy import deepcopy
+from copy import copy
+import aiSys
 
 # Import dei mixin
 from acJobsStart import acJobsStart
 from acJobsUsers import acJobsUsers
 from acJobsJobs import acJobsJobs
 from acJobsMail import acJobsMail
+from acJobsInbox import INBOX_QUEUED, INBOX_RUNNING, INBOX_ENDED, INBOX_ERROR, INBOX_ARCHIVED
 
 
 class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
@@ -40,7 +44,8 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         self.asActions = []           # Array delle azioni riconosciute
         self.asGroups = []           # Array dei gruppi
         
-        self.dictConfig = {}         # Configurazione corrente (fusa)
+        self.dictConfig = {}         # Configurazione corrente (acConfigView a livelli)
+        self.jConfigSys = None       # Vista del livello di sistema (JOBS_TAB_CONFIG)
         self.dictJobs = {}          # Dizionario del file jobs.ini corrente
         self.dictJobsConfig = {}   # Copia readonly della sezione CONFIG
         self.dictJob = None       # Dizionario del job corrente
@@ -50,21 +55,35 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         
         self.sAction = ""      # Azione corrente
         self.sCommand = ""    # Comando corrente
-        self.dictAction = None
+        self.jAction = None     # Record acJobsAction dell'azione corrente
         self.sActionPath = ""
         self.sScript = ""
+        self.nUserGroups = 0    # Maschera dei gruppi dell'utente corrente
         
         # JOBS_DAT_* arrays
         self.JOBS_DAT_USERS = ["USER", "USER_NAME", "USER_NOTES", "USER_GROUPS", "USER_PATHS", "USER_MAIL"]
         self.JOBS_DAT_GROUPS = ["GROUP_ID", "GROUP_NAME", "GROUP_NOTES"]
         self.JOBS_DAT_ACTIONS = ["ACT_ID", "ACT_NAME", "ACT_GROUPS", "ACT_SCRIPT", "ACT_ENABLED", "ACT_PATH", "ACT_HELP", "ACT_TIMEOUT"]
+        self.JOBS_DAT_ACTIONS_OPT = ["ACT_PARAMS", "ACT_RESIDENT"]      # Colonne facoltative
         self.JOBS_DAT_CONFIG_SMTP = ["SMTP.FROM", "SMTP.PASSWORD", "SMTP.PORT", "SMTP.SERVER", "SMTP.SSL", "SMTP.TLS", "SMTP.USER"]
         
+        # Tabella -> (file CSV, header, header facoltativo, array delle chiavi)
+        self.JOBS_DAT_FILES = {
+            "JOBS_TAB_ACTIONS": ("ntjobs_actions.csv", "JOBS_DAT_ACTIONS", "JOBS_DAT_ACTIONS_OPT", "asActions"),
+            "JOBS_TAB_GROUPS": ("ntjobs_groups.csv", "JOBS_DAT_GROUPS", "", "asGroups"),
+            "JOBS_TAB_USERS": ("ntjobs_users.csv", "JOBS_DAT_USERS", "", "asUsers"),
+        }
+        
         # JOBS_TAB_* dizionari
         self.JOBS_TAB_USERS = {}
         self.JOBS_TAB_GROUPS = {}
         self.JOBS_TAB_ACTIONS = {}
         self.JOBS_TAB_CONFIG = {}
+        self.dictGroupsBit = {}        # Gruppo -> bit delle maschere
+        self.dictUsersMask = {}        # Utente -> maschera dei gruppi
+        self.dictActionsRec = {}       # Azione -> record acJobsAction
+        self.dictDatStat = {}          # Tabella -> (mtime_ns, size) del CSV letto
+        self.bDatReload = True         # Ricarica delle tabelle CSV modificate (DAT.RELOAD)
         
         # Campi vari interni
         self.bExitJobs = False
@@ -77,6 +96,11 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         self.sMailEngine = ""
         self.sMailAdmin = ""
         self.pidJob = None
+        self.jPumpOut = None              # Lettore stdout del processo del job
+        self.jPumpErr = None              # Lettore stderr del processo del job
+        self.tJobOutput = ("", "")        # Coda stdout/stderr raccolta da JobCleanup
+        self.hJobsJrn = None              # Journal jobs.jrn del jobs.ini corrente
+        self.asJobsJrn = set()            # Sezioni già scritte nel journal
         
         # Campi inizializzati da config
         self.sSys_PathRoot = ""
@@ -87,9 +111,140 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         self.sSys_BillFile = ""
         self.nCycleCounter = 0
         self.nCycleWait = 60
-        self.nSearchWait = 900
+        self.nSearchWait = 900              # Cadenza scansione completa con watch attivo, 0 = ogni ciclo
+        self.nSearchTime = 0.0              # Ultima scansione completa (monotonic)
+        self.nCycleWaitNext = 0             # Attesa adattiva del prossimo ciclo
+        self.bCycleWork = False             # Lavoro svolto nel ciclo corrente
+        self.evCycle = threading.Event()    # Risveglio dell'attesa senza watch
         
         self.jMail = None
+        self.jMailQueue = None             # Coda persistente delle mail (acJobsMailQueue)
+        self.jOlkSpool = None              # Lotti di mail per il motore OLK (acJobsOlkSpool)
+        self.jResident = None              # Worker residenti delle azioni (acJobsResident)
+        self.jWatch = None                 # Osservazione path utente (SEARCH.WATCH)
+        self.jInbox = None                 # Indice stato cartelle inbox (acJobsInbox)
+        self.jClaim = None                 # Lease delle cartelle, inbox condivisa (acJobsClaim)
+        self.jBill = None                  # Writer file di billing (acJobsBilling)
+        self.bSearchFull = True            # Prossima Search scandisce tutti i path
+        self.dictDirCheck = {}             # Cartella -> esiste (None = non raggiungibile), per avvio e ricarica
+        self.jStat = aiSys.acStatCache()   # Contenuto delle cartelle dei jobs, azzerato ad ogni ciclo
+        
+        # Esecuzione parallela dei jobs.ini (WORKERS)
+        self.nWorkers = 1
+        self.jPool = None                  # Pool di worker, None = sequenziale
+        self.dictRunning = {}              # Path inbox -> Future in esecuzione
+        self.lockMail = threading.Lock()   # Invio mail condiviso tra i worker
+        self.nExecRetry = 3                # Esecuzioni di un jobs.ini non concluso (EXEC.RETRY)
+        self.dictExecTry = {}              # Path inbox -> esecuzioni non concluse
+    
+    def ExecReset(self) -> None:
+        """
+        Azzera i campi relativi al jobs.ini in esecuzione.
+        """
+        self.sJobsPath = ""
+        self.sJob = ""
+        self.sJobsFile = ""
+        self.asJobs = []
+        self.asJobFiles = []
+        self.dictJobs = {}
+        self.dictJobsConfig = {}
+        self.dictJob = None
+        self.dictUser = None
+        self.sUser = ""
+        self.sAction = ""
+        self.sCommand = ""
+        self.jAction = None
+        self.sActionPath = ""
+        self.sScript = ""
+        self.nUserGroups = 0
+        self.bExitJobs = False
+        self.tsJobsStart = ""
+        self.tsJobStart = ""
+        self.pidJob = None
+        self.jPumpOut = None
+        self.jPumpErr = None
+        self.tJobOutput = ("", "")
+        self.hJobsJrn = None
+        self.asJobsJrn = set()
+    
+    def ExecContext(self) -> "acJobsOS":
+        """
+        Crea il contesto di esecuzione di un jobs.ini.
+        Copia superficiale dell'istanza: tabelle, log, mail e lock sono
+        condivisi, i campi del jobs.ini corrente sono propri del contesto.
+        """
+        jExec = copy(self)
+        jExec.ExecReset()
+        jExec.jPool = None
+        jExec.dictRunning = {}
+        return jExec
+    
+    def CycleWake(self, *args) -> None:
+        """
+        Interrompe l'attesa di fine ciclo (es. al termine di un worker).
+        """
+        self.evCycle.set()
+        if self.jWatch is not None:
+            self.jWatch.Wake()
+    
+    def ExecWorker(self, sPath: str) -> "acJobsOS":
+        """
+        Esegue un jobs.ini in un contesto proprio (anche in un thread del pool).
+        """
+        jExec = self.ExecContext()
+        # Il risultato di Exec è già nel log: qui solo le eccezioni non gestite
+        try:
+            sResult = jExec.Exec(sPath)
+        except Exception as e:
+            sResult = f"Errore non gestito in Exec {sPath}: {str(e)}"
+            self.Log("ERR", sResult)
+        if self.jInbox.State(sPath) == INBOX_RUNNING:
+            self.ExecRetry(sPath, jExec, sResult)
+        else:
+            self.dictExecTry.pop(sPath, None)
+        return jExec
+    
+    def ExecRetry(self, sPath: str, jExec: "acJobsOS", sResult: str) -> None:
+        """
+        jobs.end non scritto (es. errore JobsInit): il jobs.ini torna in coda
+        fino a nExecRetry esecuzioni, poi resta in ERROR (anche ai riavvii,
+        fino a INBOX.REBUILD) e l'utente del jobs.ini, o l'amministratore,
+        è avvisato una volta.
+        """
+        nTry = self.dictExecTry.get(sPath, 0) + 1
+        if nTry < self.nExecRetry:
+            self.dictExecTry[sPath] = nTry
+            self.jInbox.Set(sPath, INBOX_QUEUED)
+            self.Log1(f"Jobs.ini non concluso, esecuzione {nTry} di {self.nExecRetry}: {sPath}")
+            return
+        
+        self.dictExecTry.pop(sPath, None)
+        self.jInbox.Set(sPath, INBOX_ERROR)
+        
+        # Utente dal login o, se fallito, dal CONFIG scritto da Move
+        sUser = jExec.sUser or jExec.dictJobs.get("CONFIG", {}).get("USER", "")
+        sSubject = "Errore in esecuzione jobs.ini"
+        sText = f"Jobs.ini non concluso dopo {nTry} esecuzioni: {sPath}\n{sResult}"
+        sResultMail = self.JobsMailUser(sSubject, sText, sUser) if sUser else "Utente non noto"
+        if sResultMail != "":
+            sResultMail = self.JobsMailAdmin(sSubject, sText)
+        self.Log("ERR", f"Jobs.ini in errore dopo {nTry} esecuzioni: {sPath} {sResultMail}")
+    
+    def ExecCollect(self, bWait: bool = False) -> None:
+        """
+        Raccoglie i jobs.ini terminati nel pool.
+        Propaga le richieste di uscita (SYS.QUIT, SYS.SHUTDOWN, ...).
+        """
+        for sPath, jFuture in list(self.dictRunning.items()):
+            if not bWait and not jFuture.done():
+                continue
+            try:
+                jExec = jFuture.result()
+                if jExec.bExitOS:
+                    self.bExitOS = True
+            except Exception as e:
+                self.Log("ERR", f"Errore worker {sPath}: {str(e)}")
+            del self.dictRunning[sPath]
     
     def Run(self) -> str:
         """
@@ -100,6 +255,18 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         sResult = ""
         
         while not self.bExitOS:
+            # Le verifiche di esistenza valgono per un ciclo
+            self.jStat.Clear()
+            
+            # Inbox condivisa: cartelle portate o archiviate da altri nodi
+            if self.jClaim is not None:
+                sResultTemp = self.jInbox.Refresh()
+                if sResultTemp != "":
+                    self.Log("ERR", sResultTemp)
+            
+            # 0. Ricarica delle tabelle CSV modificate (errori solo nel log)
+            self.JobsReload()
+            
             # 1. Metodo Search
             sResult = self.Search()
             
@@ -119,8 +286,55 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
             if sResult != "":
                 self.bExitOS = True
         
+        # Attende i jobs.ini ancora in esecuzione nel pool
+        if self.jPool is not None:
+            self.jPool.shutdown(wait=True)
+            self.ExecCollect(True)
+            self.jPool = None
+        
         return aiSys.ErrorProc(sResult, sProc)
     
+    def End(self) -> None:
+        """
+        Chiusura dell'applicativo: svuota e chiude billing, indice inbox e watch.
+        Le mail non ancora inviate restano nello spool per il prossimo avvio.
+        """
+        sProc = "End"
+        
+        if self.jMailQueue is not None:
+            self.jMailQueue.End()
+            self.jMailQueue = None
+        
+        if self.jOlkSpool is not None:
+            self.jOlkSpool.End()
+            self.jOlkSpool = None
+        
+        if self.jResident is not None:
+            self.jResident.End()
+            self.jResident = None
+        
+        if self.jBill is not None:
+            sResult = self.jBill.End()
+            if sResult != "":
+                self.Log("ERR", aiSys.ErrorProc(sResult, sProc))
+            self.jBill = None
+        
+        if self.jInbox is not None:
+            self.jInbox.End()
+        
+        # I claim ancora tenuti scadono dopo il lease
+        if self.jClaim is not None:
+            self.jClaim.End()
+            self.jClaim = None
+        
+        if self.jWatch is not None:
+            self.jWatch.End()
+            self.jWatch = None
+        
+        # Per ultimo: scrive le righe di log ancora in coda
+        if self.jLog is not None:
+            self.jLog.End()
+    
     def Search(self) -> str:
         """
         Scansiona le cartelle predefinite per cercare file jobs.ini.
@@ -128,15 +342,46 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         sProc = "Search"
         sResult = ""
         
-        for sPath in self.asPaths:
+        # Senza watch scansione completa ad ogni ciclo (polling); con watch
+        # attivo ogni SEARCH.WAIT secondi (0 = ogni ciclo) o se eventi persi
+        nNow = time.monotonic()
+        bFull = self.bSearchFull or self.jWatch is None or self.jWatch.bOverflow or \
+            nNow - self.nSearchTime >= self.nSearchWait
+        
+        if bFull:
+            asPaths = self.asPaths
+            self.bSearchFull = False
+            self.nSearchTime = nNow
+            self.tsSearch = aiSys.Timestamp()
+            if self.jWatch is not None:
+                self.jWatch.bOverflow = False
+                self.jWatch.Events()
+        else:
+            # Con watch attivo scandisce solo i path segnalati e quelli a polling
+            asPaths = self.jWatch.Events() + self.jWatch.asPathsPoll
+        
+        for sPath in asPaths:
+            # Path non più associato a un utente (tabella utenti ricaricata)
             sUser = self.dictPaths.get(sPath, "")
+            if not sUser:
+                continue
             sFileJobs = aiSys.PathMake(sPath, "jobs", "ini")
             
             if aiSys.FileExists(sFileJobs):
+                # Inbox condivisa: il jobs.ini è spostato da un solo nodo
+                if self.jClaim is not None:
+                    if not self.jClaim.Claim(sPath):
+                        continue
+                    if not aiSys.FileExists(sFileJobs):
+                        self.jClaim.Release(sPath)
+                        continue
+                self.bCycleWork = True
                 sResultTemp = self.Move(sPath, sUser)
+                if self.jClaim is not None:
+                    self.jClaim.Release(sPath)
                 if sResultTemp:
                     sResult += sResultTemp + ", "
-                self.Log(sResult, f"Trovato jobs.ini in {sPath} dell'utente {sUser}")
+                self.Log0(sResult, f"Trovato jobs.ini in {sPath} dell'utente {sUser}")
         
         return aiSys.ErrorProc(sResult, sProc)
     
@@ -157,53 +402,73 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
             sResult = f"File senza CONFIG {sFileJobs}"
             return self.MoveError(sResult, sPath)
         
-        # Crea cartella inbox univoca
+        # Crea cartella inbox univoca (creazione esclusiva, anche tra più nodi)
         nCounter = 0
         while True:
-            sPathInbox = f"jobs_{aiSys.TimeStamp()}_{nCounter}"
+            sPathInbox = f"jobs_{aiSys.Timestamp().replace(':', '')}_{nCounter}"
             sPathInboxFull = aiSys.PathMake(self.sSys_PathInbox, sPathInbox)
-            if not os.path.exists(sPathInboxFull):
+            try:
+                os.makedirs(sPathInboxFull)
                 break
-            nCounter += 1
-        
-        try:
-            os.makedirs(sPathInboxFull, exist_ok=True)
-        except Exception as e:
-            sResult = f"Errore creazione path inbox {sPathInboxFull}: {str(e)}"
-            return self.MoveError(sResult, sPath)
-        
-        sLogMove = ""
-        
-        # Aggiunge USER alla sezione CONFIG
-        dictTemp["CONFIG"]["USER"] = sUser
+            except FileExistsError:
+                nCounter += 1
+            except Exception as e:
+                sResult = f"Errore creazione path inbox {sPathInboxFull}: {str(e)}"
+                return self.MoveError(sResult, sPath)
         
-        # Scrive jobs.ini nella nuova cartella
-        sResult = aiSys.save_dict_to_ini(dictTemp, aiSys.PathMake(sPathInboxFull, "jobs", "ini"))
-        if sResult != "":
-            return self.MoveError(sResult, sPathInboxFull)
-        
-        sLogMove = f"Spostato jobs.ini in {sPathInboxFull}"
-        
-        # Sposta file associati
-        for dictSection in dictTemp.values():
-            if isinstance(dictSection, dict):
-                for sKey, sValue in dictSection.items():
-                    if sKey.startswith("FILE."):
-                        sFileMove = sValue
-                        srcFile = aiSys.PathMake(sPath, sFileMove)
-                        dstFile = aiSys.PathMake(sPathInboxFull, sFileMove)
-                        try:
-                            shutil.move(srcFile, dstFile)
-                            sLogMove += f" Spostato file {sFileMove}."
-                        except Exception as e:
-                            sResult = f"Non spostabile {sFileMove}: {str(e)}"
-                            break
+        # Inbox condivisa: la cartella resta di questo nodo finché non è completa,
+        # rilasciata anche se lo spostamento fallisce
+        if self.jClaim is not None:
+            self.jClaim.Claim(sPathInboxFull)
         
-        if sResult != "":
-            return self.MoveError(sResult, sPath)
-        
-        self.Log(sLogMove)
-        return ""
+        try:
+            sLogMove = ""
+            
+            # Aggiunge USER alla sezione CONFIG
+            dictTemp["CONFIG"]["USER"] = sUser
+            
+            # Scrive jobs.ini nella nuova cartella
+            sResult = aiSys.save_dict_to_ini(dictTemp, aiSys.PathMake(sPathInboxFull, "jobs", "ini"))
+            if sResult != "":
+                return self.MoveError(sResult, sPathInboxFull)
+            
+            sLogMove = f"Spostato jobs.ini in {sPathInboxFull}"
+            
+            # Sposta file associati
+            for dictSection in dictTemp.values():
+                if isinstance(dictSection, dict):
+                    for sKey, sValue in dictSection.items():
+                        if sKey.startswith("FILE."):
+                            sFileMove = sValue
+                            srcFile = aiSys.PathMake(sPath, sFileMove)
+                            dstFile = aiSys.PathMake(sPathInboxFull, sFileMove)
+                            try:
+                                shutil.move(srcFile, dstFile)
+                                sLogMove += f" Spostato file {sFileMove}."
+                            except Exception as e:
+                                sResult = f"Non spostabile {sFileMove}: {str(e)}"
+                                break
+            
+            self.jStat.Invalidate(sPathInboxFull)
+            if sResult != "":
+                return self.MoveError(sResult, sPath)
+            
+            # Rimuove il jobs.ini originale, altrimenti verrebbe ripreso alla prossima Search
+            try:
+                os.remove(sFileJobs)
+            except Exception as e:
+                sResult = f"Errore rimozione {sFileJobs}: {str(e)}"
+                return self.MoveError(sResult, sPath)
+            
+            sResult = self.jInbox.Set(sPathInboxFull, INBOX_QUEUED)
+            if sResult != "":
+                self.Log("ERR", sResult)
+            
+            self.Log1(sLogMove)
+            return ""
+        finally:
+            if self.jClaim is not None:
+                self.jClaim.Release(sPathInboxFull)
     
     def MoveError(self, sResult: str, sPath: str) -> str:
         """
@@ -212,13 +477,15 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         sProc = "MoveError"
         
         sFileIni = aiSys.PathMake(sPath, "jobs", "ini")
-        self.JobsMailUser("Errore in esecuzione jobs.ini", sResult)
+        # Errore: mail subito (senza digest) all'utente proprietario del path
+        self.JobsMailUser("Errore in esecuzione jobs.ini", sResult, self.dictPaths.get(sPath, ""))
         
         sFileTemp = aiSys.PathMake(sPath, "jobs", "end")
         try:
             os.rename(sFileIni, sFileTemp)
         except Exception as e:
             sResult = f"Errore rinomina ini in end: {sFileTemp}: {str(e)}"
+        self.jStat.Invalidate(sFileTemp)
         
         return aiSys.ErrorProc(sResult, sProc)
     
@@ -229,22 +496,64 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         sProc = "Get"
         sResult = ""
         
-        if not os.path.exists(self.sSys_PathInbox):
-            return aiSys.ErrorProc(sResult, sProc)
+        self.ExecCollect()
         
-        for sItem in os.listdir(self.sSys_PathInbox):
+        # Solo le cartelle in coda secondo l'indice della inbox
+        for sItem in self.jInbox.List(INBOX_QUEUED):
             sPath = aiSys.PathMake(self.sSys_PathInbox, sItem)
-            if os.path.isdir(sPath):
-                sFileJobs = aiSys.PathMake(sPath, "jobs", "ini")
-                sFileEnd = aiSys.PathMake(sPath, "jobs", "end")
-                
-                if aiSys.FileExists(sFileJobs) and not aiSys.FileExists(sFileEnd):
-                    sResultExec = self.Exec(sPath)
-                    if sResultExec:
-                        self.Log1(sResultExec)
+            if sPath in self.dictRunning:
+                continue
+            sFileJobs = aiSys.PathMake(sPath, "jobs", "ini")
+            sFileEnd = aiSys.PathMake(sPath, "jobs", "end")
+            
+            if not self.jStat.FileExists(sFileJobs):
+                # Cartella rimossa dall'esterno
+                sState = INBOX_ARCHIVED
+            elif self.jStat.FileExists(sFileEnd):
+                sState = INBOX_ENDED
+            elif self.jClaim is not None:
+                sState = self.GetClaim(sPath)
+            else:
+                sState = INBOX_RUNNING
+            
+            if sState == INBOX_RUNNING:
+                self.bCycleWork = True
+                self.jInbox.Set(sItem, INBOX_RUNNING)
+                if self.jPool is None:
+                    jExec = self.ExecWorker(sPath)
+                    if jExec.bExitOS:
+                        self.bExitOS = True
+                else:
+                    jFuture = self.jPool.submit(self.ExecWorker, sPath)
+                    jFuture.add_done_callback(self.CycleWake)
+                    self.dictRunning[sPath] = jFuture
+            elif sState:
+                self.jInbox.Set(sItem, sState)
+            
+            if self.bExitOS:
+                break
         
         return aiSys.ErrorProc(sResult, sProc)
     
+    def GetClaim(self, sPath: str) -> str:
+        """
+        Inbox condivisa: acquisisce il lease della cartella prima di Exec,
+        tenuto fino all'archiviazione.
+        Ritorna INBOX_RUNNING se la cartella è da eseguire su questo nodo,
+        "" se è di un altro nodo, INBOX_ENDED o INBOX_ARCHIVED se un altro
+        nodo l'ha conclusa o archiviata prima del claim.
+        """
+        if not self.jClaim.Claim(sPath):
+            return ""
+        
+        # Stato su disco dopo il claim, senza la cache del ciclo
+        if not aiSys.FileExists(aiSys.PathMake(sPath, "jobs", "ini")):
+            self.jClaim.Release(sPath)
+            return INBOX_ARCHIVED
+        if aiSys.FileExists(aiSys.PathMake(sPath, "jobs", "end")):
+            return INBOX_ENDED
+        return INBOX_RUNNING
+    
     def Exec(self, sPath: str) -> str:
         """
         Gestisce il file jobs.ini corrente, eseguendo i jobs in esso contenuti.
@@ -260,7 +569,7 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         if sResult != "":
             self.bExitJobs = True
             sResult = f"Errore JobsInit: {sResult} {sPath}"
-            self.Log1(sResult)
+            self.Log("ERR", sResult)
             return aiSys.ErrorProc(sResult, sProc)
         
         # Esecuzione dei singoli Jobs
@@ -276,7 +585,7 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         
         # JobsEnd
         sResult = self.JobsEnd(sResult)
-        self.Log1(sResult)
+        self.Log0(sResult, f"Conclusione jobs.ini {sPath}")
         
         return aiSys.ErrorProc(sResult, sProc)
     
@@ -288,9 +597,24 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         sResult = ""
         
         self.nCycleCounter += 1
-        print(f"Ciclo Run: {self.nCycleCounter}, Time: {aiSys.TimeStamp()}, Attesa: {self.nCycleWait}")
         
-        time.sleep(self.nCycleWait)
+        # Attesa adattiva: nessuna attesa se il ciclo ha trovato lavoro,
+        # altrimenti raddoppia da 1 secondo fino a CYCLE.WAIT
+        if self.bCycleWork:
+            self.nCycleWaitNext = 0
+        else:
+            self.nCycleWaitNext = min(self.nCycleWait, max(1, self.nCycleWaitNext * 2))
+        self.bCycleWork = False
+        
+        print(f"Ciclo Run: {self.nCycleCounter}, Time: {aiSys.Timestamp()}, Attesa: {self.nCycleWaitNext}")
+        
+        if self.nCycleWaitNext > 0 and not self.bExitOS:
+            # L'attesa termina all'arrivo di un jobs.ini (watch) o alla fine di un worker
+            if self.jWatch is not None:
+                self.jWatch.Wait(self.nCycleWaitNext)
+            else:
+                self.evCycle.wait(self.nCycleWaitNext)
+        self.evCycle.clear()
         
         return aiSys.ErrorProc(sResult, sProc)
     
@@ -301,24 +625,29 @@ class acJobsOS(acJobsStart, acJobsUsers, acJobsJobs, acJobsMail):
         sProc = "Archive"
         sResult = ""
         
-        if not os.path.exists(self.sSys_PathInbox):
-            return aiSys.ErrorProc(sResult, sProc)
-        
-        for sItem in os.listdir(self.sSys_PathInbox):
+        # Solo le cartelle terminate secondo l'indice della inbox
+        for sItem in self.jInbox.List(INBOX_ENDED):
             sPath = aiSys.PathMake(self.sSys_PathInbox, sItem)
-            if os.path.isdir(sPath):
-                sFileJobs = aiSys.PathMake(sPath, "jobs", "ini")
-                sFileEnd = aiSys.PathMake(sPath, "jobs", "end")
-                
-                if aiSys.FileExists(sFileJobs) and aiSys.FileExists(sFileEnd):
-                    try:
-                        dstPath = aiSys.PathMake(self.sSys_PathArchive, sItem)
-                        shutil.move(sPath, dstPath)
-                    except Exception as e:
-                        sResult += f"Errore spostamento, Folder: {sItem}: {str(e)}. "
+            if sPath in self.dictRunning:
+                continue
+            # Inbox condivisa: le cartelle in lease ad altri nodi restano a loro
+            if self.jClaim is not None and not self.jClaim.Claim(sPath):
+                continue
+            try:
+                dstPath = aiSys.PathMake(self.sSys_PathArchive, sItem)
+                shutil.move(sPath, dstPath)
+                self.jStat.Invalidate(sPath)
+                if self.jClaim is not None:
+                    self.jClaim.Release(sPath, dstPath)
+                self.jInbox.Set(sItem, INBOX_ARCHIVED)
+            except Exception as e:
+                sResult += f"Errore spostamento, Folder: {sItem}: {str(e)}. "
+                # La cartella resta nella inbox: il claim, se ancora lì, è rilasciato
+                if self.jClaim is not None:
+                    self.jClaim.Release(sPath)
         
         if sResult:
-            self.Log1(sResult)
+            self.Log("ERR", sResult)
         
         return aiSys.ErrorProc(sResult, sProc)
 
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# Nomefile: acJobsOlkSpool.py
+# -*- coding: utf-8 -*-
+
+"""
+acJobsOlkSpool - Spool delle mail per il motore OLK
+Le mail sono raccolte in lotti (voci mail_N) scritti in file JSON con
+nome univoco e passati a ntj_sendmail_olk.cmd. È in esecuzione al più
+un processo alla volta: le mail che arrivano nel frattempo formano il
+lotto successivo, avviato alla fine del processo in corso.
+"""
+
+import os
+import json
+import time
+import threading
+import subprocess
+from typing import Dict, Any, Optional, Union, List
+import aiSys
+
+
+class acJobsOlkSpool:
+    """
+    Spool dei lotti di mail OLK (thread safe).
+    """
+
+    def __init__(self):
+        """Inizializza lo spool."""
+        self.sPathOlk = ""
+        self.sCmd = ""                 # Comando OLK (ntj_sendmail_olk.cmd)
+        self.jLog = None
+        self.nBatchMax = 50            # Mail massime per lotto
+        self.adictMails = []           # Mail in attesa del prossimo lotto
+        self.asBatches = []            # Lotti scritti e non ancora passati al comando
+        self.sBatchRun = ""            # Lotto del processo in esecuzione
+        self.jProc = None              # Processo OLK in esecuzione (al più uno)
+        self.nCounter = 0
+        self.lock = threading.Lock()
+
+    def Start(self, sPathOlk: str, sCmd: str, jLog: Any = None, nBatchMax: int = 50) -> str:
+        """
+        Imposta lo spool e riprende i lotti rimasti da una esecuzione precedente.
+
+        Args:
+            sPathOlk: Cartella OLK, dove sono scritti i lotti
+            sCmd: Comando OLK, riceve il path del lotto
+            jLog: Log (acLog) per esiti ed errori
+            nBatchMax: Mail massime per lotto
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Start"
+        sResult = ""
+
+        self.sPathOlk = sPathOlk
+        self.sCmd = sCmd
+        self.jLog = jLog
+        self.nBatchMax = max(1, int(nBatchMax))
+
+        try:
+            for sItem in sorted(os.listdir(sPathOlk)):
+                sFile = aiSys.PathMake(sPathOlk, sItem)
+                if not sItem.startswith("ntjobs_mail_"):
+                    continue
+                if sItem.endswith(".tmp"):
+                    os.remove(sFile)
+                elif sItem.endswith(".json"):
+                    self.asBatches.append(sFile)
+        except Exception as e:
+            sResult = f"Errore apertura spool OLK {sPathOlk}: {str(e)}"
+
+        if sResult == "" and self.asBatches:
+            self.Log(f"Spool OLK: {len(self.asBatches)} lotti da inviare")
+            self.Flush()
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Log(self, sText: str, sType: str = "INFO") -> None:
+        """Scrive sul log, se presente (sType "ERR" per gli errori)."""
+        if self.jLog is not None:
+            self.jLog.Log(sType, sText)
+
+    def Put(self, sTo: str, sSubject: str, sText: str, asFiles: List[str] = []) -> str:
+        """
+        Aggiunge una mail al prossimo lotto e, se nessun processo OLK
+        è in esecuzione, avvia subito l'invio.
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Put"
+
+        dictMail = {
+            "to": [sTo],
+            "cc": [""],
+            "ccn": [],
+            "subject": sSubject,
+            "format": "txt",
+            "body": sText,
+            "attach": [os.path.abspath(sFile) for sFile in asFiles]
+        }
+        with self.lock:
+            self.adictMails.append(dictMail)
+
+        sResult = self.Flush()
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def BatchWrite(self, adictMails: List[Dict[str, Any]]) -> str:
+        """
+        Scrive un lotto in un file JSON univoco (file temporaneo e
+        sostituzione atomica) e ritorna il path del lotto.
+        """
+        dictJson = {
+            "config": {
+                "nWaitStart": 3,
+                "nWaitMail": 20,
+                "bOlkStart": True,
+                "bOlkEnd": False
+            }
+        }
+        for nMail, dictMail in enumerate(adictMails, 1):
+            dictJson[f"mail_{nMail}"] = {"id": f"mail_{nMail:03d}", **dictMail}
+
+        self.nCounter += 1
+        sFile = aiSys.PathMake(self.sPathOlk, f"ntjobs_mail_{time.time_ns()}_{self.nCounter}", "json")
+        sFileTemp = sFile + ".tmp"
+        with open(sFileTemp, 'w', encoding='utf-8') as hFile:
+            json.dump(dictJson, hFile, indent=2, ensure_ascii=False)
+            hFile.flush()
+            os.fsync(hFile.fileno())
+        os.replace(sFileTemp, sFile)
+        return sFile
+
+    def Flush(self) -> str:
+        """
+        Se nessun processo OLK è in esecuzione chiude il processo precedente
+        e avvia il comando sul prossimo lotto (rimasto o nuovo).
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Flush"
+        sResult = ""
+
+        with self.lock:
+            if self.jProc is not None:
+                if self.jProc.poll() is None:
+                    return aiSys.ErrorProc(sResult, sProc)
+                self.BatchDone()
+
+            try:
+                # Le mail in attesa diventano lotti nell'ordine di arrivo
+                while self.adictMails:
+                    adictMails = self.adictMails[:self.nBatchMax]
+                    self.asBatches.append(self.BatchWrite(adictMails))
+                    del self.adictMails[:len(adictMails)]
+
+                if self.asBatches:
+                    sFile = self.asBatches[0]
+                    self.jProc = subprocess.Popen(f'"{self.sCmd}" "{sFile}"', shell=True)
+                    self.sBatchRun = self.asBatches.pop(0)
+                    threading.Thread(target=self._wait, args=(self.jProc,),
+                                     name="acJobsOlkSpool", daemon=True).start()
+            except Exception as e:
+                sResult = f"Errore invio mail OLK: {str(e)}"
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def BatchDone(self) -> None:
+        """
+        Chiude il processo terminato: il lotto inviato è rimosso, quello
+        con errore rinominato in .err per l'analisi (chiamata con lock).
+        """
+        nReturn = self.jProc.returncode
+        try:
+            if nReturn == 0:
+                os.remove(self.sBatchRun)
+            else:
+                os.replace(self.sBatchRun, self.sBatchRun + ".err")
+                self.Log(f"Lotto OLK {os.path.basename(self.sBatchRun)} terminato con codice {nReturn}", "ERR")
+        except FileNotFoundError:
+            # Il comando OLK ha già spostato o rimosso il lotto
+            pass
+        except OSError as e:
+            self.Log(f"Errore chiusura lotto OLK {self.sBatchRun}: {str(e)}", "ERR")
+        self.jProc = None
+        self.sBatchRun = ""
+
+    def _wait(self, jProc: subprocess.Popen) -> None:
+        """Attende la fine del processo OLK e avvia il lotto successivo."""
+        jProc.wait()
+        sResult = self.Flush()
+        if sResult != "":
+            self.Log(sResult, "ERR")
+
+    def End(self) -> None:
+        """
+        Scrive le mail in attesa in un lotto senza avviarlo: è inviato
+        al prossimo avvio. Il processo in esecuzione non è interrotto.
+        """
+        with self.lock:
+            try:
+                while self.adictMails:
+                    adictMails = self.adictMails[:self.nBatchMax]
+                    self.asBatches.append(self.BatchWrite(adictMails))
+                    del self.adictMails[:len(adictMails)]
+            except Exception as e:
+                self.Log(f"Errore scrittura spool OLK: {str(e)}", "ERR")
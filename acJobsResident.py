@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# Nomefile: acJobsResident.py
+# -*- coding: utf-8 -*-
+
+"""
+acJobsResident - Worker residenti delle azioni con ACT_RESIDENT
+Per ogni azione residente resta attivo un processo "<script> --serve"
+(acJobsApp.Serve): i job gli sono passati come righe JSON su stdin, con
+ACT_PARAMS dell'azione, e le risposte, nella forma del file .end, sono
+lette da stdout.
+Si evita l'avvio di un interprete per ogni job.
+"""
+
+import os
+import json
+import queue
+import threading
+import subprocess
+from typing import Dict, Any, Optional, Union, List, Tuple
+import aiSys
+
+
+class acJobsResident:
+    """
+    Processi residenti delle azioni, uno per azione (thread safe).
+    Le richieste allo stesso worker sono eseguite una alla volta.
+    """
+
+    def __init__(self):
+        """Inizializza l'elenco dei worker."""
+        self.sPathLog = ""
+        self.jLog = None
+        self.dictWorkers = {}          # ACT_ID -> worker (dizionario, vedi WorkerStart)
+        self.nCounter = 0              # Id delle richieste
+        self.lock = threading.Lock()
+
+    def Start(self, sPathLog: str, jLog: Any = None) -> str:
+        """
+        Imposta la cartella dei log dei worker (stderr di ogni processo).
+        I processi sono avviati al primo job dell'azione.
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Start"
+        sResult = ""
+
+        self.sPathLog = sPathLog
+        self.jLog = jLog
+        if not os.path.isdir(sPathLog):
+            sResult = f"Cartella log worker residenti non esistente: {sPathLog}"
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def Log(self, sText: str, sType: str = "INFO") -> None:
+        """Scrive sul log, se presente (sType "ERR" per gli errori)."""
+        if self.jLog is not None:
+            self.jLog.Log(sType, sText)
+
+    def Call(self, jAction: Any, dictIni: Dict[str, Any], sCwd: str,
+             nTimeout: float) -> Tuple[str, Dict[str, Any]]:
+        """
+        Esegue un job sul worker residente dell'azione, avviandolo se
+        necessario. In caso di timeout il worker è terminato.
+
+        Args:
+            jAction: Record acJobsAction dell'azione
+            dictIni: Contenuto di ntjobsapp.ini (CONFIG e sezione del job)
+            sCwd: Cartella del job
+            nTimeout: Secondi massimi di attesa della risposta
+
+        Returns:
+            Tuple[str, Dict]: (sResult, dizionario del file .end)
+        """
+        sProc = "Call"
+        sResult = ""
+        dictEnd = {}
+
+        with self.lock:
+            jWorker = self.dictWorkers.setdefault(jAction.sId, {"lock": threading.Lock(), "proc": None})
+            self.nCounter += 1
+            nId = self.nCounter
+
+        with jWorker["lock"]:
+            sCmd = f"{jAction.sScript} --serve"
+            if jWorker["proc"] is None or jWorker["proc"].poll() is not None or jWorker["cmd"] != sCmd:
+                self.WorkerStop(jWorker)
+                sResult = self.WorkerStart(jWorker, jAction, sCmd)
+
+            if sResult == "":
+                try:
+                    sLine = json.dumps({"id": nId, "cwd": sCwd, "params": jAction.sParams, "ini": dictIni},
+                                       ensure_ascii=False)
+                    jWorker["proc"].stdin.write(sLine + "\n")
+                    jWorker["proc"].stdin.flush()
+                    sLine = jWorker["queue"].get(timeout=nTimeout)
+                    if sLine is None:
+                        sResult = f"Worker residente {jAction.sId} terminato"
+                    else:
+                        dictResponse = json.loads(sLine)
+                        if dictResponse.get("id") != nId:
+                            sResult = f"Risposta non attesa dal worker residente {jAction.sId}"
+                        else:
+                            dictEnd = dictResponse.get("end", {})
+                except queue.Empty:
+                    sResult = f"Timeout worker residente {jAction.sId}"
+                except Exception as e:
+                    sResult = f"Errore worker residente {jAction.sId}: {str(e)}"
+
+                # Un worker in stato incerto non riceve altre richieste
+                if sResult != "":
+                    self.WorkerStop(jWorker, 0)
+
+        return (aiSys.ErrorProc(sResult, sProc), dictEnd)
+
+    def WorkerStart(self, jWorker: Dict[str, Any], jAction: Any, sCmd: str) -> str:
+        """
+        Avvia il processo residente e il thread che ne legge le risposte.
+        """
+        sProc = "WorkerStart"
+        sResult = ""
+
+        sCwd = jAction.sPath or os.path.dirname(jAction.sScript)
+        try:
+            jProc = subprocess.Popen(
+                sCmd,
+                shell=True,
+                cwd=sCwd or None,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8"
+            )
+        except Exception as e:
+            sResult = f"Errore avvio worker residente {jAction.sId}: {str(e)}"
+            return aiSys.ErrorProc(sResult, sProc)
+
+        jQueue = queue.Queue()
+        jPumpErr = aiSys.acPump()
+        jPumpErr.Start(jProc.stderr.buffer, aiSys.PathMake(self.sPathLog, f"resident_{jAction.sId}", "log"),
+                       f"{jAction.sId} pid {jProc.pid}")
+        threading.Thread(target=self._read, args=(jProc.stdout, jQueue),
+                         name=f"acJobsResident.{jAction.sId}", daemon=True).start()
+
+        jWorker.update({"proc": jProc, "cmd": sCmd, "queue": jQueue, "pump": jPumpErr})
+        self.Log(f"Avviato worker residente {jAction.sId}, pid {jProc.pid}")
+
+        return aiSys.ErrorProc(sResult, sProc)
+
+    def _read(self, hOut: Any, jQueue: queue.Queue) -> None:
+        """Accoda le righe di risposta del worker, None a fine output."""
+        try:
+            for sLine in hOut:
+                jQueue.put(sLine)
+        except (OSError, ValueError):
+            pass
+        jQueue.put(None)
+
+    def WorkerStop(self, jWorker: Dict[str, Any], nWait: float = 5) -> None:
+        """
+        Chiude stdin del worker (fine richieste) e, se non termina entro
+        nWait secondi, lo interrompe.
+        """
+        jProc = jWorker.get("proc")
+        if jProc is None:
+            return
+
+        try:
+            jProc.stdin.close()
+        except OSError:
+            pass
+        try:
+            jProc.wait(timeout=nWait)
+        except subprocess.TimeoutExpired:
+            jProc.terminate()
+            try:
+                jProc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                jProc.kill()
+                jProc.wait()
+        jWorker["pump"].Join(5)
+        jWorker["proc"] = None
+
+    def End(self) -> None:
+        """
+        Termina tutti i worker residenti.
+        """
+        with self.lock:
+            ajWorkers = list(self.dictWorkers.values())
+            self.dictWorkers = {}
+        for jWorker in ajWorkers:
+            with jWorker["lock"]:
+                self.WorkerStop(jWorker)
@@ -10,11 +10,25 @@ acJobsStart - Classe mixin per l'inizializzazione dell'ambiente aiJobsOS
 import os
 import sys
 import time
-from typing import Dict, Any, Optional, Union, List
-from copy import deepcopy
+import socket
+import pickle
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Union, List, Tuple
+
 
 # Import da aiSys (si assume sia disponibile)
 import aiSys
+from acJobsInbox import acJobsInbox
+from acJobsBilling import acJobsBilling
+from acJobsAction import acJobsAction, GroupsMask
+from acJobsMailQueue import acJobsMailQueue
+from acJobsOlkSpool import acJobsOlkSpool
+from acJobsResident import acJobsResident
+from acJobsClaim import acJobsClaim
+
+# Formato dello snapshot delle tabelle verificate (ntjobs_snapshot.pkl)
+JOBS_SNAPSHOT_VERSION = 1
 
 
 class acJobsStart:
@@ -35,11 +49,7 @@ class acJobsStart:
         print("Esecuzione aiJobsOS " + sProc)
         
         # Timestamp inizio sessione
-<<<<<<< HEAD
         self.tsStart = aiSys.Timestamp()
-=======
-        self.tsStart = aiSys.TimeStamp()
->>>>>>> bfee79e9a1dd5326014a7baaa0699a53f6462d9d
         self.tsSearch = self.tsStart
         
         # Cartella di esecuzione dell'applicazione
@@ -62,39 +72,89 @@ class acJobsStart:
             
             self.ConfigUpdate()
             
+            # Opzioni del log: LOG.ASYNC, LOG.ECHO, LOG.LEVEL, LOG.MAXSIZE
+            sTemp = self.Config("LOG.ECHO")
+            bEcho = True if sTemp == "" else aiSys.StringBool(sTemp)
+            sResult = self.jLog.Options(aiSys.StringBool(self.Config("LOG.ASYNC")), bEcho,
+                                        self.Config("LOG.LEVEL"),
+                                        aiSys.StringToNum(self.Config("LOG.MAXSIZE")))
+        
+        if sResult == "":
             sTemp = self.Config("CYCLE.WAIT")
             if sTemp == "":
                 self.nCycleWait = 60
             else:
                 self.nCycleWait = aiSys.StringToNum(sTemp)
             
+            # Scansione completa dei path con watch attivo (senza watch ad ogni ciclo)
             sTemp = self.Config("SEARCH.WAIT")
             if sTemp == "":
                 self.nSearchWait = 900
             else:
                 self.nSearchWait = aiSys.StringToNum(sTemp)
             
+            # Ricarica delle tabelle modificate ad ogni ciclo (default True)
+            sTemp = self.Config("DAT.RELOAD")
+            self.bDatReload = True if sTemp == "" else aiSys.StringBool(sTemp)
+            
+            # Esecuzioni di un jobs.ini non concluso (senza jobs.end) prima dell'errore
+            sTemp = self.Config("EXEC.RETRY")
+            self.nExecRetry = 3 if sTemp == "" else max(1, int(aiSys.StringToNum(sTemp)))
+            
+            # Numero di jobs.ini eseguiti in parallelo
+            self.nWorkers = max(1, int(aiSys.StringToNum(self.Config("WORKERS"))))
+            if self.nWorkers > 1:
+                self.jPool = ThreadPoolExecutor(max_workers=self.nWorkers,
+                                                thread_name_prefix="aiJobsOS")
+            
             print("Caricata CONFIG.INI")
         
+        self.JobsStart_DirCheckReset()
+        
+        # Avvio a caldo: tabelle già verificate dallo snapshot, se i sorgenti non sono cambiati
+        bSnapshot = False
         if sResult == "":
+            bSnapshot = self.JobsStart_SnapshotLoad()
+        
+        if sResult == "" and not bSnapshot:
             sResult = self.JobsStart_ReadDat()
             if sResult == "":
                 print("Caricati DAT")
         
-        if sResult == "":
+        if sResult == "" and not bSnapshot:
             sResult = self.JobsStart_ReadPaths()
             if sResult == "":
                 print("Caricati PATHS")
         
-        if sResult == "":
+        if sResult == "" and not bSnapshot:
             sResult = self.JobsStart_Expand()
         
         if sResult == "":
+            self.JobsStart_Index()
+        
+        if sResult == "" and not bSnapshot:
             sResult = self.JobsStart_Verify()
+            if sResult == "":
+                self.JobsStart_SnapshotSave()
         
         if sResult == "":
             sResult = self.JobsStart_Mail()
         
+        if sResult == "":
+            sResult = self.JobsStart_Claim()
+        
+        if sResult == "":
+            sResult = self.JobsStart_Inbox()
+        
+        if sResult == "":
+            sResult = self.JobsStart_Billing()
+        
+        if sResult == "":
+            sResult = self.JobsStart_Watch()
+        
+        if sResult == "":
+            sResult = self.JobsStart_Resident()
+        
         if sResult != "":
             self.JobsStart_End()
         
@@ -113,10 +173,7 @@ class acJobsStart:
         print("Lettura file " + sFileIni)
         
         sResult, dictTemp = aiSys.read_ini_to_dict(sFileIni)
-<<<<<<< HEAD
         print("Risultato lettura " + sFileIni + ", " + sResult)
-=======
->>>>>>> bfee79e9a1dd5326014a7baaa0699a53f6462d9d
         
         if sResult == "":
             print("Impostazioni di default")
@@ -137,23 +194,14 @@ class acJobsStart:
                 if sKey not in dictTemp:
                     aiSys.ConfigSet(dictTemp, sKey, sValue)
             
-            print("Espansione dizionario Config")
-            dictTemp2 = deepcopy(dictTemp)
-<<<<<<< HEAD
-            aiSys.ExpandDict(dictTemp, dictTemp2)    
-            aiSys.DictPrint(self.dictTemp)
-      
-=======
-            aiSys.ExpandDict(dictTemp, dictTemp2)
-            
->>>>>>> bfee79e9a1dd5326014a7baaa0699a53f6462d9d
-            self.JOBS_TAB_CONFIG = deepcopy(dictTemp)
+            # Espansione alla lettura tramite la vista self.dictConfig
+            self.JOBS_TAB_CONFIG = dictTemp
             self.ConfigUpdate()
             
-            print("Dizionario letto, espanso, aggiornato")
-            aiSys.DictPrint(self.dictConfig)
+            print("Dizionario letto, aggiornato")
+            aiSys.DictPrint(dict(self.dictConfig))
         
-        self.Log1(sResult)
+        self.Log0(sResult, f"Lettura {sFileIni}")
         return aiSys.ErrorProc(sResult, sProc)
     
     def JobsStart_ReadDat(self) -> str:
@@ -165,34 +213,220 @@ class acJobsStart:
         
         print("Esecuzione aiJobsOS " + sProc)
         
-        # Mappatura file CSV -> dizionario target e array header
-        csv_files = [
-            ("ntjobs_actions.csv", "JOBS_TAB_ACTIONS", self.JOBS_DAT_ACTIONS),
-            ("ntjobs_groups.csv", "JOBS_TAB_GROUPS", self.JOBS_DAT_GROUPS),
-            ("ntjobs_users.csv", "JOBS_TAB_USERS", self.JOBS_DAT_USERS)
-        ]
-        
-        for sFileName, sTabName, avHeader in csv_files:
-            sFileCSV = aiSys.PathMake(self.sSys_PathRoot, sFileName)
-            sResult, dictTemp = aiSys.read_csv_to_dict(sFileCSV, avHeader)
+        for sTabName in self.JOBS_DAT_FILES:
+            sResult, dictTemp = self.JobsStart_ReadTab(sTabName)
             
             if sResult != "":
-                self.Log1(sResult)
+                self.Log("ERR", sResult)
                 break
             
-            # Assegna al dizionario corrispondente
-            if sTabName == "JOBS_TAB_ACTIONS":
-                self.JOBS_TAB_ACTIONS = deepcopy(dictTemp)
-                self.asActions = list(self.JOBS_TAB_ACTIONS.keys())
-            elif sTabName == "JOBS_TAB_GROUPS":
-                self.JOBS_TAB_GROUPS = deepcopy(dictTemp)
-                self.asGroups = list(self.JOBS_TAB_GROUPS.keys())
-            elif sTabName == "JOBS_TAB_USERS":
-                self.JOBS_TAB_USERS = deepcopy(dictTemp)
-                self.asUsers = list(self.JOBS_TAB_USERS.keys())
+            self.JobsStart_SetTab(sTabName, dictTemp)
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsStart_SnapshotKey(self) -> Dict[str, Any]:
+        """
+        Chiave dello snapshot: (mtime, dimensione, hash) di ntjobs_config.ini
+        e dei file .csv, con la cartella dell'applicazione e il formato.
+        Un file mancante vale None.
+        """
+        asFiles = [aiSys.PathMake(self.sSys_PathRoot, "ntjobs_config", "ini")]
+        asFiles += [aiSys.PathMake(self.sSys_PathRoot, sFileName) for sFileName, _, _, _ in self.JOBS_DAT_FILES.values()]
+        
+        dictKey = {"VERSION": JOBS_SNAPSHOT_VERSION, "PATHROOT": self.sSys_PathRoot}
+        for sFile in asFiles:
+            try:
+                jStat = os.stat(sFile)
+                with open(sFile, 'rb') as hFile:
+                    sHash = hashlib.sha256(hFile.read()).hexdigest()
+                dictKey[sFile] = (jStat.st_mtime_ns, jStat.st_size, sHash)
+            except OSError:
+                dictKey[sFile] = None
+        return dictKey
+    
+    def JobsStart_SnapshotLoad(self) -> bool:
+        """
+        Carica le tabelle verificate dallo snapshot (SNAPSHOT, default True)
+        se la chiave coincide con i file attuali: ReadDat, ReadPaths, Expand
+        e Verify sono saltati. Ritorna False se lo snapshot non è usabile.
+        """
+        sProc = "JobsStart_SnapshotLoad"
+        
+        sTemp = self.Config("SNAPSHOT")
+        if sTemp != "" and not aiSys.StringBool(sTemp):
+            return False
+        
+        sFileSnap = aiSys.PathMake(self.sSys_PathRoot, "ntjobs_snapshot", "pkl")
+        try:
+            with open(sFileSnap, 'rb') as hFile:
+                dictSnap = pickle.load(hFile)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.Log("ERR", aiSys.ErrorProc(f"Snapshot {sFileSnap} non leggibile: {str(e)}", sProc))
+            return False
+        
+        if dictSnap.get("KEY") != self.JobsStart_SnapshotKey():
+            self.Log1("Snapshot non aggiornato: tabelle rilette e verificate")
+            return False
+        
+        for sTabName in self.JOBS_DAT_FILES:
+            self.JobsStart_SetTab(sTabName, dictSnap[sTabName])
+        self.dictDatStat = dictSnap["DAT_STAT"]
+        self.dictPaths = dictSnap["PATHS"]
+        self.asPaths = list(self.dictPaths.keys())
+        
+        self.Log1(f"Caricato snapshot {sFileSnap}")
+        return True
+    
+    def JobsStart_SnapshotSave(self) -> None:
+        """
+        Salva le tabelle appena verificate nello snapshot (scrittura atomica).
+        La chiave è calcolata dopo la lettura: un file modificato nel
+        frattempo rende lo snapshot non valido al prossimo avvio.
+        """
+        sProc = "JobsStart_SnapshotSave"
+        
+        sTemp = self.Config("SNAPSHOT")
+        if sTemp != "" and not aiSys.StringBool(sTemp):
+            return
+        
+        dictSnap = {
+            "KEY": self.JobsStart_SnapshotKey(),
+            "DAT_STAT": self.dictDatStat,
+            "PATHS": self.dictPaths,
+        }
+        for sTabName in self.JOBS_DAT_FILES:
+            dictSnap[sTabName] = getattr(self, sTabName)
+        
+        # Dati letti da file modificati durante la lettura: nessuno snapshot
+        for sTabName, (sFileName, _, _, _) in self.JOBS_DAT_FILES.items():
+            tKey = dictSnap["KEY"][aiSys.PathMake(self.sSys_PathRoot, sFileName)]
+            if tKey is None or tKey[:2] != self.dictDatStat.get(sTabName):
+                return
+        
+        sFileSnap = aiSys.PathMake(self.sSys_PathRoot, "ntjobs_snapshot", "pkl")
+        sFileTemp = sFileSnap + ".tmp"
+        try:
+            with open(sFileTemp, 'wb') as hFile:
+                pickle.dump(dictSnap, hFile, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(sFileTemp, sFileSnap)
+        except Exception as e:
+            self.Log("ERR", aiSys.ErrorProc(f"Errore scrittura snapshot {sFileSnap}: {str(e)}", sProc))
+    
+    def JobsStart_ReadTab(self, sTabName: str) -> Tuple[str, Dict]:
+        """
+        Legge il file .csv di una tabella e ne registra mtime e dimensione.
+        
+        Returns:
+            Tuple[str, Dict]: (sResult, dictTab)
+        """
+        sProc = "JobsStart_ReadTab"
+        
+        sFileName, sHeader, sHeaderOpt, _ = self.JOBS_DAT_FILES[sTabName]
+        sFileCSV = aiSys.PathMake(self.sSys_PathRoot, sFileName)
+        
+        # Stat prima della lettura: una modifica durante la lettura è rilevata al ciclo successivo
+        try:
+            jStat = os.stat(sFileCSV)
+            self.dictDatStat[sTabName] = (jStat.st_mtime_ns, jStat.st_size)
+        except OSError:
+            self.dictDatStat[sTabName] = None
+        
+        asHeaderOpt = getattr(self, sHeaderOpt) if sHeaderOpt else None
+        sResult, dictTemp = aiSys.read_csv_to_dict(sFileCSV, getattr(self, sHeader), ";", asHeaderOpt)
+        
+        return (aiSys.ErrorProc(sResult, sProc), dictTemp)
+    
+    def JobsStart_SetTab(self, sTabName: str, dictTab: Dict[str, Any]) -> None:
+        """
+        Sostituisce una tabella e l'array delle sue chiavi.
+        """
+        _, _, _, sKeys = self.JOBS_DAT_FILES[sTabName]
+        setattr(self, sTabName, dictTab)
+        setattr(self, sKeys, list(dictTab.keys()))
+    
+    def JobsReload(self) -> str:
+        """
+        Ricarica le tabelle .csv modificate dall'ultima lettura (DAT.RELOAD).
+        Chiamata una volta per ciclo, fra un jobs.ini e l'altro: le tabelle
+        nuove sono espanse, verificate con le sole verifiche interessate e
+        sostituite insieme solo se corrette. I jobs.ini già affidati ai worker
+        proseguono con le tabelle precedenti.
+        """
+        sProc = "JobsReload"
+        sResult = ""
+        
+        if not self.bDatReload:
+            return sResult
+        
+        dictNew = {}
+        for sTabName, (sFileName, _, _, _) in self.JOBS_DAT_FILES.items():
+            try:
+                jStat = os.stat(aiSys.PathMake(self.sSys_PathRoot, sFileName))
+                tStat = (jStat.st_mtime_ns, jStat.st_size)
+            except OSError:
+                tStat = None
+            
+            if tStat == self.dictDatStat.get(sTabName):
+                continue
+            
+            sResultTab, dictTemp = self.JobsStart_ReadTab(sTabName)
+            if sResultTab != "":
+                sResult += f"{sResultTab}. "
+            else:
+                dictNew[sTabName] = aiSys.ExpandDict(dictTemp, self.dictConfig)
+        
+        if not dictNew and sResult == "":
+            return sResult
+        
+        self.JobsStart_DirCheckReset()
+        
+        # Verifiche: i gruppi modificati richiedono la verifica di utenti e azioni
+        if sResult == "":
+            bGroups = "JOBS_TAB_GROUPS" in dictNew
+            dictGroups = dictNew.get("JOBS_TAB_GROUPS", self.JOBS_TAB_GROUPS)
+            asGroups = list(dictGroups.keys())
+            
+            if bGroups:
+                sResult += self.JobsStart_VerifyGroups(dictGroups)
+            if bGroups or "JOBS_TAB_USERS" in dictNew:
+                sResult += self.JobsStart_VerifyUsers(dictNew.get("JOBS_TAB_USERS", self.JOBS_TAB_USERS), asGroups)
+            if bGroups or "JOBS_TAB_ACTIONS" in dictNew:
+                sResult += self.JobsStart_VerifyActions(dictNew.get("JOBS_TAB_ACTIONS", self.JOBS_TAB_ACTIONS), asGroups)
+        
+        if sResult == "":
+            for sTabName, dictTab in dictNew.items():
+                self.JobsStart_SetTab(sTabName, dictTab)
+            self.JobsStart_Index()
+            if "JOBS_TAB_USERS" in dictNew:
+                self.JobsReloadPaths()
+            self.JobsStart_SnapshotSave()
+            self.Log1(f"Ricaricate tabelle {', '.join(dictNew.keys())}")
+        else:
+            sResult = f"Tabelle non ricaricate, restano le precedenti: {sResult}"
+            self.Log("ERR", sResult)
         
         return aiSys.ErrorProc(sResult, sProc)
     
+    def JobsReloadPaths(self) -> None:
+        """
+        Ricalcola i path utente dopo la ricarica di JOBS_TAB_USERS,
+        aggiunge i nuovi path all'osservazione e toglie quelli rimossi.
+        """
+        self.JobsStart_ReadPaths()
+        
+        if self.jWatch is not None:
+            for sPath in set(self.jWatch.dictWd.values()) | set(self.jWatch.asPathsPoll):
+                if sPath not in self.dictPaths:
+                    self.jWatch.Remove(sPath)
+            asWatched = list(self.jWatch.dictWd.values())
+            for sPath in self.asPaths:
+                if sPath not in asWatched and sPath not in self.jWatch.asPathsPoll and not self.jWatch.Add(sPath):
+                    self.jWatch.asPathsPoll.append(sPath)
+        
+        self.bSearchFull = True
+    
     def JobsStart_ReadPaths(self) -> str:
         """
         Inizializza il dizionario self.dictPaths con tutti i path degli utenti.
@@ -216,21 +450,19 @@ class acJobsStart:
                     self.Log1(f"Path vuoto per user {sUser}")
                     continue
                 
-                if not aiSys.DirExists(sPathSingle):
-                    self.Log1(f"Path non esistente per user {sUser}: {sPathSingle}")
-                
                 dictTemp[sPathSingle] = sUser
         
-        self.dictPaths = deepcopy(dictTemp)
+        self.dictPaths = dictTemp
         self.asPaths = list(self.dictPaths.keys())
         
-        # Verifica esistenza folder
+        # Verifica esistenza folder (in parallelo; non raggiungibili = degradati, non errori)
+        dictExists = self.JobsStart_DirCheck(self.asPaths)
         for sPath in self.asPaths:
-            if not aiSys.DirExists(sPath):
+            if dictExists[sPath] is False:
                 sResult += f"Non trovato Path {sPath}. "
         
         if sResult:
-            self.Log1(sResult)
+            self.Log("ERR", sResult)
         
         return aiSys.ErrorProc(sResult, sProc)
     
@@ -249,10 +481,10 @@ class acJobsStart:
             print("Inizializzazione SMTP")
             
             try:
-                from NcMailSimple import NcMailSimple
-                self.jMail = NcMailSimple()
+                from ncMailSimple import NC_MailSimple
+                self.jMail = NC_MailSimple()
             except Exception as e:
-                sResult = f"Errore creazione NcMailSimple: {str(e)}"
+                sResult = f"Errore creazione NC_MailSimple: {str(e)}"
             
             if sResult == "":
                 self.sMailAdmin = self.Config("ADMIN.EMAIL")
@@ -267,6 +499,14 @@ class acJobsStart:
                     sResult = "Settings mail non presenti in config"
             
             if sResult == "":
+                # Connessione riusata: NOOP solo dopo MAIL.IDLE secondi di inattività
+                sTemp = self.Config("MAIL.IDLE")
+                self.jMail.nIdleCheck = 60 if sTemp == "" else aiSys.StringToNum(sTemp)
+                # Allegati oltre MAIL.STREAM.SIZE byte in streaming, oltre MAIL.ZIP.SIZE compressi (0 = mai)
+                sTemp = self.Config("MAIL.STREAM.SIZE")
+                self.jMail.nStreamSize = 1048576 if sTemp == "" else aiSys.StringToNum(sTemp)
+                sTemp = self.Config("MAIL.ZIP.SIZE")
+                self.jMail.nZipSize = 0 if sTemp == "" else aiSys.StringToNum(sTemp)
                 sResult = self.jMail.Start(sSmtp_User, sSmtp_Pwd, sSmtp_Host, 
                                           nSmtp_Port, 30, bSmtp_SSL, True)
                 if sResult == "":
@@ -281,11 +521,191 @@ class acJobsStart:
                 sResult = "OLK MAIL NON PRESENTE"
             else:
                 self.sSys_Olk = aiSys.PathMake(self.sSys_PathOlk, "ntj_sendmail_olk", "cmd")
+                # Mail raccolte in lotti, al più un processo OLK alla volta
+                sTemp = self.Config("MAIL.OLK.BATCH")
+                nBatchMax = 50 if sTemp == "" else aiSys.StringToNum(sTemp)
+                jOlkSpool = acJobsOlkSpool()
+                sResult = jOlkSpool.Start(self.sSys_PathOlk, self.sSys_Olk, self.jLog, nBatchMax)
+                if sResult == "":
+                    self.jOlkSpool = jOlkSpool
         
         if sResult == "":
             self.sMailEngine = sEngine
+            sResult = self.JobsStart_MailQueue()
+        
+        if sResult != "":
+            self.Log("ERR", sResult)
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsStart_MailQueue(self) -> str:
+        """
+        Avvia la coda persistente delle mail (MAIL.QUEUE, default True).
+        Spool in MAIL.SPOOL, nuovi tentativi MAIL.RETRY.MAX e MAIL.RETRY.WAIT.
+        Il digest (MAIL.DIGEST) richiede la coda: senza, le mail partono subito.
+        """
+        sProc = "JobsStart_MailQueue"
+        sResult = ""
+        
+        self.jMailQueue = None
+        sTemp = self.Config("MAIL.QUEUE")
+        if sTemp != "" and not aiSys.StringBool(sTemp):
+            if aiSys.StringToNum(self.Config("MAIL.DIGEST")) > 0:
+                self.Log("ERR", "MAIL.DIGEST ignorato con MAIL.QUEUE=False: mail di completamento inviate subito")
+            return aiSys.ErrorProc(sResult, sProc)
+        
+        sPathSpool = self.Config("MAIL.SPOOL")
+        if sPathSpool == "":
+            sPathSpool = aiSys.PathMake(self.sSys_PathRoot, "spool")
+        
+        sTemp = self.Config("MAIL.RETRY.MAX")
+        nRetryMax = 10 if sTemp == "" else aiSys.StringToNum(sTemp)
+        sTemp = self.Config("MAIL.RETRY.WAIT")
+        nRetryWait = 30 if sTemp == "" else aiSys.StringToNum(sTemp)
+        
+        jMailQueue = acJobsMailQueue()
+        sResult = jMailQueue.Start(sPathSpool, self.JobsMailSend, self.jLog, nRetryMax, nRetryWait)
+        if sResult == "":
+            self.jMailQueue = jMailQueue
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsStart_Inbox(self) -> str:
+        """
+        Carica l'indice della inbox (INBOX.REBUILD=True lo ricostruisce dal disco).
+        """
+        sProc = "JobsStart_Inbox"
+        sResult = ""
+        
+        print("Esecuzione aiJobsOS " + sProc)
+        
+        self.jInbox = acJobsInbox()
+        bRebuild = aiSys.StringBool(self.Config("INBOX.REBUILD"))
+        if self.jClaim is None:
+            sResult = self.jInbox.Start(self.sSys_PathInbox, bRebuild)
+        else:
+            # Inbox condivisa: journal del nodo, indice sempre ricostruito dal disco
+            sName = "inbox_" + "".join(c if c.isalnum() else "_" for c in self.jClaim.sNode)
+            sResult = self.jInbox.Start(self.sSys_PathInbox, True, sName)
+        
+        if sResult == "":
+            self.Log1(f"Inbox: {len(self.jInbox.dictState)} cartelle in indice")
+        else:
+            self.Log("ERR", sResult)
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsStart_Claim(self) -> str:
+        """
+        Inbox condivisa tra più nodi aiJobsOS (INBOX.SHARED=True): ogni
+        cartella è spostata, eseguita e archiviata dal solo nodo che ne
+        tiene il lease (acJobsClaim).
+        NODE.ID: id del nodo, unico tra i nodi (default nome host)
+        INBOX.LEASE: secondi dopo i quali il claim di un nodo fermo scade (default 60)
+        """
+        sProc = "JobsStart_Claim"
+        sResult = ""
+        
+        self.jClaim = None
+        if not aiSys.StringBool(self.Config("INBOX.SHARED")):
+            return aiSys.ErrorProc(sResult, sProc)
+        
+        print("Esecuzione aiJobsOS " + sProc)
+        
+        sNode = self.Config("NODE.ID")
+        if sNode == "":
+            sNode = socket.gethostname()
+        sTemp = self.Config("INBOX.LEASE")
+        nLease = 60 if sTemp == "" else aiSys.StringToNum(sTemp)
+        
+        jClaim = acJobsClaim()
+        sResult = jClaim.Start(sNode, nLease, self.jLog)
+        if sResult == "":
+            self.jClaim = jClaim
+            self.Log1(f"Inbox condivisa, nodo {sNode}, lease {nLease} secondi")
+        else:
+            self.Log("ERR", sResult)
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsStart_Billing(self) -> str:
+        """
+        Apre il file di billing con scrittura bufferizzata.
+        BILL.FLUSH.RECORDS, BILL.FLUSH.TIME: soglie di scrittura del buffer
+        BILL.SYNC: fsync ad ogni scrittura (default True)
+        BILL.ROTATE: DAY, SIZE o vuoto; BILL.ROTATE.SIZE: byte per SIZE
+        """
+        sProc = "JobsStart_Billing"
+        sResult = ""
+        
+        print("Esecuzione aiJobsOS " + sProc)
+        
+        self.sSys_BillFile = aiSys.PathMake(self.sSys_PathRoot, "ntjobs_billing", "csv")
+        asHeader = ["TS_START", "TS_END", "USER", "ACTION", "COMMAND", "TAGS", "NOTES"]
+        
+        sTemp = self.Config("BILL.FLUSH.RECORDS")
+        nFlushRecords = 100 if sTemp == "" else aiSys.StringToNum(sTemp)
+        sTemp = self.Config("BILL.FLUSH.TIME")
+        nFlushTime = 10 if sTemp == "" else aiSys.StringToNum(sTemp)
+        sTemp = self.Config("BILL.SYNC")
+        bSync = True if sTemp == "" else aiSys.StringBool(sTemp)
+        sTemp = self.Config("BILL.ROTATE.SIZE")
+        nRotateSize = 10485760 if sTemp == "" else aiSys.StringToNum(sTemp)
+        
+        self.jBill = acJobsBilling()
+        sResult = self.jBill.Start(self.sSys_BillFile, asHeader, ";", nFlushRecords, nFlushTime,
+                                   bSync, self.Config("BILL.ROTATE"), nRotateSize)
+        
+        if sResult != "":
+            self.Log("ERR", sResult)
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsStart_Resident(self) -> str:
+        """
+        Prepara i worker residenti delle azioni con ACT_RESIDENT=True,
+        avviati al primo job. Log dei worker in RESIDENT.LOG (default root).
+        """
+        sProc = "JobsStart_Resident"
+        sResult = ""
+        
+        sPathLog = self.Config("RESIDENT.LOG")
+        if sPathLog == "":
+            sPathLog = self.sSys_PathRoot
+        
+        jResident = acJobsResident()
+        sResult = jResident.Start(sPathLog, self.jLog)
+        if sResult == "":
+            self.jResident = jResident
+        else:
+            self.Log("ERR", sResult)
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsStart_Watch(self) -> str:
+        """
+        Avvia l'osservazione dei path utente (SEARCH.WATCH=True).
+        Se inotify non è disponibile resta la scansione a polling.
+        """
+        sProc = "JobsStart_Watch"
+        sResult = ""
+        
+        print("Esecuzione aiJobsOS " + sProc)
+        
+        self.jWatch = None
+        if not aiSys.StringBool(self.Config("SEARCH.WATCH")):
+            return aiSys.ErrorProc(sResult, sProc)
+        
+        jWatch = aiSys.acWatch()
+        sResultWatch = jWatch.Start(self.asPaths, ["jobs.ini"])
+        
+        if sResultWatch != "":
+            self.Log1(f"Watch non attivo, uso polling: {sResultWatch}")
         else:
-            self.Log1(sResult)
+            self.jWatch = jWatch
+            for sPath in jWatch.asPathsPoll:
+                self.Log1(f"Path non osservabile, uso polling: {sPath}")
+            self.Log1(f"Watch attivo su {len(jWatch.dictWd)} path")
         
         return aiSys.ErrorProc(sResult, sProc)
     
@@ -298,17 +718,32 @@ class acJobsStart:
         
         print("Esecuzione aiJobsOS " + sProc)
         
-        # Espandi dictConfig
-        aiSys.ExpandDict(self.dictConfig, self.dictConfig)
+        # dictConfig non va espansa: la vista espande i valori alla lettura
         
-        # Espandi tabelle
-        for dictTemp in [self.JOBS_TAB_USERS, self.JOBS_TAB_GROUPS, self.JOBS_TAB_ACTIONS]:
+        # Espandi tabelle (ExpandDict ritorna un nuovo dizionario)
+        for sTabName in ["JOBS_TAB_USERS", "JOBS_TAB_GROUPS", "JOBS_TAB_ACTIONS"]:
+            dictTemp = getattr(self, sTabName)
             if dictTemp:
-                aiSys.ExpandDict(dictTemp, self.dictConfig)
+                setattr(self, sTabName, aiSys.ExpandDict(dictTemp, self.dictConfig))
         
         print("Conclusione Start.Expand")
         return aiSys.ErrorProc(sResult, sProc)
     
+    def JobsStart_Index(self) -> None:
+        """
+        Precalcola dalle tabelle le maschere di bit dei gruppi di utenti e
+        azioni e i record acJobsAction. I nuovi indici sostituiscono
+        insieme i precedenti.
+        """
+        dictGroupsBit = {sGroup: 1 << nBit for nBit, sGroup in enumerate(self.JOBS_TAB_GROUPS)}
+        
+        dictUsersMask = {sUser: GroupsMask(dictUser.get("USER_GROUPS", ""), dictGroupsBit)
+                         for sUser, dictUser in self.JOBS_TAB_USERS.items()}
+        dictActionsRec = {sAction: acJobsAction(dictAction, dictGroupsBit)
+                          for sAction, dictAction in self.JOBS_TAB_ACTIONS.items()}
+        
+        self.dictGroupsBit, self.dictUsersMask, self.dictActionsRec = dictGroupsBit, dictUsersMask, dictActionsRec
+    
     def JobsStart_Verify(self) -> str:
         """
         Verifica la congruità delle tabelle di memoria dei parametri.
@@ -318,9 +753,9 @@ class acJobsStart:
         
         print("Esecuzione aiJobsOS " + sProc)
         
-        # Verifica JOBS_TAB_CONFIG
+        # Verifica JOBS_TAB_CONFIG (valori espansi della vista di sistema)
         print("Verifica JOBS_TAB_CONFIG")
-        for sKey, sValue in self.JOBS_TAB_CONFIG.items():
+        for sKey, sValue in self.dictConfig.items():
             if sKey == "ADMIN.EMAIL":
                 if not aiSys.isEmail(sValue):
                     sResult += "ADMIN.MAIL non corretta. "
@@ -345,13 +780,13 @@ class acJobsStart:
                     sResult += "MAIL.PATH non corretta. "
         
         # Verifiche SMTP
-        if self.JOBS_TAB_CONFIG.get("MAIL.ENGINE") == "SMTP":
+        if self.dictConfig.get("MAIL.ENGINE") == "SMTP":
             print("Verifica JOBS_TAB_CONFIG SMTP")
             for sKey in self.JOBS_DAT_CONFIG_SMTP:
-                if sKey not in self.JOBS_TAB_CONFIG or not self.JOBS_TAB_CONFIG[sKey]:
+                if sKey not in self.dictConfig or not self.dictConfig[sKey]:
                     sResult += f"Config non presente {sKey}. "
                 else:
-                    sValue = self.JOBS_TAB_CONFIG[sKey]
+                    sValue = self.dictConfig[sKey]
                     if sKey == "SMTP.FROM" and not aiSys.isEmail(sValue):
                         sResult += "SMTP.FROM non è email. "
                     elif sKey == "SMTP.SSL" and not aiSys.StringBool(sValue):
@@ -359,9 +794,33 @@ class acJobsStart:
                     elif sKey == "SMTP.TLS" and not aiSys.StringBool(sValue):
                         sResult += "SMTP.TLS non corretto. "
         
-        # Verifica JOBS_TAB_USERS
+        sResult += self.JobsStart_VerifyUsers(self.JOBS_TAB_USERS, self.asGroups)
+        sResult += self.JobsStart_VerifyGroups(self.JOBS_TAB_GROUPS)
+        sResult += self.JobsStart_VerifyActions(self.JOBS_TAB_ACTIONS, self.asGroups)
+        
+        if sResult:
+            self.Log("ERR", sResult)
+        
+        return aiSys.ErrorProc(sResult, sProc)
+    
+    def JobsStart_VerifyUsers(self, dictUsers: Dict[str, Any], asGroups: List[str]) -> str:
+        """
+        Verifica una tabella utenti (gruppi esistenti in asGroups).
+        
+        Returns:
+            str: Errori riscontrati, "" se corretta
+        """
+        sResult = ""
+        
+        setGroups = set(asGroups)
+        
+        # Esistenza dei path verificata in parallelo prima del controllo dei campi
+        asPathsAll = [aiSys.Expand(sPath, self.dictConfig) for dictValue in dictUsers.values()
+                      for sPath in aiSys.StringToArray(dictValue.get("USER_PATHS", ""), ",")]
+        dictExists = self.JobsStart_DirCheck(asPathsAll)
+        
         print("Verifica JOBS_TAB_USERS")
-        for sUser, dictValue in self.JOBS_TAB_USERS.items():
+        for sUser, dictValue in dictUsers.items():
             for sKey, sVal in dictValue.items():
                 if sKey == "USER":
                     if not sVal or not sVal.isalnum():
@@ -370,23 +829,33 @@ class acJobsStart:
                     if sVal and not sVal.replace(" ", "").isalpha():
                         sResult += f"Errore verifica {sKey}, per user {sUser}. "
                 elif sKey == "USER_GROUPS":
-                    asGroups = aiSys.StringToArray(sVal, ",")
-                    for sGroup in asGroups:
-                        if sGroup not in self.asGroups:
+                    asGroupsUser = aiSys.StringToArray(sVal, ",")
+                    for sGroup in asGroupsUser:
+                        if sGroup not in setGroups:
                             sResult += f"Errore verifica {sKey}, gruppo {sGroup} non esiste per user {sUser}. "
                 elif sKey == "USER_PATHS":
                     asPaths = aiSys.StringToArray(sVal, ",")
                     for sPath in asPaths:
                         sPathExp = aiSys.Expand(sPath, self.dictConfig)
-                        if not aiSys.DirExists(sPathExp):
+                        if dictExists[sPathExp] is False:
                             sResult += f"Errore verifica {sKey}, path {sPathExp} non esiste per user {sUser}. "
                 elif sKey == "USER_MAIL":
                     if not aiSys.isEmail(sVal):
                         sResult += f"Errore verifica {sKey}, per user {sUser}. "
         
-        # Verifica JOBS_TAB_GROUPS
+        return sResult
+    
+    def JobsStart_VerifyGroups(self, dictGroups: Dict[str, Any]) -> str:
+        """
+        Verifica una tabella gruppi.
+        
+        Returns:
+            str: Errori riscontrati, "" se corretta
+        """
+        sResult = ""
+        
         print("Verifica JOBS_TAB_GROUPS")
-        for sGroup, dictValue in self.JOBS_TAB_GROUPS.items():
+        for sGroup, dictValue in dictGroups.items():
             for sKey, sVal in dictValue.items():
                 if sKey == "GROUP_ID":
                     if not sVal or not sVal.isalnum():
@@ -395,9 +864,24 @@ class acJobsStart:
                     if sVal and not sVal.replace(" ", "").isalpha():
                         sResult += f"Errore verifica {sKey}, per Gruppo {sGroup}. "
         
-        # Verifica JOBS_TAB_ACTIONS
+        return sResult
+    
+    def JobsStart_VerifyActions(self, dictActions: Dict[str, Any], asGroups: List[str]) -> str:
+        """
+        Verifica una tabella azioni (gruppi esistenti in asGroups).
+        
+        Returns:
+            str: Errori riscontrati, "" se corretta
+        """
+        sResult = ""
+        
+        setGroups = set(asGroups)
+        
+        dictExists = self.JobsStart_DirCheck([dictValue["ACT_PATH"] for dictValue in dictActions.values()
+                                              if dictValue.get("ACT_PATH")])
+        
         print("Verifica JOBS_TAB_ACTIONS")
-        for sAction, dictValue in self.JOBS_TAB_ACTIONS.items():
+        for sAction, dictValue in dictActions.items():
             for sKey, sVal in dictValue.items():
                 if sKey == "ACT_ID":
                     if not sVal or not sVal.isalnum():
@@ -406,21 +890,62 @@ class acJobsStart:
                     if sVal and not sVal.replace(" ", "").isalpha():
                         sResult += f"Errore verifica {sKey}, per action {sAction}. "
                 elif sKey == "ACT_GROUPS":
-                    asGroups = aiSys.StringToArray(sVal, ",")
-                    for sGroup in asGroups:
-                        if sGroup not in self.asGroups:
+                    asGroupsAct = aiSys.StringToArray(sVal, ",")
+                    for sGroup in asGroupsAct:
+                        if sGroup not in setGroups:
                             sResult += f"Errore verifica {sKey}, gruppo {sGroup} non esiste per action {sAction}. "
                 elif sKey == "ACT_ENABLED":
                     if not isinstance(aiSys.StringBool(sVal), bool):
                         sResult += f"Errore verifica {sKey}, per action {sAction}. "
                 elif sKey == "ACT_PATH":
-                    if sVal and not aiSys.DirExists(sVal):
+                    if sVal and dictExists[sVal] is False:
                         sResult += f"Errore verifica {sKey}, path {sVal} non esiste per action {sAction}. "
         
-        if sResult:
-            self.Log1(sResult)
+        return sResult
+    
+    def JobsStart_DirCheck(self, asPaths: List[str]) -> Dict[str, Optional[bool]]:
+        """
+        Verifica l'esistenza delle cartelle in parallelo (DIR.WORKERS
+        verifiche contemporanee, default 16; DIR.TIMEOUT secondi per
+        verifica, default 5). I risultati restano in self.dictDirCheck
+        fino a JobsStart_DirCheckReset: ogni cartella è verificata una volta.
+        Le cartelle che non rispondono in tempo (share non raggiungibili)
+        valgono None e sono segnalate come degradate, senza bloccare l'avvio.
+        Un solo messaggio di log riassume le verifiche.
+        
+        Returns:
+            Dict[str, Optional[bool]]: Cartella -> True, False o None (degradata)
+        """
+        asNew = [sPath for sPath in dict.fromkeys(asPaths) if sPath not in self.dictDirCheck]
         
-        return aiSys.ErrorProc(sResult, sProc)
+        if asNew:
+            sTemp = self.Config("DIR.WORKERS")
+            nWorkers = 16 if sTemp == "" else int(aiSys.StringToNum(sTemp))
+            sTemp = self.Config("DIR.TIMEOUT")
+            nTimeout = 5.0 if sTemp == "" else aiSys.StringToNum(sTemp)
+            
+            tsStart = time.monotonic()
+            dictNew = aiSys.DirExistsMany(asNew, nWorkers, nTimeout)
+            self.dictDirCheck.update(dictNew)
+            
+            asMissing = [sPath for sPath, bExists in dictNew.items() if bExists is False]
+            asDegraded = [sPath for sPath, bExists in dictNew.items() if bExists is None]
+            sReport = (f"Verifica cartelle: {len(asNew)} in {time.monotonic() - tsStart:.2f}s, "
+                       f"{len(asMissing)} non esistenti, {len(asDegraded)} non raggiungibili")
+            if asMissing:
+                sReport += f". Non esistenti: {', '.join(asMissing)}"
+            if asDegraded:
+                sReport += f". Degradate (timeout {nTimeout}s): {', '.join(asDegraded)}"
+            self.Log1(sReport)
+        
+        return {sPath: self.dictDirCheck[sPath] for sPath in asPaths}
+    
+    def JobsStart_DirCheckReset(self) -> None:
+        """
+        Scarta i risultati delle verifiche delle cartelle: la prossima
+        JobsStart_DirCheck verifica di nuovo lo stato attuale.
+        """
+        self.dictDirCheck = {}
     
     def JobsStart_End(self) -> None:
         """
@@ -8,7 +8,6 @@ acJobsUsers - Classe mixin per la gestione login/logoff utenti
 """
 
 from typing import Dict, Any, Optional, Union, List
-from copy import deepcopy
 import aiSys
 
 
@@ -24,7 +23,7 @@ class acJobsUsers:
         sProc = "JobsUserLogin"
         sResult = ""
         
-        dictTemp = deepcopy(self.dictJobs["CONFIG"])
+        dictTemp = self.dictJobs["CONFIG"]
         sUserVerify = dictTemp.get("USER", "")
         
         if not sUserVerify:
@@ -33,13 +32,14 @@ class acJobsUsers:
             sResult = f"Utente non trovato {sUserVerify}"
         
         if sResult == "":
-            dictUserTemp = deepcopy(self.JOBS_TAB_USERS[sUserVerify])
+            dictUserTemp = dict(self.JOBS_TAB_USERS[sUserVerify])
             sUser = dictUserTemp.get("USER", "")
             
             if sUser:
                 dictUserTemp["USER_GROUPS"] = aiSys.StringToArray(dictUserTemp.get("USER_GROUPS", ""), ",")
                 self.sUser = sUser
-                self.dictUser = deepcopy(dictUserTemp)
+                self.dictUser = dictUserTemp
+                self.nUserGroups = self.dictUsersMask.get(sUserVerify, 0)
                 print(f"Logon utente {sUser}")
             else:
                 sResult = f"Credenziali non valide per utente {sUser}"
@@ -59,6 +59,7 @@ class acJobsUsers:
         
         self.dictUser = None
         self.sUser = ""
+        self.nUserGroups = 0
         
         return sResult
 
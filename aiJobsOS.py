@@ -42,8 +42,9 @@ def Start() -> None:
             
             if sResult != "":
                 jData.Log("Errore", f"Errore in Esecuzione Run: {sResult}")
-            
-            jData.CycleEnd()
+    
+    # Chiusura di billing, inbox, watch e log (anche dopo uno Start fallito)
+    jData.End()
     
     print("Uscita dall'applicativo")
     sys.exit(0)
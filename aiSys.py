@@ -2,263 +2,219 @@
 # -*- coding: utf-8 -*-
 """
 aiSys.py - Libreria principale di funzioni di supporto
-Importa tutti i moduli e li espone nel namespace aiSys
+Espone nel namespace aiSys le funzioni di tutti i moduli aiSys*.
+I moduli sono importati al primo uso di un loro nome (__getattr__ di
+modulo): un'applicazione che usa poche funzioni non paga l'import di
+csv, json, xml, re, ctypes ecc. all'avvio.
 """
 
 import os
 import sys
-<<<<<<< HEAD
-from pathlib import Path
-=======
->>>>>>> bfee79e9a1dd5326014a7baaa0699a53f6462d9d
+import importlib
+
+# =============================================================================
+# NOMI ESPOSTI, PER MODULO (nell'ordine di __all__)
+# =============================================================================
+_LAZY_MODULES = {
+    "aiSysTimestamp": [
+        'Timestamp',
+        'TimestampConvert',
+        'TimestampFromSeconds',
+        'TimestampFromDays',
+        'TimestampValidate',
+        'TimestampDiff',
+        'TimestampAdd',
+        'TimestampIsoFrom',
+        'TimestampIsoTo',
+    ],
+    "aiSysConfig": [
+        'Expand',
+        'ExpandConvert',
+        'ExpandDict',
+        'isGroups',
+        'Config',
+        'ConfigDefault',
+        'SplitSettings',
+        'ConfigSet',
+        'acConfigView',
+    ],
+    "aiSysFileio": [
+        'read_csv_to_dict',
+        'save_dict_to_csv',
+        'csv_line_from_dict',
+        'read_ini_to_dict',
+        'save_dict_to_ini',
+        'ini_text_to_dict',
+        'ini_text_from_dict',
+        'ini_cache_drop',
+        'save_array_file',
+        'read_array_file',
+        'isValidPath',
+        'isFilename',
+        'PathMake',
+        'DirExists',
+        'DirExistsMany',
+    ],
+    "aiSysStrings": [
+        'StringAppend',
+        'StringBool',
+        'isValidPassword',
+        'isLettersOnly',
+        'isEmail',
+        'StringToArray',
+        'StringToNum',
+        'StringWash',
+    ],
+    "aiSysDictToString": [
+        'DictPrint',
+        'DictToXml',
+        'DictToString',
+    ],
+    "aiSysBase": [
+        'ErrorProc',
+        'DictMerge',
+        'DictExist',
+        'loc_ErrorProc',  # Alias locale
+    ],
+    "aiSysLog": [
+        'acLog',
+    ],
+    "aiSysWatch": [
+        'acWatch',
+    ],
+    "aiSysPump": [
+        'acPump',
+    ],
+    "aiSysStat": [
+        'acStatCache',
+    ],
+}
+
+# Alias -> nome nel modulo
+_LAZY_ALIAS = {
+    'loc_ErrorProc': 'ErrorProc',   # Alias locale per ErrorProc (per compatibilità)
+}
+
+# Nome -> modulo
+_LAZY_NAMES = {sName: sModule for sModule, asNames in _LAZY_MODULES.items() for sName in asNames}
 
-# Importa TUTTE le funzioni da tutti i moduli
 # =============================================================================
-# Da aiSysTimestamp.py
-# =============================================================================
-try:
-    from aiSysTimestamp import (
-        Timestamp,
-        TimestampConvert,
-        TimestampFromSeconds,
-        TimestampFromDays,
-        TimestampValidate,
-        TimestampDiff,
-        TimestampAdd,
-        TimestampIsoFrom,
-        TimestampIsoTo
-    )
-except ImportError as e:
-    print(f"Errore import aiSysTimestamp: {e}")
-    sys.exit(1)
-
-# =============================================================================
-# Da aiSysConfig.py (se esiste)
+# ELENCO COMPLETO DI TUTTE LE FUNZIONI ESPOSTE NEL NAMESPACE aiSys
 # =============================================================================
-try:
-    from aiSysConfig import (
-        Expand,
-        ExpandConvert,
-        ExpandDict,
-        isGroups,
-        Config,
-        ConfigDefault,
-        SplitSettings,
-        ConfigSet
-    )
-except ImportError:
-    # Inizializza funzioni placeholder se il modulo non esiste ancora
-    def Expand(sText, dictConfig):
-        return sText
-    
-    def ExpandConvert(sString):
-        return sString
-    
-    def ExpandDict(dictExpand, dictParam):
-        return dictExpand
-    
-    def isGroups(asGroups1, asGroups2):
-        return False
-    
-    def Config(dictConfig, sKey):
-        return ""
-    
-    def ConfigDefault(sKey, xValue, dictConfig):
-        return dictConfig
-    
-    def SplitSettings(sString, dictConfig=None):
-        return {}
-    
-    def ConfigSet(dictConfig, sKey, xValue=""):
-        return dictConfig
+__all__ = [sName for asNames in _LAZY_MODULES.values() for sName in asNames]
 
-# =============================================================================
-# Da aiSysFileio.py
-# =============================================================================
-try:
-    from aiSysFileio import (
-        read_csv_to_dict,
-        save_dict_to_csv,
-        read_ini_to_dict,
-        save_dict_to_ini,
-        save_array_file,
-        read_array_file,
-        isValidPath,
-        isFilename,
-        PathMake
-    )
-except ImportError as e:
-    print(f"Errore import aiSysFileio: {e}")
-    sys.exit(1)
 
-# =============================================================================
-# Da aiSysStrings.py
-# =============================================================================
-try:
-    from aiSysStrings import (
-        StringAppend,
-        StringBool,
-        isValidPassword,
-        isLettersOnly,
-        isEmail,
-        StringToArray,
-        StringToNum,
-        StringWash
-    )
-except ImportError as e:
-    print(f"Errore import aiSysStrings: {e}")
-    sys.exit(1)
-
-# =============================================================================
-# Da aiSysDictToString.py (se esiste)
-# =============================================================================
-try:
-    from aiSysDictToString import (
-        DictPrint,
-        DictToXml,
-        DictToString
-    )
-except ImportError:
-    # Placeholder functions
-    def DictPrint(dictParam, sFile=None):
-        print(dictParam)
-        return ""
-    
-    def DictToXml(dictParam, **xml_options):
-        return ""
+def _LazyPlaceholders(sModule):
+    """
+    Ritorna le funzioni placeholder dei moduli facoltativi, None per i
+    moduli obbligatori.
+    """
+    if sModule == "aiSysConfig":
+        def Expand(sText, dictConfig):
+            return sText
+        
+        def ExpandConvert(sString):
+            return sString
+        
+        def ExpandDict(dictExpand, dictParam):
+            return dictExpand
+        
+        def isGroups(asGroups1, asGroups2):
+            return False
+        
+        def Config(dictConfig, sKey):
+            return ""
+        
+        def ConfigDefault(sKey, xValue, dictConfig):
+            return dictConfig
+        
+        def SplitSettings(sString, dictConfig=None):
+            return {}
+        
+        def ConfigSet(dictConfig, sKey, xValue=""):
+            return dictConfig
+        
+        def acConfigView(*dictLayers, jParent=None):
+            dictView = {}
+            for dictLayer in reversed(dictLayers):
+                dictView.update(dictLayer)
+            return dictView
+        
+        return locals()
     
-    def DictToString(dictParam, sFormat="json"):
-        return ("", "")
-
-# =============================================================================
-# Da aiSysBase.py
-# =============================================================================
-try:
-    from aiSysBase import (
-        ErrorProc,
-        DictMerge,
-        DictExist
-    )
-except ImportError as e:
-    print(f"Errore import aiSysBase: {e}")
-    sys.exit(1)
-
-# =============================================================================
-# Da aiSysLog.py (se esiste)
-# =============================================================================
-try:
-    from aiSysLog import acLog
-except ImportError:
-    # Classe placeholder
-    class acLog:
-        def __init__(self):
-            self.sLog = ""
+    if sModule == "aiSysDictToString":
+        def DictPrint(dictParam, sFile=None):
+            print(dictParam)
+            return ""
         
-        def Start(self, sLogfile=None, sLogFolder=None):
+        def DictToXml(dictParam, **xml_options):
             return ""
         
-        def Log(self, sType: str, sValue: str = ""):
-            print(f"{sType}: {sValue}")
+        def DictToString(dictParam, sFormat="json"):
+            return ("", "")
         
-        def Log0(self, sResult, sValue=""):
-            if sResult:
-                self.Log("ERR", f"{sResult}: {sValue}")
-            else:
+        return locals()
+    
+    if sModule == "aiSysLog":
+        class acLog:
+            def __init__(self):
+                self.sLog = ""
+            
+            def Start(self, sLogfile=None, sLogFolder=None):
+                return ""
+            
+            def Log(self, sType: str, sValue: str = ""):
+                print(f"{sType}: {sValue}")
+            
+            def Log0(self, sResult, sValue=""):
+                if sResult:
+                    self.Log("ERR", f"{sResult}: {sValue}")
+                else:
+                    self.Log("INFO", sValue)
+            
+            def Log1(self, sValue=""):
                 self.Log("INFO", sValue)
         
-        def Log1(self, sValue=""):
-            self.Log("INFO", sValue)
-
-# =============================================================================
-# Crea alias locale per ErrorProc in ogni modulo (per compatibilità)
-# =============================================================================
-loc_ErrorProc = ErrorProc
-
-# =============================================================================
-# ELENCO COMPLETO DI TUTTE LE FUNZIONI ESPOSTE NEL NAMESPACE aiSys
-# =============================================================================
-
-# Da aiSysTimestamp
-__all__ = [
-    'Timestamp',
-    'TimestampConvert',
-    'TimestampFromSeconds',
-    'TimestampFromDays',
-    'TimestampValidate',
-    'TimestampDiff',
-    'TimestampAdd',
-    'TimestampIsoFrom',
-    'TimestampIsoTo',
-]
-
-# Da aiSysConfig
-__all__.extend([
-    'Expand',
-    'ExpandConvert',
-    'ExpandDict',
-    'isGroups',
-    'Config',
-    'ConfigDefault',
-    'SplitSettings',
-    'ConfigSet',
-])
-
-# Da aiSysFileio
-__all__.extend([
-    'read_csv_to_dict',
-    'save_dict_to_csv',
-    'read_ini_to_dict',
-    'save_dict_to_ini',
-    'save_array_file',
-    'read_array_file',
-    'isValidPath',
-    'isFilename',
-    'PathMake',
-])
+        return locals()
+    
+    return None
 
-# Da aiSysStrings
-__all__.extend([
-    'StringAppend',
-    'StringBool',
-    'isValidPassword',
-    'isLettersOnly',
-    'isEmail',
-    'StringToArray',
-    'StringToNum',
-    'StringWash',
-])
 
-# Da aiSysDictToString
-__all__.extend([
-    'DictPrint',
-    'DictToXml',
-    'DictToString',
-])
+def __getattr__(sName):
+    """
+    Importa il modulo che definisce sName e ne copia tutti i nomi nel
+    namespace aiSys: dal secondo uso l'accesso è diretto.
+    """
+    sModule = _LAZY_NAMES.get(sName)
+    if sModule is None:
+        raise AttributeError(f"module 'aiSys' has no attribute '{sName}'")
+    
+    try:
+        jModule = importlib.import_module(sModule)
+        dictValues = {s: getattr(jModule, _LAZY_ALIAS.get(s, s)) for s in _LAZY_MODULES[sModule]}
+    except ImportError as e:
+        dictValues = _LazyPlaceholders(sModule)
+        if dictValues is None:
+            print(f"Errore import {sModule}: {e}")
+            sys.exit(1)
+        dictValues = {s: dictValues[_LAZY_ALIAS.get(s, s)] for s in _LAZY_MODULES[sModule]}
+    
+    globals().update(dictValues)
+    return dictValues[sName]
 
-# Da aiSysBase
-__all__.extend([
-    'ErrorProc',
-    'DictMerge',
-    'DictExist',
-    'loc_ErrorProc',  # Alias locale
-])
 
-# Da aiSysLog
-__all__.extend([
-    'acLog',
-])
+def __dir__():
+    """Nomi del modulo, compresi quelli non ancora importati."""
+    return sorted(set(globals()) | set(__all__))
 
 # =============================================================================
 # FUNZIONE PRINCIPALE
 # =============================================================================
 
-<<<<<<< HEAD
 def FileExists(sFile):
     """Ritorna True se il file esiste, False altrimenti."""
-    return Path(sFile).is_file()
+    return os.path.isfile(sFile)
 
-=======
->>>>>>> bfee79e9a1dd5326014a7baaa0699a53f6462d9d
 def __main__():
     """
     Funzione principale di aiSys.py.
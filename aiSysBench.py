@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+aiSysBench.py - Benchmark delle funzioni aiSys
+Confronta le implementazioni correnti con quelle di riferimento.
+Uso: python aiSysBench.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+import configparser
+from typing import Dict, Any, Optional, Union, List, Callable
+
+import aiSys
+import aiSysConfig
+
+
+def BenchRun(sName: str, fnTest: Callable[[], Any], nLoops: int) -> float:
+    """
+    Esegue nLoops volte fnTest e stampa il tempo medio.
+
+    Args:
+        sName: Nome del test
+        fnTest: Funzione senza parametri da misurare
+        nLoops: Numero di ripetizioni
+
+    Returns:
+        float: Microsecondi per ripetizione
+    """
+    fnTest()
+    tsStart = time.perf_counter()
+    for _ in range(nLoops):
+        fnTest()
+    nMicro = (time.perf_counter() - tsStart) / nLoops * 1e6
+    print(f"  {sName:<40} {nMicro:10.2f} us")
+    return nMicro
+
+
+def bench_Expand() -> None:
+    """Expand compilato con cache contro _Expand2Pass (due passate)."""
+    print("\nBenchmark Expand")
+
+    dictConfig = {
+        "PATHROOT": "C:\\ntJobs",
+        "USER": "mario",
+        "INBOX": "$PATHROOT\\inbox",
+        "TIMEOUT": "60",
+    }
+
+    # Valori tipici di config, jobs.ini e parametri di job
+    asTexts = [
+        "$PATHROOT\\ntjobs_billing.csv",
+        "Utente $USER, timeout $TIMEOUT secondi%nInbox: $INBOX",
+        "%#C:\\Program Files\\App\\app.exe%# --in $PATHROOT\\in --out $PATHROOT\\out",
+        "Testo senza variabili con %% e %## e %n, lungo come una nota di job",
+        "NTJOBS.CONFIG.1",
+    ]
+    dictJob = {f"PARAM{n}": asTexts[n % len(asTexts)] for n in range(50)}
+
+    nLoops = 2000
+    nOld = BenchRun("_Expand2Pass (testi)", lambda: [aiSysConfig._Expand2Pass(s, dictConfig) for s in asTexts], nLoops)
+    nNew = BenchRun("Expand compilato (testi)", lambda: [aiSys.Expand(s, dictConfig) for s in asTexts], nLoops)
+    print(f"  Rapporto: {nOld / nNew:.1f}x")
+
+    nLoops = 200
+    nOld = BenchRun("_Expand2Pass (job 50 parametri)",
+                    lambda: {k: aiSysConfig._Expand2Pass(v, dictConfig) for k, v in dictJob.items()}, nLoops)
+    nNew = BenchRun("ExpandDict (job 50 parametri)", lambda: aiSys.ExpandDict(dictJob, dictConfig), nLoops)
+    print(f"  Rapporto: {nOld / nNew:.1f}x")
+    print(f"  Cache: {aiSysConfig.ExpandCompile.cache_info()}")
+
+
+def bench_Ini() -> None:
+    """Codec INI nativo e cache contro configparser (lettura e scrittura)."""
+    print("\nBenchmark INI")
+
+    def ReadConfigparser(sFile):
+        config = configparser.ConfigParser(interpolation=None, comment_prefixes=(';',),
+                                           inline_comment_prefixes=())
+        config.optionxform = str
+        config.read(sFile, encoding='utf-8')
+        return {sSect: dict(config[sSect]) for sSect in config.sections()}
+
+    def WriteConfigparser(dictIni, sFile):
+        config = configparser.ConfigParser(interpolation=None)
+        config.optionxform = str
+        config.read_dict(dictIni)
+        with open(sFile, 'w', encoding='utf-8') as hFile:
+            config.write(hFile)
+
+    for nSections in [10, 2000]:
+        # jobs.end tipico: CONFIG e job con parametri e risultato
+        dictIni = {"CONFIG": {"USER": "mario", "MAIL": "mario@example.com"}}
+        for n in range(nSections):
+            dictIni[f"J{n}"] = {"ACTION": "ECHO", "PARAM.FILE": f"C:\\ntJobs\\in\\file{n}.txt",
+                                "TS.START": "20260101:120000", "TS.END": "20260101:120001",
+                                "RETURN.TYPE": "S", "RETURN.VALUE": "Job completato"}
+        nLoops = max(5, 20000 // nSections)
+
+        with tempfile.TemporaryDirectory() as sDir:
+            sFile = os.path.join(sDir, "jobs.end")
+
+            # Messaggi di lettura/scrittura e BenchRun soppressi: riepilogo alla fine
+            sys.stdout = open(os.devnull, 'w')
+            try:
+                aiSys.save_dict_to_ini(dictIni, sFile)
+                # File non recente: memorizzabile in cache
+                os.utime(sFile, (time.time() - 10, time.time() - 10))
+                asResults = [
+                    ("configparser lettura", lambda: ReadConfigparser(sFile)),
+                    ("read_ini_to_dict senza cache", lambda: aiSys.read_ini_to_dict(sFile, bCache=False)),
+                    ("read_ini_to_dict con cache", lambda: aiSys.read_ini_to_dict(sFile)),
+                    ("configparser scrittura", lambda: WriteConfigparser(dictIni, sFile + ".cp")),
+                    ("save_dict_to_ini", lambda: aiSys.save_dict_to_ini(dictIni, sFile + ".new")),
+                ]
+                anMicro = [BenchRun(sName, fnTest, nLoops) for sName, fnTest in asResults]
+            finally:
+                sys.stdout.close()
+                sys.stdout = sys.__stdout__
+
+        print(f"  {nSections} sezioni:")
+        for (sName, _), nMicro in zip(asResults, anMicro):
+            print(f"  {sName:<40} {nMicro:10.2f} us")
+        print(f"  Rapporto lettura: {anMicro[0] / anMicro[1]:.1f}x, con cache {anMicro[0] / anMicro[2]:.1f}x, "
+              f"scrittura {anMicro[3] / anMicro[4]:.1f}x")
+
+
+def bench_ImportTime() -> None:
+    """Tempo di avvio a freddo (python -X importtime) dei punti di ingresso."""
+    print("\nBenchmark import (-X importtime)")
+
+    # Punto di ingresso -> codice eseguito dall'interprete
+    dictEntries = {
+        "aiSys": "import aiSys",
+        "aiSys + Timestamp": "import aiSys; aiSys.Timestamp()",
+        "acJobsApp": "import acJobsApp",
+        "acJobsOS": "import acJobsOS",
+    }
+    sPath = os.path.dirname(os.path.abspath(__file__))
+    nLoops = 5
+
+    for sName, sCode in dictEntries.items():
+        anMicro = []
+        for _ in range(nLoops):
+            jProc = subprocess.run([sys.executable, "-X", "importtime", "-c", sCode],
+                                   cwd=sPath, capture_output=True, text=True)
+            # Import fallito: i tempi dei moduli letti fino all'errore non sono confrontabili
+            if jProc.returncode != 0:
+                asErr = jProc.stderr.strip().splitlines()
+                raise RuntimeError(f"Import fallito per {sName} (exit {jProc.returncode}): "
+                                   f"{asErr[-1] if asErr else ''}")
+            # Riga: "import time: self [us] | cumulative | imported package"
+            nMicro = 0
+            nModules = 0
+            for sLine in jProc.stderr.splitlines():
+                asFields = sLine.split("|")
+                if not sLine.startswith("import time:") or len(asFields) != 3 or not asFields[1].strip().isdigit():
+                    continue
+                nModules += 1
+                nMicro += int(asFields[0].split(":")[1])
+            anMicro.append(nMicro)
+        print(f"  {sName:<40} {min(anMicro) / 1000:10.2f} ms  ({nModules} moduli)")
+
+
+def run_bench() -> None:
+    """Esegue tutti i benchmark."""
+    print("=" * 60)
+    print("Benchmark aiSys")
+    print("=" * 60)
+    bench_Expand()
+    bench_Ini()
+    bench_ImportTime()
+
+
+if __name__ == "__main__":
+    run_bench()
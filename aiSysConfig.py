@@ -1,11 +1,17 @@
 """Modulo per la gestione della configurazione e espansione variabili"""
-from typing import Dict, Any, Optional, Union, List
+from typing import Dict, Any, Optional, Union, List, Tuple, Iterator
+from functools import lru_cache
+from collections import ChainMap
+from collections.abc import Mapping
 import re
 from aiSysBase import ErrorProc
 
 # Crea alias locale
 loc_ErrorProc = ErrorProc
 
+# Numero massimo di testi compilati in cache per Expand
+EXPAND_CACHE_SIZE = 4096
+
 
 def Expand(sText: str, dictConfig: dict) -> str:
     """
@@ -22,6 +28,176 @@ def Expand(sText: str, dictConfig: dict) -> str:
     $NOME_VARIABILE viene sostituita con dictConfig[NOME_VARIABILE]
     Se non viene trovata la variabile in dictConfig, lascia $NOME_VARIABILE come testo.
     
+    Il testo è compilato una sola volta in segmenti (ExpandCompile, cache LRU)
+    e l'espansione è un unico join con i valori delle variabili.
+    
+    Args:
+        sText: Stringa da espandere
+        dictConfig: Dizionario con le variabili per l'espansione
+        
+    Returns:
+        Stringa espansa
+    """
+    if not sText:
+        return sText
+    
+    sStatic, asParts, aVars = ExpandCompile(sText)
+    
+    # Nessuna variabile: testo già espanso
+    if sStatic is not None:
+        return sStatic
+    
+    # Le parti delle variabili contengono già $NOME_VARIABILE (non trovata)
+    asResult = list(asParts)
+    for nPart, sVar in aVars:
+        if sVar in dictConfig:
+            asResult[nPart] = str(dictConfig[sVar])
+    return ''.join(asResult)
+
+
+@lru_cache(maxsize=EXPAND_CACHE_SIZE)
+def ExpandCompile(sText: str) -> Tuple[Optional[str], Tuple[str, ...], Tuple[Tuple[int, str], ...]]:
+    """
+    Compila un testo di Expand in segmenti letterali e variabili.
+    Il risultato è in cache LRU (EXPAND_CACHE_SIZE testi).
+    
+    Args:
+        sText: Stringa da compilare
+        
+    Returns:
+        Tuple: (sStatic, asParts, aVars)
+            sStatic: testo espanso se senza variabili, altrimenti None
+            asParts: segmenti, quelli delle variabili valgono $NOME_VARIABILE
+            aVars: coppie (indice in asParts, NOME_VARIABILE)
+    """
+    # FASE 1: Gestione sequenze di escape (come _Expand2Pass)
+    sPhase1 = _ExpandEscape(sText)
+    
+    # FASE 2: Divisione in segmenti, stesse regole di nome di _Expand2Pass
+    asParts = []
+    aVars = []
+    asLiteral = []
+    i = 0
+    length = len(sPhase1)
+    
+    while i < length:
+        char = sPhase1[i]
+        
+        if char == '$' and i + 1 < length:
+            j = i + 1
+            while j < length and (sPhase1[j].isalnum() or sPhase1[j] == '_'):
+                j += 1
+            
+            if j > i + 1:
+                if asLiteral:
+                    asParts.append(''.join(asLiteral))
+                    asLiteral = []
+                aVars.append((len(asParts), sPhase1[i + 1:j]))
+                asParts.append(sPhase1[i:j])
+                i = j
+                continue
+        
+        asLiteral.append(char)
+        i += 1
+    
+    if asLiteral:
+        asParts.append(''.join(asLiteral))
+    
+    if not aVars:
+        return (''.join(asParts), tuple(asParts), ())
+    return (None, tuple(asParts), tuple(aVars))
+
+
+def _ExpandEscape(sText: str) -> str:
+    """
+    Fase 1 di Expand: sostituzione delle sequenze di escape.
+    
+    Args:
+        sText: Stringa da convertire
+        
+    Returns:
+        str: Stringa con escape sostituiti, variabili non espanse
+    """
+    # FASE 1: Gestione sequenze di escape
+    result = []
+    i = 0
+    length = len(sText)
+    
+    while i < length:
+        char = sText[i]
+        
+        if char == '%' and i + 1 < length:
+            # Gestione sequenze di escape che iniziano con %
+            next_char = sText[i + 1]
+            
+            # 1. %## → #
+            if next_char == '#' and i + 2 < length and sText[i + 2] == '#':
+                result.append('#')
+                i += 3
+                continue
+            
+            # 2. %# → "
+            elif next_char == '#':
+                result.append('"')
+                i += 2
+                continue
+            
+            # 3. %% → %
+            elif next_char == '%':
+                result.append('%')
+                i += 2
+                continue
+            
+            # 4. %n → newline
+            elif next_char == 'n':
+                result.append('\n')
+                i += 2
+                continue
+            
+            # 5. %$ → $
+            elif next_char == '$':
+                result.append('$')
+                i += 2
+                continue
+            
+            # % seguito da carattere non nella lista → mantieni %+carattere
+            else:
+                result.append('%')
+                result.append(next_char)
+                i += 2
+                continue
+        
+        # % finale della stringa → mantieni %
+        elif char == '%' and i + 1 == length:
+            result.append('%')
+            i += 1
+            continue
+        
+        # Aggiungi carattere normale
+        result.append(char)
+        i += 1
+    
+    return ''.join(result)
+
+
+def _Expand2Pass(sText: str, dictConfig: dict) -> str:
+    """
+    Implementazione originale di Expand a due passate, carattere per carattere.
+    Mantenuta come riferimento per test di equivalenza e benchmark.
+    
+    Espande una stringa con sequenze di escape e variabili.
+    
+    Fase 1: Gestione sequenze di escape (in QUESTO ORDINE):
+    1. %## → #      
+    2. %# → "  (ASCII 34, virgolette diritte)
+    3. %% → %
+    4. %n → (carattere newline)
+    5. %$ → $
+    
+    Fase 2: Espansione variabili:
+    $NOME_VARIABILE viene sostituita con dictConfig[NOME_VARIABILE]
+    Se non viene trovata la variabile in dictConfig, lascia $NOME_VARIABILE come testo.
+    
     Args:
         sText: Stringa da espandere
         dictConfig: Dizionario con le variabili per l'espansione
@@ -365,3 +541,85 @@ def ConfigSet(dictConfig: Dict, sKey: str, xValue: Any = "") -> None:
         return loc_ErrorProc(str(e), sProc)
 
 
+class acConfigView(Mapping):
+    """
+    Vista a livelli di dizionari di configurazione, in sola lettura.
+    
+    I livelli sono in ordine di priorità (il primo vince, come ChainMap) e
+    non vengono copiati. I valori stringa sono espansi con Expand rispetto
+    ai valori originali di tutti i livelli, alla prima lettura, e tenuti
+    in una cache del livello. Un livello figlio (NewChild) riusa i valori
+    già espansi del padre se non ridefinisce le variabili che contengono.
+    """
+    
+    def __init__(self, *dictLayers: Dict, jParent: Optional["acConfigView"] = None):
+        """
+        Args:
+            dictLayers: Dizionari dei livelli, dal più prioritario
+            jParent: Vista padre (usata da NewChild)
+        """
+        self.jParent = jParent
+        self.asLayers = list(dictLayers)                # Livelli propri della vista
+        self.maps = ChainMap(*dictLayers, *(jParent.maps.maps if jParent else []))
+        self.dictCache = {}                             # Chiave -> valore espanso
+    
+    def NewChild(self, *dictLayers: Dict) -> "acConfigView":
+        """
+        Ritorna una vista con nuovi livelli prioritari sopra questa.
+        
+        Args:
+            dictLayers: Dizionari dei nuovi livelli, dal più prioritario
+            
+        Returns:
+            acConfigView: Vista figlia
+        """
+        return acConfigView(*dictLayers, jParent=self)
+    
+    def _own(self, sKey: str) -> bool:
+        """True se la chiave è definita in un livello proprio della vista."""
+        for dictLayer in self.asLayers:
+            if sKey in dictLayer:
+                return True
+        return False
+    
+    def __getitem__(self, sKey: str) -> Any:
+        if sKey in self.dictCache:
+            return self.dictCache[sKey]
+        
+        xValue = self.maps[sKey]
+        
+        if isinstance(xValue, str) and xValue:
+            sStatic, _, aVars = ExpandCompile(xValue)
+            if sStatic is not None:
+                xValue = sStatic
+            elif self.jParent is not None and not self._own(sKey) and \
+                    not any(self._own(sVar) for _, sVar in aVars):
+                # Valore e variabili del padre: espansione già in cache nel padre
+                xValue = self.jParent[sKey]
+            else:
+                xValue = Expand(xValue, self.maps)
+        
+        self.dictCache[sKey] = xValue
+        return xValue
+    
+    def __contains__(self, sKey: object) -> bool:
+        return sKey in self.maps
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.maps)
+    
+    def __len__(self) -> int:
+        return len(self.maps)
+    
+    def Raw(self, sKey: str, xDefault: Any = "") -> Any:
+        """
+        Ritorna il valore non espanso di una chiave.
+        
+        Args:
+            sKey: Chiave da leggere
+            xDefault: Valore se la chiave non esiste
+            
+        Returns:
+            Any: Valore originale
+        """
+        return self.maps.get(sKey, xDefault)
@@ -6,19 +6,30 @@ aiSysFileio.py - Funzioni per l'I/O dei file
 
 import os
 import sys
+import re
 import csv
-import configparser
+import time
+import queue
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Any, Optional, Union, List, Tuple
 
 # Import delle funzioni base e stringhe
 from aiSysBase import ErrorProc
-from aiSysStrings import StringWash, StringAppend
+from aiSysStrings import StringWash
 
 # Crea alias locali
 loc_ErrorProc = ErrorProc
 
+# Cache delle letture INI: path completo -> (mtime_ns, size, dictINI)
+INI_CACHE_SIZE = 256       # File memorizzati (0 = cache disattivata)
+INI_CACHE_RACY = 1         # Secondi: file più recenti non memorizzati
+INI_CACHE = OrderedDict()
+INI_CACHE_LOCK = threading.Lock()
+
 def read_csv_to_dict(csv_file_path: str, asHeader: List[str] = None, 
-                    delimiter: str = ';') -> Tuple[str, Dict]:
+                    delimiter: str = ';', asHeaderOpt: List[str] = None) -> Tuple[str, Dict]:
     """
     Legge un file CSV e lo converte in un dizionario di dizionari.
     
@@ -26,6 +37,7 @@ def read_csv_to_dict(csv_file_path: str, asHeader: List[str] = None,
         csv_file_path: Percorso completo del file CSV
         asHeader: Array di nomi dei campi (facoltativo)
         delimiter: Carattere delimitatore (default=';')
+        asHeaderOpt: Campi facoltativi, ammessi dopo quelli di asHeader (facoltativo)
     
     Returns:
         Tuple[str, Dict]: (sResult, dictCSV)
@@ -54,7 +66,8 @@ def read_csv_to_dict(csv_file_path: str, asHeader: List[str] = None,
             
             # Verifica header se specificato
             if asHeader:
-                if len(file_header) != len(asHeader):
+                asOpt = asHeaderOpt or []
+                if not len(asHeader) <= len(file_header) <= len(asHeader) + len(asOpt):
                     sResult = f"Numero campi header non corrispondente. File: {len(file_header)}, Richiesti: {len(asHeader)}"
                     print(sResult)
                     return (sResult, {})
@@ -64,6 +77,12 @@ def read_csv_to_dict(csv_file_path: str, asHeader: List[str] = None,
                         sResult = f"Campo header non corrispondente in posizione {i}: '{file_header[i]}' != '{expected}'"
                         print(sResult)
                         return (sResult, {})
+                
+                for sField in file_header[len(asHeader):]:
+                    if sField.strip() not in asOpt:
+                        sResult = f"Campo header non previsto: '{sField}'"
+                        print(sResult)
+                        return (sResult, {})
             
             nFieldsHeader = len(file_header)
             nRow = 1  # Contatore righe (inizia da 1 per l'header)
@@ -102,7 +121,8 @@ def read_csv_to_dict(csv_file_path: str, asHeader: List[str] = None,
                 
                 dictCSV[key] = inner_dict
         
-        sResult = f"File letto correttamente: {csv_file_path}, righe: {nRow-1}"
+        print(f"File letto correttamente: {csv_file_path}, righe: {nRow-1}")
+        sResult = ""
         return (sResult, dictCSV)
         
     except FileNotFoundError:
@@ -114,6 +134,38 @@ def read_csv_to_dict(csv_file_path: str, asHeader: List[str] = None,
         print(sResult)
         return (sResult, {})
 
+def csv_line_from_dict(asHeader: List[str], dictRecord: Dict, sDelimiter: str = ';') -> str:
+    """
+    Compone la riga CSV di un record, nell'ordine dei campi dell'header.
+    
+    Args:
+        asHeader: Array di nomi dei campi
+        dictRecord: Dizionario del record
+        sDelimiter: Carattere delimitatore (default=';')
+    
+    Returns:
+        str: Riga CSV senza terminatore
+    """
+    asValues = []
+    
+    # Per ogni campo nell'header (in ordine)
+    for sKeyField in asHeader:
+        # Gestione campo mancante
+        if sKeyField not in dictRecord:
+            sValue = ""
+        else:
+            # Ottieni, converti e pulisci il valore
+            sValue = StringWash(str(dictRecord[sKeyField]))
+            
+            # Proteggi se contiene spazi
+            if ' ' in sValue:
+                sValue = f'"{sValue}"'
+        
+        asValues.append(sValue)
+    
+    # join e non StringAppend: i campi vuoti iniziali mantengono il delimitatore
+    return sDelimiter.join(asValues)
+
 def save_dict_to_csv(csv_file_name: str, asHeader: List[str], 
                     dictData: Dict, sMode: str, sDelimiter: str = ';') -> str:
     """
@@ -190,29 +242,8 @@ def save_dict_to_csv(csv_file_name: str, asHeader: List[str],
                 if not isinstance(dictRecord, dict):
                     continue
                 
-                sLinea = ""
-                
-                # Per ogni campo nell'header (in ordine)
-                for sKeyField in asHeader:
-                    # Gestione campo mancante
-                    if sKeyField not in dictRecord:
-                        sValue = ""
-                    else:
-                        # Ottieni e converti valore
-                        raw_value = dictRecord[sKeyField]
-                        sValue = str(raw_value)
-                        
-                        # Applica StringWash (pulisce)
-                        sValue = StringWash(sValue)
-                        
-                        # Proteggi se contiene spazi
-                        if ' ' in sValue:
-                            sValue = f'"{sValue}"'
-                    
-                    # Aggiungi a sLinea
-                    sLinea = StringAppend(sLinea, sValue, sDelimiter)
-                
                 # Accoda la riga completata al file
+                sLinea = csv_line_from_dict(asHeader, dictRecord, sDelimiter)
                 hFile.write(sLinea + '\n')
         
         sResult = f"File salvato correttamente: {csv_file_name}"
@@ -223,12 +254,177 @@ def save_dict_to_csv(csv_file_name: str, asHeader: List[str],
         print(sResult)
         return loc_ErrorProc(sResult, sProc)
 
-def read_ini_to_dict(ini_file_path: str) -> Tuple[str, Dict]:
+def ini_text_to_dict(sText: str, bStrict: bool = True) -> Tuple[str, Dict]:
+    """
+    Converte il testo di un file INI in un dizionario di dizionari.
+    Dialetto ntJobs: commenti solo su righe che iniziano con ';', chiavi
+    con maiuscole/minuscole originali, nessuna interpolazione, delimitatore
+    '=' o ':', valori su più righe con le righe di continuazione indentate.
+    Una riga di continuazione è testo del valore anche se inizia con ';'
+    o '['; se inizia con una tabulazione (ini_text_from_dict) è tolta solo
+    quella, altrimenti la riga è ripulita dagli spazi.
+    La sezione DEFAULT è una sezione normale.
+    
+    Args:
+        sText: Testo INI
+        bStrict: Sezioni o chiavi duplicate sono un errore (False: vale l'ultima)
+    
+    Returns:
+        Tuple[str, Dict]: (sResult, dictINI)
+    """
+    sProc = "ini_text_to_dict"
+    dictINI = {}
+    dictSect = None
+    sKey = ""
+    asValue = None         # Righe del valore corrente (continuazione aperta)
+    nIndent = 0            # Indentazione della riga della chiave corrente
+    nEmpty = 0             # Righe vuote in attesa dentro un valore
+    
+    for nLine, sLine in enumerate(sText.splitlines(), 1):
+        sStrip = sLine.strip()
+        
+        # Riga di continuazione scritta da ini_text_from_dict: conservata com'è
+        if asValue is not None and nIndent == 0 and sLine[:1] == "\t":
+            asValue.extend([""] * nEmpty)
+            asValue.append(sLine[1:])
+            nEmpty = 0
+            continue
+        
+        # Righe vuote: fanno parte del valore solo se segue una continuazione
+        if sStrip == "":
+            if asValue is not None:
+                nEmpty += 1
+            continue
+        
+        nLineIndent = len(sLine) - len(sLine.lstrip())
+        
+        # Riga di continuazione del valore corrente (prima di commenti e sezioni)
+        if asValue is not None and nLineIndent > nIndent:
+            asValue.extend([""] * nEmpty)
+            asValue.append(sStrip)
+            nEmpty = 0
+            continue
+        
+        if asValue is not None:
+            dictSect[sKey] = "\n".join(asValue)
+            asValue = None
+        nEmpty = 0
+        
+        if sStrip[0] == ';':
+            continue
+        
+        # Sezione: tutto fra la prima '[' e l'ultima ']'
+        if sStrip[0] == '[' and sStrip[-1] == ']' and len(sStrip) > 2:
+            sSect = sStrip[1:-1]
+            if sSect in dictINI:
+                if bStrict:
+                    return (ErrorProc(f"Sezione duplicata [{sSect}] riga {nLine}", sProc), {})
+            else:
+                dictINI[sSect] = {}
+            dictSect = dictINI[sSect]
+            continue
+        
+        if dictSect is None:
+            return (ErrorProc(f"Riga {nLine} fuori da una sezione: {sStrip}", sProc), {})
+        
+        # Chiave: fino al primo delimitatore '=' o ':'
+        nPosEq = sStrip.find('=')
+        nPosCol = sStrip.find(':')
+        if nPosEq < 0 or (0 <= nPosCol < nPosEq):
+            nPosEq = nPosCol
+        if nPosEq <= 0:
+            return (ErrorProc(f"Riga {nLine} non valida: {sStrip}", sProc), {})
+        
+        sKey = sStrip[:nPosEq].rstrip()
+        if bStrict and sKey in dictSect:
+            return (ErrorProc(f"Chiave duplicata {sKey} riga {nLine}", sProc), {})
+        asValue = [sStrip[nPosEq + 1:].lstrip()]
+        nIndent = nLineIndent
+    
+    if asValue is not None:
+        dictSect[sKey] = "\n".join(asValue)
+    
+    return ("", dictINI)
+
+def ini_text_from_dict(dictINI: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Compone il testo INI di un dizionario di dizionari, rileggibile con
+    ini_text_to_dict (ogni sezione termina con una riga vuota). Le righe
+    dei valori su più righe sono scritte dopo una tabulazione e rilette
+    invariate; gli spazi all'inizio e alla fine della prima riga del
+    valore non sono conservati.
+    
+    Args:
+        dictINI: Dizionario sezione -> {chiave: valore}
+    
+    Returns:
+        str: Testo INI
+    """
+    asLines = []
+    
+    for sSect, dictSect in dictINI.items():
+        asLines.append(f"[{sSect}]\n")
+        for sKey, xValue in dictSect.items():
+            sValue = str(xValue)
+            # Valori su più righe: righe di continuazione indentate
+            if "\n" in sValue:
+                sValue = sValue.replace("\n", "\n\t")
+            asLines.append(f"{sKey} = {sValue}\n")
+        asLines.append("\n")
+    
+    return "".join(asLines)
+
+def ini_cache_get(sFile: str, jStat: os.stat_result) -> Optional[Dict]:
+    """
+    Ritorna una copia del dizionario in cache per il file se invariato
+    (stessi mtime_ns e dimensione), altrimenti None.
+    """
+    with INI_CACHE_LOCK:
+        tEntry = INI_CACHE.get(sFile)
+        if tEntry is None or tEntry[0] != jStat.st_mtime_ns or tEntry[1] != jStat.st_size:
+            return None
+        INI_CACHE.move_to_end(sFile)
+        dictINI = tEntry[2]
+    # Copia delle sezioni: il chiamante può modificare il risultato
+    return {sSect: dict(dictSect) for sSect, dictSect in dictINI.items()}
+
+def ini_cache_set(sFile: str, jStat: os.stat_result, dictINI: Dict) -> None:
+    """
+    Memorizza una copia del dizionario letto o scritto per il file.
+    Un file modificato da meno di INI_CACHE_RACY secondi non è memorizzato:
+    una nuova scrittura nello stesso intervallo potrebbe non cambiare mtime.
+    """
+    if INI_CACHE_SIZE <= 0:
+        return
+    if time.time_ns() - jStat.st_mtime_ns < INI_CACHE_RACY * 1_000_000_000:
+        ini_cache_drop(sFile)
+        return
+    dictCopy = {sSect: dict(dictSect) for sSect, dictSect in dictINI.items()}
+    with INI_CACHE_LOCK:
+        INI_CACHE[sFile] = (jStat.st_mtime_ns, jStat.st_size, dictCopy)
+        INI_CACHE.move_to_end(sFile)
+        while len(INI_CACHE) > INI_CACHE_SIZE:
+            INI_CACHE.popitem(last=False)
+
+def ini_cache_drop(sFile: Optional[str] = None) -> None:
+    """
+    Rimuove dalla cache un file (path completo) o, senza parametri, tutti.
+    """
+    with INI_CACHE_LOCK:
+        if sFile is None:
+            INI_CACHE.clear()
+        else:
+            INI_CACHE.pop(sFile, None)
+
+def read_ini_to_dict(ini_file_path: str, bCache: bool = True) -> Tuple[str, Dict]:
     """
     Legge un file INI e lo converte in un dizionario di dizionari.
+    Con bCache il risultato è memorizzato per (path, mtime_ns, size):
+    una nuova lettura dello stesso file invariato non lo rianalizza.
     
     Args:
         ini_file_path: Percorso completo del file INI
+        bCache: Usa la cache delle letture
     
     Returns:
         Tuple[str, Dict]: (sResult, dictINI)
@@ -244,30 +440,28 @@ def read_ini_to_dict(ini_file_path: str) -> Tuple[str, Dict]:
             print(sResult)
             return (sResult, {})
         
-        # Configura configparser
-        config = configparser.ConfigParser(
-            interpolation=None,  # disattiva %
-            comment_prefixes=(';',),  # solo ; come commento
-            inline_comment_prefixes=()  # disattiva commenti inline
-        )
-        config.optionxform = str  # mantiene case originale
+        sFile = os.path.abspath(ini_file_path)
+        
+        # Legge il file (stat del file aperto: coerente con il contenuto)
+        with open(sFile, 'r', encoding='utf-8-sig') as hFile:
+            jStat = os.fstat(hFile.fileno())
+            if bCache:
+                dictCache = ini_cache_get(sFile, jStat)
+                if dictCache is not None:
+                    return ("", dictCache)
+            sText = hFile.read()
         
-        # Legge il file
-        config.read(ini_file_path, encoding='utf-8')
+        sResult, dictINI = ini_text_to_dict(sText)
+        if sResult != "":
+            sResult = f"Errore lettura file INI {ini_file_path}: {sResult}"
+            print(sResult)
+            return (sResult, {})
         
-        # Converte in dizionario
-        for section in config.sections():
-            dictINI[section] = {}
-            for key in config[section]:
-                dictINI[section][key] = config[section][key]
+        if bCache:
+            ini_cache_set(sFile, jStat, dictINI)
         
-<<<<<<< HEAD
         print(f"Letto file .ini {ini_file_path}, Numero Sezioni: {len(dictINI)}")
-        sResult=""
-=======
-        sResult = f"Letto file .ini {ini_file_path}, Numero Sezioni: {len(dictINI)}"
-        print(sResult)
->>>>>>> bfee79e9a1dd5326014a7baaa0699a53f6462d9d
+        sResult = ""
         return (sResult, dictINI)
         
     except FileNotFoundError:
@@ -295,24 +489,20 @@ def save_dict_to_ini(data_dict: Dict[str, Dict[str, str]],
     sResult = ""
     
     try:
-        # Configura configparser
-        config = configparser.ConfigParser()
-        config.optionxform = str  # mantiene case originale
-        
-        # Aggiunge sezioni e chiavi
-        for section, section_dict in data_dict.items():
-            config[section] = {}
-            for key, value in section_dict.items():
-                config[section][key] = str(value)
+        sText = ini_text_from_dict(data_dict)
+        sFile = os.path.abspath(ini_file_path)
         
         # Crea directory se necessario
-        os.makedirs(os.path.dirname(ini_file_path), exist_ok=True)
+        os.makedirs(os.path.dirname(sFile), exist_ok=True)
         
         # Salva il file
-        with open(ini_file_path, 'w', encoding='utf-8') as f:
-            config.write(f)
+        with open(sFile, 'w', encoding='utf-8') as f:
+            f.write(sText)
+        
+        # Il file appena scritto è sempre recente (INI_CACHE_RACY): nessuna copia in cache
+        ini_cache_drop(sFile)
         
-        sResult = f"File INI salvato: {ini_file_path}"
+        print(f"File INI salvato: {ini_file_path}")
         return sResult
         
     except Exception as e:
@@ -347,7 +537,6 @@ def save_array_file(sFile: str, asLines: List[str], sMode: str = "") -> str:
             for line in asLines:
                 f.write(line + '\n')
         
-        sResult = f"Array salvato in {sFile}"
         return loc_ErrorProc(sResult, sProc)
         
     except Exception as e:
@@ -378,7 +567,6 @@ def read_array_file(sFile: str) -> Tuple[str, List[str]]:
         with open(sFile, 'r', encoding='utf-8') as f:
             asLines = [line.rstrip('\n') for line in f]
         
-        sResult = f"File letto: {sFile}, righe: {len(asLines)}"
         return (sResult, asLines)
         
     except Exception as e:
@@ -403,6 +591,81 @@ def isValidPath(sPath: str) -> bool:
         print(f"{sProc}: Errore - {str(e)}")
         return False
 
+def DirExists(sPath: str) -> bool:
+    """
+    Verifica se una cartella esiste.
+    
+    Args:
+        sPath: Percorso da verificare
+    
+    Returns:
+        bool: True se la cartella esiste, False altrimenti
+    """
+    try:
+        return os.path.isdir(sPath)
+    except Exception:
+        return False
+
+def DirExistsMany(asPaths: List[str], nWorkers: int = 16,
+                  nTimeout: float = 5.0) -> Dict[str, Optional[bool]]:
+    """
+    Verifica in parallelo l'esistenza di più cartelle (es. share di rete),
+    con al più nWorkers verifiche contemporanee e nTimeout secondi per
+    ciascuna. Una verifica che non termina in tempo vale None (cartella
+    non raggiungibile): il suo thread è abbandonato e, se tutti i thread
+    sono bloccati, anche le cartelle non ancora verificate valgono None.
+    
+    Args:
+        asPaths: Cartelle da verificare (i duplicati sono verificati una volta)
+        nWorkers: Verifiche contemporanee massime
+        nTimeout: Secondi massimi per verifica
+    
+    Returns:
+        Dict[str, Optional[bool]]: Cartella -> True, False o None (non raggiungibile)
+    """
+    asUnique = list(dict.fromkeys(asPaths))
+    if not asUnique:
+        return {}
+    
+    jQueue = queue.Queue()
+    for sPath in asUnique:
+        jQueue.put(sPath)
+    
+    dictStart = {}
+    dictDone = {}
+    jCond = threading.Condition()
+    evEnd = threading.Event()
+    
+    def _check():
+        while not evEnd.is_set():
+            try:
+                sPath = jQueue.get_nowait()
+            except queue.Empty:
+                return
+            with jCond:
+                dictStart[sPath] = time.monotonic()
+            bExists = DirExists(sPath)
+            with jCond:
+                dictDone[sPath] = bExists
+                jCond.notify()
+    
+    # Thread daemon: una stat bloccata non impedisce l'uscita dell'applicazione
+    nThreads = max(1, min(nWorkers, len(asUnique)))
+    for _ in range(nThreads):
+        threading.Thread(target=_check, name="DirExistsMany", daemon=True).start()
+    
+    with jCond:
+        while True:
+            nNow = time.monotonic()
+            anDeadline = [nStart + nTimeout for sPath, nStart in dictStart.items() if sPath not in dictDone]
+            nStuck = sum(1 for nDeadline in anDeadline if nDeadline <= nNow)
+            if len(dictDone) + nStuck == len(asUnique) or nStuck >= nThreads:
+                break
+            anWait = [nDeadline - nNow for nDeadline in anDeadline if nDeadline > nNow]
+            jCond.wait(min(anWait) if anWait else nTimeout)
+        evEnd.set()
+        return {sPath: dictDone.get(sPath) for sPath in asUnique}
+
 def isFilename(sFilename: str) -> bool:
     """
     Verifica che un nome di file sia corretto.
@@ -456,16 +719,24 @@ def PathMake(sPath: Optional[str] = None, sFile: str = "",
     Returns:
         str: Percorso completo, stringa vuota in caso di errore
     """
+    # Verifica parametri obbligatori
+    if not sFile:
+        return ""
+    
+    # Gestisci sPath: la cartella corrente può cambiare, il risultato non è memorizzato
+    if not sPath:
+        return _PathMake(os.getcwd(), sFile, sExt)
+    
+    return _PathMake(sPath, sFile, sExt)
+
+@lru_cache(maxsize=4096)
+def _PathMake(sPath: str, sFile: str, sExt: Optional[str]) -> str:
+    """
+    PathMake con cartella indicata, memorizzata per terne
+    (cartella, file, estensione) ripetute.
+    """
     sProc = "PathMake"
     try:
-        # Verifica parametri obbligatori
-        if not sFile:
-            return ""
-        
-        # Gestisci sPath
-        if not sPath:
-            sPath = os.getcwd()  # cartella corrente
-        
         # Normalizza il percorso
         sPath = os.path.normpath(sPath)
         
@@ -2,6 +2,9 @@
 from typing import Dict, Any, Optional, Union, List
 import os
 import sys
+import time
+import queue
+import threading
 from aiSysTimestamp import Timestamp
 from aiSysBase import ErrorProc
 
@@ -17,6 +20,15 @@ class acLog:
         """Inizializza l'oggetto log"""
         self.sLog = ""
         self.sAppName = ""
+        self.bEcho = True          # Scrittura anche su console
+        self.sLevel = "INFO"       # INFO = tutto, ERR = solo righe non INFO
+        self.nMaxSize = 0          # Byte oltre cui il file ruota, 0 = mai
+        self.bAsync = False        # Scrittura su file in un thread
+        self.nFlushTime = 1.0      # Secondi massimi tra due flush (async)
+        self.nDropped = 0          # Righe perse per coda piena (async)
+        self.jQueue = None
+        self.jThread = None
+        self.lock = threading.Lock()
         
     def Start(self, sLogfile: Optional[str] = None, sLogFolder: Optional[str] = None) -> str:
         """
@@ -57,6 +69,126 @@ class acLog:
             sResult = f"Errore Log.Start: {str(e)}"
             return loc_ErrorProc(sResult, sProc)
     
+    def Options(self, bAsync: bool = False, bEcho: bool = True, sLevel: str = "INFO",
+                nMaxSize: int = 0, nQueueSize: int = 10000, nFlushTime: float = 1.0) -> str:
+        """
+        Imposta le opzioni di scrittura del log.
+        
+        Args:
+            bAsync: Scrittura su file in un thread, con handle persistente
+            bEcho: Scrittura anche su console
+            sLevel: INFO scrive tutto, ERR scarta le righe INFO
+            nMaxSize: Byte oltre cui il file ruota (0 = nessuna rotazione)
+            nQueueSize: Righe massime in coda (async)
+            nFlushTime: Secondi massimi tra due flush su disco (async)
+            
+        Returns:
+            str: sResult
+        """
+        sProc = "Options"
+        sResult = ""
+        
+        sLevel = sLevel.upper() if sLevel else "INFO"
+        if sLevel not in ["INFO", "ERR"]:
+            sResult = f"Livello log non valido: {sLevel}"
+            return loc_ErrorProc(sResult, sProc)
+        
+        self.bEcho = bEcho
+        self.sLevel = sLevel
+        self.nMaxSize = int(nMaxSize)
+        self.nFlushTime = max(0.1, float(nFlushTime))
+        
+        # Avvio o arresto del thread di scrittura
+        if bAsync and not self.bAsync:
+            self.jQueue = queue.Queue(maxsize=max(1, int(nQueueSize)))
+            self.jThread = threading.Thread(target=self._run, name="acLog", daemon=True)
+            self.bAsync = True
+            self.jThread.start()
+        elif not bAsync and self.bAsync:
+            self.End()
+        
+        return sResult
+    
+    def _run(self) -> None:
+        """Scrive su file le righe in coda, a blocchi, con flush periodico."""
+        hFile = None
+        tsFlush = time.monotonic()
+        bEnd = False
+        
+        while not bEnd:
+            try:
+                asLines = [self.jQueue.get(timeout=self.nFlushTime)]
+            except queue.Empty:
+                asLines = []
+            
+            # Svuota la coda senza attendere
+            while True:
+                try:
+                    asLines.append(self.jQueue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # None = richiesta di chiusura (End)
+            if None in asLines:
+                bEnd = True
+                asLines = [sLine for sLine in asLines if sLine is not None]
+            
+            try:
+                # Rotazione verificata riga per riga: un blocco non supera nMaxSize
+                for sLine in asLines:
+                    if hFile is None:
+                        hFile = open(self.sLog, 'a', encoding='utf-8')
+                        nSize = hFile.tell()
+                    sLine += "\n"
+                    hFile.write(sLine)
+                    nSize += len(sLine.encode('utf-8'))
+                    if self.nMaxSize > 0 and nSize >= self.nMaxSize:
+                        hFile.close()
+                        hFile = None
+                        self._rotate()
+                
+                if hFile is not None and (bEnd or not asLines or time.monotonic() - tsFlush >= self.nFlushTime):
+                    hFile.flush()
+                    tsFlush = time.monotonic()
+            except Exception:
+                # Ignora errori di scrittura log
+                hFile = None
+        
+        if hFile is not None:
+            try:
+                hFile.close()
+            except Exception:
+                pass
+    
+    def _rotate(self) -> None:
+        """Rinomina il file di log corrente con il timestamp."""
+        sBase, sExt = os.path.splitext(self.sLog)
+        sFileOld = f"{sBase}_{loc_Timestamp().replace(':', '')}"
+        sFileDst = sFileOld + sExt
+        nCounter = 0
+        while os.path.exists(sFileDst):
+            nCounter += 1
+            sFileDst = f"{sFileOld}_{nCounter}{sExt}"
+        try:
+            os.replace(self.sLog, sFileDst)
+        except Exception:
+            pass
+    
+    def End(self) -> None:
+        """
+        Scrive le righe in coda e arresta il thread di scrittura (async).
+        """
+        if not self.bAsync:
+            return
+        self.bAsync = False
+        try:
+            self.jQueue.put(None, timeout=5)
+        except queue.Full:
+            pass
+        self.jThread.join(10)
+        self.jThread = None
+        self.jQueue = None
+    
     def _get_app_name(self) -> str:
         """Ottiene il nome dell'applicazione corrente."""
         try:
@@ -77,6 +209,10 @@ class acLog:
         """
         if not self.sLog:
             return
+        
+        # Con livello ERR le righe INFO sono scartate
+        if self.sLevel == "ERR" and sType.upper() == "INFO":
+            return
             
         try:
             # Crea riga di log
@@ -84,11 +220,23 @@ class acLog:
             sLine = f"{timestamp}:{sValue}"
             
             # Scrivi su console
-            print(sLine)
+            if self.bEcho:
+                print(sLine)
+            
+            # Scrivi su file: in coda (async) o diretto
+            if self.bAsync:
+                try:
+                    self.jQueue.put(sLine, timeout=5)
+                except queue.Full:
+                    self.nDropped += 1
+                return
             
-            # Scrivi su file
-            with open(self.sLog, 'a', encoding='utf-8') as f:
-                f.write(sLine + "\n")
+            with self.lock:
+                with open(self.sLog, 'a', encoding='utf-8') as f:
+                    f.write(sLine + "\n")
+                    bRotate = self.nMaxSize > 0 and f.tell() >= self.nMaxSize
+                if bRotate:
+                    self._rotate()
                 
         except Exception:
             # Ignora errori di scrittura log
@@ -0,0 +1,139 @@
+"""Modulo per lo svuotamento delle pipe dei processi esterni"""
+from typing import Dict, Any, Optional, Union, List
+import os
+import threading
+from aiSysTimestamp import Timestamp
+from aiSysBase import ErrorProc
+
+# Crea alias locali
+loc_Timestamp = Timestamp
+loc_ErrorProc = ErrorProc
+
+
+class acPump:
+    """Classe che legge una pipe in un thread e la accoda su file"""
+
+    def __init__(self):
+        """Inizializza l'oggetto pump"""
+        self.sFile = ""
+        self.nMaxSize = 0         # Byte massimi scritti su file, 0 = nessun limite
+        self.nTail = 0            # Byte finali mantenuti in memoria
+        self.nRead = 0            # Byte letti dalla pipe
+        self.bTruncated = False
+        self.baTail = bytearray()
+        self.jThread = None
+        self.hPipe = None
+        self.lock = threading.Lock()
+
+    def Start(self, hPipe, sFile: str, sHeader: str = "",
+              nMaxSize: int = 1048576, nTail: int = 2000) -> str:
+        """
+        Avvia la lettura della pipe in un thread.
+
+        Args:
+            hPipe: Pipe in lettura (binaria) del processo
+            sFile: File di log su cui accodare l'output
+            sHeader: Riga di intestazione scritta all'avvio (opzionale)
+            nMaxSize: Byte massimi scritti su file (0 = nessun limite)
+            nTail: Byte finali mantenuti in memoria
+
+        Returns:
+            str: sResult
+        """
+        sProc = "Start"
+        sResult = ""
+
+        self.hPipe = hPipe
+        self.sFile = sFile
+        self.nMaxSize = nMaxSize
+        self.nTail = nTail
+
+        try:
+            hFile = open(sFile, 'ab')
+            if sHeader:
+                hFile.write(f"### {loc_Timestamp()} {sHeader}\n".encode('utf-8'))
+        except Exception as e:
+            hFile = None
+            sResult = f"Errore apertura {sFile}: {str(e)}"
+
+        # La pipe va svuotata comunque, anche senza file
+        self.jThread = threading.Thread(target=self._run, args=(hFile,),
+                                        name=f"acPump:{os.path.basename(sFile)}",
+                                        daemon=True)
+        self.jThread.start()
+
+        return loc_ErrorProc(sResult, sProc)
+
+    def _run(self, hFile) -> None:
+        """Ciclo di lettura della pipe fino a EOF."""
+        nWritten = 0
+        nFd = self.hPipe.fileno()
+
+        try:
+            while True:
+                try:
+                    data = os.read(nFd, 65536)
+                except InterruptedError:
+                    continue
+                except OSError:
+                    break
+
+                if not data:
+                    break
+
+                with self.lock:
+                    self.nRead += len(data)
+                    self.baTail += data
+                    if len(self.baTail) > self.nTail:
+                        del self.baTail[:len(self.baTail) - self.nTail]
+
+                if hFile is None or self.bTruncated:
+                    continue
+
+                # Scrive fino al limite, poi continua solo a svuotare la pipe
+                if self.nMaxSize > 0 and nWritten + len(data) > self.nMaxSize:
+                    data = data[:self.nMaxSize - nWritten]
+                    self.bTruncated = True
+
+                try:
+                    hFile.write(data)
+                    nWritten += len(data)
+                    if self.bTruncated:
+                        hFile.write(f"\n### Output troncato a {self.nMaxSize} byte\n".encode('utf-8'))
+                    hFile.flush()
+                except Exception:
+                    hFile.close()
+                    hFile = None
+        finally:
+            if hFile is not None:
+                hFile.close()
+            try:
+                self.hPipe.close()
+            except Exception:
+                pass
+
+    def Join(self, nTimeout: Optional[float] = None) -> bool:
+        """
+        Attende la fine della lettura (EOF della pipe).
+
+        Args:
+            nTimeout: Secondi massimi di attesa (None = senza limite)
+
+        Returns:
+            bool: True se la lettura è terminata
+        """
+        if self.jThread is None:
+            return True
+        self.jThread.join(nTimeout)
+        return not self.jThread.is_alive()
+
+    def Tail(self) -> str:
+        """
+        Ritorna la parte finale dell'output letto.
+
+        Returns:
+            str: Ultimi nTail byte decodificati
+        """
+        with self.lock:
+            data = bytes(self.baTail)
+        return data.decode('utf-8', errors='replace').strip()
@@ -0,0 +1,93 @@
+"""Modulo per la cache delle verifiche di esistenza dei file"""
+from typing import Dict, Any, Optional, Union, List
+import os
+import threading
+
+
+class acStatCache:
+    """
+    Cache dei contenuti delle cartelle (una os.scandir per cartella) per
+    le verifiche di esistenza di file e cartelle. Vale fino a Clear
+    (tipicamente ad ogni ciclo): chi crea, sposta o rimuove file, o lascia
+    che un processo esterno lo faccia, chiama Invalidate sulla cartella.
+    Thread safe.
+    """
+
+    def __init__(self):
+        """Inizializza la cache"""
+        self.dictDirs = {}        # Cartella -> {nome normalizzato: bDir}, None se non esiste
+        self.nScan = 0            # Letture di cartelle (os.scandir)
+        self.nHit = 0             # Verifiche servite dalla cache
+        self.nGeneration = 0      # Incrementato da Invalidate e Clear
+        self.lock = threading.Lock()
+
+    def Scan(self, sDir: str) -> Optional[Dict[str, bool]]:
+        """
+        Ritorna il contenuto di una cartella (nome normalizzato -> True se
+        cartella), letto una volta sola; None se la cartella non esiste.
+        Se durante la lettura arriva un Invalidate o un Clear il contenuto
+        letto non è messo in cache: potrebbe precedere la modifica.
+        """
+        sDir = os.path.normpath(sDir)
+        with self.lock:
+            if sDir in self.dictDirs:
+                self.nHit += 1
+                return self.dictDirs[sDir]
+            nGeneration = self.nGeneration
+
+        dictEntries = {}
+        try:
+            with os.scandir(sDir) as jScan:
+                for jEntry in jScan:
+                    try:
+                        bDir = jEntry.is_dir()
+                    except OSError:
+                        bDir = False
+                    dictEntries[os.path.normcase(jEntry.name)] = bDir
+        except OSError:
+            dictEntries = None
+
+        with self.lock:
+            self.nScan += 1
+            if self.nGeneration == nGeneration:
+                self.dictDirs[sDir] = dictEntries
+        return dictEntries
+
+    def _Entry(self, sPath: str) -> Optional[bool]:
+        """Ritorna True (cartella), False (file) o None (non esiste)."""
+        sDir, sName = os.path.split(os.path.normpath(sPath))
+        if not sName:
+            return None
+        dictEntries = self.Scan(sDir or os.curdir)
+        if dictEntries is None:
+            return None
+        return dictEntries.get(os.path.normcase(sName))
+
+    def FileExists(self, sFile: str) -> bool:
+        """Ritorna True se il file esiste."""
+        return self._Entry(sFile) is False
+
+    def DirExists(self, sDir: str) -> bool:
+        """Ritorna True se la cartella esiste."""
+        return self._Entry(sDir) is True
+
+    def Invalidate(self, sPath: str) -> None:
+        """
+        Scarta la cartella sPath (se cartella) con le sue sottocartelle e la
+        cartella che contiene sPath: da chiamare dopo aver creato, spostato
+        o rimosso sPath, o dopo che un processo ha scritto al suo interno.
+        """
+        sPath = os.path.normpath(sPath)
+        sPrefix = os.path.join(sPath, "")
+        with self.lock:
+            self.nGeneration += 1
+            self.dictDirs.pop(sPath, None)
+            self.dictDirs.pop(os.path.dirname(sPath) or os.curdir, None)
+            for sDir in [sDir for sDir in self.dictDirs if sDir.startswith(sPrefix)]:
+                del self.dictDirs[sDir]
+
+    def Clear(self) -> None:
+        """Scarta tutta la cache."""
+        with self.lock:
+            self.nGeneration += 1
+            self.dictDirs = {}
@@ -2,6 +2,7 @@
 """Test per tutte le funzioni aiSys"""
 import os
 import sys
+import json
 import tempfile
 import shutil
 from typing import Dict, Any, List, Tuple
@@ -84,6 +85,190 @@ def run_tests() -> None:
     else:
         failed_tests.append(f"Test {total_tests}: Integrazione")
     
+    # Test 9: aiSysWatch (acWatch)
+    total_tests += 1
+    if test_aiSysWatch():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: aiSysWatch.py")
+    else:
+        failed_tests.append(f"Test {total_tests}: aiSysWatch.py")
+    
+    # Test 10: aiSysConfig (Expand compilato)
+    total_tests += 1
+    if test_aiSysConfigExpand():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: aiSysConfig.py Expand compilato")
+    else:
+        failed_tests.append(f"Test {total_tests}: aiSysConfig.py Expand compilato")
+    
+    # Test 11: aiSysFileio (codec INI e cache)
+    total_tests += 1
+    if test_aiSysFileioIni():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: aiSysFileio.py codec INI")
+    else:
+        failed_tests.append(f"Test {total_tests}: aiSysFileio.py codec INI")
+    
+    # Test 12: aiSysFileio (verifica cartelle in parallelo)
+    total_tests += 1
+    if test_aiSysFileioDirs():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: aiSysFileio.py DirExistsMany")
+    else:
+        failed_tests.append(f"Test {total_tests}: aiSysFileio.py DirExistsMany")
+    
+    # Test 13: acJobsJobs (processo esterno, coda di output)
+    total_tests += 1
+    if test_acJobsJobsOutput():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsJobs.py output")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsJobs.py output")
+    
+    # Test 14: acJobsMailQueue (coda mail e digest)
+    total_tests += 1
+    if test_acJobsMailQueue():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsMailQueue.py")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsMailQueue.py")
+    
+    # Test 15: acJobsClaim (lease delle cartelle)
+    total_tests += 1
+    if test_acJobsClaim():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsClaim.py")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsClaim.py")
+    
+    # Test 16: aiSysStat (cache delle cartelle)
+    total_tests += 1
+    if test_aiSysStat():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: aiSysStat.py")
+    else:
+        failed_tests.append(f"Test {total_tests}: aiSysStat.py")
+    
+    # Test 17: aiSysConfig (acConfigView)
+    total_tests += 1
+    if test_aiSysConfigView():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: aiSysConfig.py acConfigView")
+    else:
+        failed_tests.append(f"Test {total_tests}: aiSysConfig.py acConfigView")
+    
+    # Test 18: acJobsInbox (indice della inbox)
+    total_tests += 1
+    if test_acJobsInbox():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsInbox.py")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsInbox.py")
+    
+    # Test 19: acJobsOS (Search e CycleEnd)
+    total_tests += 1
+    if test_acJobsOSSearch():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsOS.py Search")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsOS.py Search")
+    
+    # Test 20: acJobsResident (worker residenti, --serve)
+    total_tests += 1
+    if test_acJobsResident():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsResident.py")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsResident.py")
+    
+    # Test 21: acJobsStart (ricarica tabelle CSV)
+    total_tests += 1
+    if test_acJobsStartReload():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsStart.py ricarica")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsStart.py ricarica")
+    
+    # Test 22: acJobsMail (SMTP riusato e coda)
+    total_tests += 1
+    if test_acJobsMailSmtp():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsMail.py SMTP")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsMail.py SMTP")
+    
+    # Test 23: ncMailSimple (allegati in streaming)
+    total_tests += 1
+    if test_ncMailSimpleStream():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: ncMailSimple.py streaming")
+    else:
+        failed_tests.append(f"Test {total_tests}: ncMailSimple.py streaming")
+    
+    # Test 24: acJobsStart (snapshot delle tabelle)
+    total_tests += 1
+    if test_acJobsStartSnapshot():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsStart.py snapshot")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsStart.py snapshot")
+    
+    # Test 25: acJobsAction (maschere dei gruppi)
+    total_tests += 1
+    if test_acJobsActionMask():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsAction.py maschere")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsAction.py maschere")
+    
+    # Test 26: acJobsBilling (billing bufferizzato)
+    total_tests += 1
+    if test_acJobsBilling():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsBilling.py")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsBilling.py")
+    
+    # Test 27: acJobsJobs (journal e ripresa)
+    total_tests += 1
+    if test_acJobsJobsJournal():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsJobs.py journal")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsJobs.py journal")
+    
+    # Test 28: acJobsJobs (jobs.end incrementale)
+    total_tests += 1
+    if test_acJobsJobsEnd():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsJobs.py jobs.end")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsJobs.py jobs.end")
+    
+    # Test 29: acJobsOlkSpool (spool OLK)
+    total_tests += 1
+    if test_acJobsOlkSpool():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsOlkSpool.py")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsOlkSpool.py")
+    
+    # Test 30: acJobsOS (pool di worker)
+    total_tests += 1
+    if test_acJobsOSPool():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsOS.py pool")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsOS.py pool")
+    
+    # Test 31: acJobsOS (errori con livello ERR)
+    total_tests += 1
+    if test_acJobsOSLogErr():
+        passed_tests += 1
+        print(f"✓ Test {total_tests} passato: acJobsOS.py livello ERR")
+    else:
+        failed_tests.append(f"Test {total_tests}: acJobsOS.py livello ERR")
+    
     # Riepilogo
     print("\n" + "=" * 60)
     print("RIEPILOGO TEST")
@@ -280,7 +465,7 @@ def test_aiSysConfig() -> bool:
         print(f"  Input: sText='{test_str}', dictConfig={dictConfig}")
         result = aiSys.Expand(test_str, dictConfig)
         print(f"  Output: {result}")
-        assert "UNKNOWN" in result, "Variabile inesistente non gestita"
+        assert result == test_str, "Variabile inesistente non lasciata come testo"
         test_num += 1
         
         # Test 3.3: ExpandConvert (inversa)
@@ -657,7 +842,50 @@ def test_aiSysLog() -> bool:
         log2 = aiSys.acLog()
         log2.Log("TEST", "Questo non dovrebbe scrivere")
         print("  OK: Nessun errore con sLog vuoto")
+        test_num += 1
         
+        # Test 7.4: Scrittura asincrona, livello ERR, senza console
+        print(f"\nTest {test_num}.1: Options async, livello ERR, echo disattivato")
+        log3 = aiSys.acLog()
+        result = log3.Start(sLogfile="aiSysTest_acLog_async", sLogFolder=temp_dir)
+        assert result == "", f"Errore Start: {result}"
+        result = log3.Options(bAsync=True, bEcho=False, sLevel="ERR")
+        print(f"  Options risultato: {result}")
+        assert result == "", f"Errore Options: {result}"
+        for nLine in range(100):
+            log3.Log0(f"Errore{nLine}", "Messaggio con errore")
+            log3.Log1("Messaggio INFO scartato")
+        log3.End()
+        with open(log3.sLog, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+            print(f"  Linee scritte nel file: {len(lines)}")
+            assert len(lines) == 100, "Numero linee log async errato"
+            assert all(":err:" in sLine for sLine in lines), "Righe INFO non filtrate"
+            assert [sLine.split(":")[3] for sLine in lines] == [f"Errore{n}" for n in range(100)], \
+                "Ordine righe log async errato"
+        test_num += 1
+
+        print(f"\nTest {test_num}.1: Rotazione async oltre LOG.MAXSIZE")
+        log4 = aiSys.acLog()
+        result = log4.Start(sLogfile="aiSysTest_acLog_rotate", sLogFolder=temp_dir)
+        assert result == "", f"Errore Start: {result}"
+        result = log4.Options(bAsync=True, bEcho=False, nMaxSize=1000)
+        assert result == "", f"Errore Options: {result}"
+        for nLine in range(200):
+            log4.Log1(f"Riga {nLine:03d} per la rotazione del log")
+        log4.End()
+        asFiles = sorted(f for f in os.listdir(temp_dir) if f.startswith("aiSysTest_acLog_rotate"))
+        print(f"  File di log: {asFiles}")
+        assert len(asFiles) > 1, "Log non ruotato"
+        assert all(os.path.getsize(os.path.join(temp_dir, f)) < 1100 for f in asFiles), \
+            "File di log oltre LOG.MAXSIZE"
+        asLines = []
+        for sFile in asFiles:
+            with open(os.path.join(temp_dir, sFile), 'r', encoding='utf-8') as f:
+                asLines += f.readlines()
+        assert len(asLines) == 200, f"Righe perse nella rotazione: {len(asLines)}"
+
+
     except AssertionError as e:
         print(f"  ❌ Assert fallito: {e}")
         test_passed = False
@@ -766,6 +994,2263 @@ def test_integration() -> bool:
     return test_passed
 
 
+def test_aiSysWatch() -> bool:
+    """Test per aiSysWatch.py (classe acWatch)"""
+    print("\n" + "=" * 60)
+    print("Test 9: File aiSysWatch.py, NomeTest: Classe acWatch")
+    print("=" * 60)
+    
+    test_passed = True
+    test_num = 1
+    
+    temp_dir = tempfile.mkdtemp()
+    missing_dir = os.path.join(temp_dir, "non_esiste")
+    jWatch = aiSys.acWatch()
+    
+    try:
+        # Test 9.1: Start con path inesistente
+        print(f"\nTest {test_num}.1: Start acWatch")
+        result = jWatch.Start([temp_dir, missing_dir], ["jobs.ini"])
+        print(f"  Start risultato: {result}")
+        if result != "":
+            # inotify non disponibile: tutti i path vanno a polling
+            assert jWatch.asPathsPoll == [temp_dir, missing_dir], "Fallback polling errato"
+            print("  OK: inotify non disponibile, fallback a polling")
+            return test_passed
+        print(f"  Path a polling: {jWatch.asPathsPoll}")
+        assert jWatch.asPathsPoll == [missing_dir], "Path inesistente non messo a polling"
+        test_num += 1
+        
+        # Test 9.2: Evento su file atteso
+        print(f"\nTest {test_num}.1: Arrivo jobs.ini")
+        with open(os.path.join(temp_dir, "jobs.ini"), 'w', encoding='utf-8') as f:
+            f.write("[CONFIG]\n")
+        assert jWatch.Wait(5), "Evento jobs.ini non ricevuto"
+        asEvents = jWatch.Events()
+        print(f"  Eventi: {asEvents}")
+        assert asEvents == [temp_dir], "Cartella evento errata"
+        
+        print(f"\nTest {test_num}.2: File non atteso ignorato")
+        with open(os.path.join(temp_dir, "altro.txt"), 'w', encoding='utf-8') as f:
+            f.write("x")
+        assert not jWatch.Wait(0.2), "Evento su file non atteso"
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        jWatch.End()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    return test_passed
+
+
+def test_aiSysConfigExpand() -> bool:
+    """Test per aiSysConfig.py (Expand compilato contro _Expand2Pass)"""
+    print("\n" + "=" * 60)
+    print("Test 10: File aiSysConfig.py, NomeTest: Expand compilato")
+    print("=" * 60)
+    
+    import random
+    import aiSysConfig
+    
+    test_passed = True
+    test_num = 1
+    
+    try:
+        # Test 10.1: Casi limite di escape e variabili
+        print(f"\nTest {test_num}.1: Casi limite")
+        dictConfig = {"USER": "Mario", "A_1": "$USER", "N": 5, "è": "accentata"}
+        asTexts = ["", "%", "$", "$$", "%$USER", "%%$USER", "%##%#%%%n%$%x", "$USER$USER",
+                   "$A_1", "$N-$è$", "fine %", "$NONE e $USER.", "%$$USER", "100% $"]
+        for sText in asTexts:
+            sOld = aiSysConfig._Expand2Pass(sText, dictConfig)
+            sNew = aiSys.Expand(sText, dictConfig)
+            assert sOld == sNew, f"Expand diverso per {sText!r}: {sNew!r} invece di {sOld!r}"
+        print(f"  OK: {len(asTexts)} casi equivalenti")
+        test_num += 1
+        
+        # Test 10.2: Testi casuali
+        print(f"\nTest {test_num}.1: Testi casuali")
+        jRandom = random.Random(1)
+        sChars = "%$#n_ aUSER1è\\\""
+        for _ in range(5000):
+            sText = "".join(jRandom.choice(sChars) for _ in range(jRandom.randint(0, 12)))
+            sOld = aiSysConfig._Expand2Pass(sText, dictConfig)
+            sNew = aiSys.Expand(sText, dictConfig)
+            assert sOld == sNew, f"Expand diverso per {sText!r}: {sNew!r} invece di {sOld!r}"
+        print("  OK: 5000 testi equivalenti")
+        
+        # Test 10.3: Stesso testo, dizionari diversi (cache)
+        print(f"\nTest {test_num}.2: Cache con dizionari diversi")
+        assert aiSys.Expand("Ciao $USER", {"USER": "Anna"}) == "Ciao Anna", "Cache non rilegge il dizionario"
+        assert aiSys.Expand("Ciao $USER", {}) == "Ciao $USER", "Variabile assente non mantenuta"
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    
+    return test_passed
+
+
+def test_aiSysFileioIni() -> bool:
+    """Test per aiSysFileio.py (codec INI contro configparser, cache)"""
+    print("\n" + "=" * 60)
+    print("Test 11: File aiSysFileio.py, NomeTest: Codec INI")
+    print("=" * 60)
+    
+    import configparser
+    import time
+    
+    def ParseConfigparser(sText):
+        config = configparser.ConfigParser(interpolation=None, comment_prefixes=(';',),
+                                           inline_comment_prefixes=())
+        config.optionxform = str
+        config.read_string(sText)
+        return {sSect: dict(config[sSect]) for sSect in config.sections()}
+    
+    test_passed = True
+    test_num = 1
+    
+    try:
+        # Test 11.1: Stesso risultato di configparser
+        print(f"\nTest {test_num}.1: Equivalenza con configparser")
+        asTexts = [
+            "[CONFIG]\nUSER = mario\nPATH=C:\\ntJobs ; non commento\n; commento\n\n[J1]\nACTION:ECHO\n",
+            "[J1]\nNOTE = riga 1\n  riga 2\n\n  riga 4\nVUOTO =\nX = %(y)s $USER\n",
+            "  [S]\n  a = 1\n  b = 2\n    continua\n; fine\n",
+        ]
+        for sText in asTexts:
+            sResult, dictNew = aiSys.ini_text_to_dict(sText)
+            assert sResult == "", f"ini_text_to_dict errore: {sResult}"
+            assert dictNew == ParseConfigparser(sText), f"Risultato diverso per {sText!r}: {dictNew}"
+        print(f"  OK: {len(asTexts)} testi equivalenti")
+        
+        sResult, _ = aiSys.ini_text_to_dict("[A]\nk = 1\n[A]\nk = 2\n")
+        assert sResult != "", "Sezione duplicata non segnalata"
+        sResult, dictNew = aiSys.ini_text_to_dict("[A]\nk = 1\n[A]\nk = 2\n", bStrict=False)
+        assert dictNew == {"A": {"k": "2"}}, f"bStrict=False: {dictNew}"
+        test_num += 1
+        
+        # Test 11.2: Scrittura e rilettura
+        print(f"\nTest {test_num}.1: Scrittura e rilettura")
+        dictIni = {"CONFIG": {"USER": "mario", "N": 5},
+                   "J1": {"NOTE": "riga 1\nriga 2\n\nriga 4", "CMD": "a=b:c ; d"}}
+        sText = aiSys.ini_text_from_dict(dictIni)
+        _, dictNew = aiSys.ini_text_to_dict(sText)
+        assert dictNew == ParseConfigparser(sText), "Testo scritto letto diversamente da configparser"
+        assert dictNew["J1"] == dictIni["J1"] and dictNew["CONFIG"]["N"] == "5", f"Rilettura: {dictNew}"
+
+        # Valori come le code di stdout in RETURN.VALUE: righe indentate, ';', '[' e righe vuote
+        for sValue in ["line1\n  indented\n;semi\n[x]\nend", "a\n\n\tb\n", "[S]\n k = v\n"]:
+            dictValue = {"S": {"RETURN.VALUE": sValue, "K": "z"}}
+            sResult, dictNew = aiSys.ini_text_to_dict(aiSys.ini_text_from_dict(dictValue))
+            assert sResult == "", f"Rilettura {sValue!r}: {sResult}"
+            assert dictNew == dictValue, f"Valore non conservato {sValue!r}: {dictNew}"
+        print("  OK")
+
+        # Test 11.3: Cache per (path, mtime_ns, size)
+        print(f"\nTest {test_num}.2: Cache delle letture")
+        with tempfile.TemporaryDirectory() as sDir:
+            sFile = os.path.join(sDir, "jobs.ini")
+            aiSys.save_dict_to_ini(dictIni, sFile)
+            os.utime(sFile, (time.time() - 10, time.time() - 10))
+            _, dictRead1 = aiSys.read_ini_to_dict(sFile)
+            dictRead1["J1"]["NOTE"] = "modificato"
+            _, dictRead2 = aiSys.read_ini_to_dict(sFile)
+            assert dictRead2["J1"]["NOTE"] == dictIni["J1"]["NOTE"], "La cache ritorna il dizionario modificato"
+            aiSys.save_dict_to_ini({"J2": {"A": "1"}}, sFile)
+            _, dictRead3 = aiSys.read_ini_to_dict(sFile)
+            assert list(dictRead3) == ["J2"], f"Cache non invalidata dopo la scrittura: {list(dictRead3)}"
+        print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    
+    return test_passed
+
+
+def test_aiSysFileioDirs() -> bool:
+    """Test per aiSysFileio.py (DirExists, DirExistsMany con timeout)"""
+    print("\n" + "=" * 60)
+    print("Test 12: File aiSysFileio.py, NomeTest: DirExistsMany")
+    print("=" * 60)
+    
+    import time
+    import aiSysFileio
+    
+    test_passed = True
+    fnDirExists = aiSysFileio.DirExists
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sMissing = os.path.join(sDir, "non_esiste")
+            
+            # Test 12.1: Risultati come DirExists, duplicati verificati una volta
+            print("\nTest 12.1: Cartelle esistenti e non esistenti")
+            assert aiSys.DirExists(sDir) and not aiSys.DirExists(sMissing), "DirExists errata"
+            dictExists = aiSys.DirExistsMany([sDir, sMissing, sDir])
+            assert dictExists == {sDir: True, sMissing: False}, f"DirExistsMany: {dictExists}"
+            assert aiSys.DirExistsMany([]) == {}, "Lista vuota"
+            print("  OK")
+            
+            # Test 12.2: Una cartella lenta vale None senza bloccare le altre
+            print("\nTest 12.2: Timeout per verifica")
+            def DirExistsSlow(sPath):
+                if sPath.endswith("lenta"):
+                    time.sleep(2)
+                return fnDirExists(sPath)
+            aiSysFileio.DirExists = DirExistsSlow
+            
+            sSlow = os.path.join(sDir, "lenta")
+            tsStart = time.monotonic()
+            dictExists = aiSys.DirExistsMany([sSlow, sDir, sMissing], nWorkers=2, nTimeout=0.3)
+            nElapsed = time.monotonic() - tsStart
+            assert dictExists == {sSlow: None, sDir: True, sMissing: False}, f"DirExistsMany: {dictExists}"
+            assert nElapsed < 1.5, f"Attesa della cartella lenta: {nElapsed:.2f}s"
+            print(f"  OK: {nElapsed:.2f}s")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        aiSysFileio.DirExists = fnDirExists
+    
+    return test_passed
+
+
+def JobsTestOS(sDir: str, dictConfig: Dict[str, Any] = None) -> Any:
+    """
+    Istanza acJobsOS per i test, senza JobsStart: configurazione da
+    dictConfig, log senza echo nella cartella sDir.
+    """
+    from acJobsOS import acJobsOS
+    
+    jOS = acJobsOS()
+    jOS.dictConfig = dict(dictConfig or {})
+    jOS.jLog = aiSys.acLog()
+    jOS.jLog.Start(sLogfile="aiSysTest_jobs", sLogFolder=sDir)
+    jOS.jLog.Options(bEcho=False)
+    return jOS
+
+
+def test_acJobsJobsOutput() -> bool:
+    """Test per acJobsJobs.py (attesa del processo, coda di stderr al timeout)"""
+    print("\n" + "=" * 60)
+    print("Test 13: File acJobsJobs.py, NomeTest: Processo esterno e output")
+    print("=" * 60)
+    
+    import time
+    import threading
+    from acJobsOS import acJobsOS
+    from acJobsAction import acJobsAction
+    
+    class acJobsOSTimeout(acJobsOS):
+        """Timeout del job di 1 secondo (JobTimeout ha un minimo di 50)"""
+        def JobTimeout(self):
+            return 1
+    
+    test_passed = True
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sScript = os.path.join(sDir, "job.sh")
+            with open(sScript, 'w') as hFile:
+                hFile.write("#!/bin/sh\necho uscita $1\necho errore grave >&2\nsleep $2\n")
+            os.chmod(sScript, 0o755)
+            
+            def JobStart(jOS, sParams):
+                jOS.sJobsPath = sDir
+                jOS.sJob = "J1"
+                jOS.sAction = "TEST"
+                jOS.sScript = sScript
+                jOS.jAction = acJobsAction({"ACT_ID": "TEST", "ACT_PARAMS": sParams}, {})
+                return jOS.JobStartProcess()
+            
+            # Test 13.1: Fine processo, coda di stdout e stderr
+            print("\nTest 13.1: Processo terminato")
+            jOS = JobsTestOS(sDir)
+            assert JobStart(jOS, "ok 0") == "", "Avvio processo"
+            tsStart = time.monotonic()
+            sResult = jOS.JobExecWait()
+            nElapsed = time.monotonic() - tsStart
+            sOut, sErr = jOS.JobOutput()
+            assert sResult == "", f"JobExecWait: {sResult}"
+            assert nElapsed < 2, f"Attesa oltre la fine del processo: {nElapsed:.2f}s"
+            assert sOut.strip() == "uscita ok" and sErr.strip() == "errore grave", f"Output: {sOut!r} {sErr!r}"
+            with open(os.path.join(sDir, "stderr.log"), 'r', encoding='utf-8') as hFile:
+                assert "errore grave" in hFile.read(), "stderr.log non scritto"
+            print(f"  OK: {nElapsed:.2f}s")
+            
+            # Test 13.2: Timeout, la coda di stderr resta per l'errore del job
+            print("\nTest 13.2: Timeout con coda di stderr")
+            jOS = acJobsOSTimeout()
+            jOS.jLog = JobsTestOS(sDir).jLog
+            assert JobStart(jOS, "lenta 30") == "", "Avvio processo"
+            sResult = jOS.JobExecWait()
+            assert "Timeout" in sResult, f"Timeout non segnalato: {sResult}"
+            assert jOS.pidJob is None, "Processo non terminato"
+            sOut, sErr = jOS.JobOutput()
+            assert sErr.strip() == "errore grave", f"Coda di stderr persa al timeout: {sErr!r}"
+            assert jOS.JobOutput() == ("", ""), "Coda ripetuta"
+            jOS.jLog.End()
+            print("  OK")
+            
+            # Test 13.3: ntjobsapp.end scritto con il processo ancora attivo
+            print("\nTest 13.3: Arrivo di ntjobsapp.end")
+            sScriptEnd = os.path.join(sDir, "job_end.sh")
+            with open(sScriptEnd, 'w') as hFile:
+                hFile.write("#!/bin/sh\nsleep $1\ntouch ntjobsapp.end\nexec sleep $2\n")
+            os.chmod(sScriptEnd, 0o755)
+            sFileAppEnd = os.path.join(sDir, "ntjobsapp.end")
+            jOS = JobsTestOS(sDir)
+            jOS.sScript = sScriptEnd
+            jOS.sJobsPath = sDir
+            jOS.sJob = "J1"
+            jOS.sAction = "TEST"
+            jOS.jAction = acJobsAction({"ACT_ID": "TEST", "ACT_PARAMS": "0.3 30"}, {})
+            assert jOS.JobStartProcess() == "", "Avvio processo"
+            tsStart = time.monotonic()
+            sResult = jOS.JobExecWait()
+            nElapsed = time.monotonic() - tsStart
+            assert sResult == "", f"JobExecWait: {sResult}"
+            assert 0.2 < nElapsed < 2, f"Attesa di ntjobsapp.end: {nElapsed:.2f}s"
+            assert jOS.pidJob.poll() is None, "Processo terminato prima di ntjobsapp.end"
+            jOS.JobCleanup()
+            os.remove(sFileAppEnd)
+            print(f"  OK: {nElapsed:.2f}s")
+            
+            # Test 13.4: Senza processo, attesa del solo ntjobsapp.end
+            print("\nTest 13.4: Job senza processo")
+            jOS = JobsTestOS(sDir)
+            jOS.sJobsPath = sDir
+            jOS.jAction = acJobsAction({"ACT_ID": "TEST"}, {})
+            jTimer = threading.Timer(0.3, lambda: open(sFileAppEnd, 'w').close())
+            jTimer.start()
+            tsStart = time.monotonic()
+            sResult = jOS.JobExecWait()
+            nElapsed = time.monotonic() - tsStart
+            jTimer.join()
+            os.remove(sFileAppEnd)
+            assert sResult == "" and nElapsed < 2, f"JobExecWait: {sResult} {nElapsed:.2f}s"
+            print(f"  OK: {nElapsed:.2f}s")
+            
+            # Test 13.5: Timeout da ACT_TIMEOUT o TIMEOUT, minimo 50 secondi
+            print("\nTest 13.5: JobTimeout")
+            jOS = JobsTestOS(sDir, {"TIMEOUT": "70"})
+            for sTimeout, nExpected in [("120", 120), ("10", 50), ("", 70)]:
+                jOS.jAction = acJobsAction({"ACT_ID": "TEST", "ACT_TIMEOUT": sTimeout}, {})
+                assert jOS.JobTimeout() == nExpected, f"ACT_TIMEOUT {sTimeout!r}: {jOS.JobTimeout()}"
+            jOS.dictConfig = {"TIMEOUT": "5"}
+            assert jOS.JobTimeout() == 50, f"TIMEOUT sotto il minimo: {jOS.JobTimeout()}"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    
+    return test_passed
+
+
+def test_acJobsMailQueue() -> bool:
+    """Test per acJobsMailQueue.py (invio, nuovi tentativi, failed, digest)"""
+    print("\n" + "=" * 60)
+    print("Test 14: File acJobsMailQueue.py, NomeTest: Coda mail")
+    print("=" * 60)
+    
+    import time
+    import threading
+    from acJobsMailQueue import acJobsMailQueue
+    
+    test_passed = True
+    jQueue = None
+    
+    def WaitFor(fnCheck, nTimeout=5.0):
+        tsEnd = time.monotonic() + nTimeout
+        while not fnCheck() and time.monotonic() < tsEnd:
+            time.sleep(0.05)
+        return fnCheck()
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            asSent = []
+            asFail = set()
+            lockSent = threading.Lock()
+            
+            def Send(sTo, sSubject, sText, asFiles):
+                if sTo in asFail:
+                    return "SMTP non raggiungibile"
+                with lockSent:
+                    asSent.append((sTo, sSubject, sText))
+                return ""
+            
+            # Test 14.1: Invio e rimozione dallo spool
+            print("\nTest 14.1: Invio in background")
+            jQueue = acJobsMailQueue()
+            assert jQueue.Start(sDir, Send, nRetryMax=2, nRetryWait=1) == "", "Start"
+            assert jQueue.Put("a@x.it", "Oggetto", "Testo") == "", "Put"
+            assert WaitFor(lambda: len(asSent) == 1), "Mail non inviata"
+            assert WaitFor(lambda: not [f for f in os.listdir(sDir) if f.endswith(".json")]), "Mail rimasta nello spool"
+            print("  OK")
+            
+            # Test 14.2: Nuovo tentativo e poi failed dopo nRetryMax
+            print("\nTest 14.2: Tentativi e scarto in failed")
+            asFail.add("ko@x.it")
+            jQueue.Put("ko@x.it", "Errore", "Testo")
+            assert WaitFor(lambda: len(os.listdir(os.path.join(sDir, "failed"))) == 1), "Mail non scartata"
+            sFailed = os.listdir(os.path.join(sDir, "failed"))[0]
+            with open(os.path.join(sDir, "failed", sFailed), 'r', encoding='utf-8') as hFile:
+                dictMail = json.load(hFile)
+            assert dictMail["try"] == 1 and dictMail["error"] == "SMTP non raggiungibile", f"Mail scartata: {dictMail}"
+            assert not jQueue.dictPending, "Mail scartata ancora in coda"
+            print("  OK")
+            
+            # Test 14.3: Digest, una mail per destinatario alla fine della finestra
+            print("\nTest 14.3: Digest")
+            asSent.clear()
+            for nMail in range(3):
+                jQueue.Put("d@x.it", f"Fine jobs {nMail}", f"Testo {nMail}", nDigest=0.5)
+            jQueue.Put("e@x.it", "Fine jobs unico", "Testo", nDigest=0.5)
+            time.sleep(0.2)
+            assert asSent == [], "Digest inviato prima della fine della finestra"
+            assert WaitFor(lambda: len(asSent) == 2), f"Mail digest: {asSent}"
+            dictSent = {sTo: (sSubject, sText) for sTo, sSubject, sText in asSent}
+            assert dictSent["d@x.it"][0] == "Riepilogo aiJobsOS: 3 notifiche", f"Oggetto: {dictSent['d@x.it'][0]}"
+            assert all(f"Testo {n}" in dictSent["d@x.it"][1] for n in range(3)), "Parti mancanti nel riepilogo"
+            assert dictSent["e@x.it"][0] == "Fine jobs unico", "Digest di una sola mail"
+            assert not jQueue.dictDigest, "Finestre di digest non chiuse"
+            print("  OK")
+            
+            # Test 14.4: Riepilogo non scrivibile, parti riprovate senza ciclo continuo
+            print("\nTest 14.4: Errore scrittura del riepilogo")
+            asSent.clear()
+            fnMailWrite = jQueue.MailWrite
+            nReads = [0]
+            fnMailRead = jQueue.MailRead
+            def MailWriteDigest(sName, dictMail):
+                if not dictMail["digest"]:
+                    raise OSError("disco pieno")
+                fnMailWrite(sName, dictMail)
+            def MailReadCount(sName):
+                nReads[0] += 1
+                return fnMailRead(sName)
+            jQueue.MailWrite = MailWriteDigest
+            jQueue.MailRead = MailReadCount
+            jQueue.Put("d@x.it", "Fine jobs A", "Testo A", nDigest=0.2)
+            jQueue.Put("d@x.it", "Fine jobs B", "Testo B", nDigest=0.2)
+            time.sleep(0.8)
+            assert asSent == [], f"Parti inviate singolarmente: {asSent}"
+            assert nReads[0] < 20, f"Ciclo continuo sullo spool: {nReads[0]} letture"
+            assert all(nNext > time.time() for nNext in jQueue.dictPending.values()), "Parti non riprogrammate"
+            jQueue.MailWrite = fnMailWrite
+            jQueue.MailRead = fnMailRead
+            assert WaitFor(lambda: len(asSent) == 1), "Riepilogo non inviato dopo il nuovo tentativo"
+            assert asSent[0][1] == "Riepilogo aiJobsOS: 2 notifiche", f"Riepilogo: {asSent}"
+            print(f"  OK: {nReads[0]} letture")
+            
+            # Test 14.5: Mail rimaste nello spool riprese al riavvio
+            print("\nTest 14.5: Ripresa dello spool")
+            jQueue.End()
+            asFail.add("r@x.it")
+            jQueue = acJobsMailQueue()
+            jQueue.Start(sDir, Send, nRetryWait=60)
+            jQueue.Put("r@x.it", "Ripresa", "Testo")
+            assert WaitFor(lambda: jQueue.dictPending and min(jQueue.dictPending.values()) > time.time()), "Tentativo non programmato"
+            jQueue.End()
+            asFail.discard("r@x.it")
+            asSent.clear()
+            jQueue = acJobsMailQueue()
+            jQueue.Start(sDir, Send)
+            assert len(jQueue.dictPending) == 1, f"Spool non ripreso: {jQueue.dictPending}"
+            print("  OK")
+            
+            # Test 14.6: Digest configurato senza coda, segnalato all'avvio
+            print("\nTest 14.6: MAIL.DIGEST con MAIL.QUEUE=False")
+            sDirLog = os.path.join(sDir, "log")
+            os.makedirs(sDirLog)
+            for sDigest, bWarning in [("60", True), ("", False)]:
+                jOS = JobsTestOS(sDirLog, {"MAIL.QUEUE": "False", "MAIL.DIGEST": sDigest})
+                jOS.jLog.Options(bEcho=False, sLevel="ERR")
+                assert jOS.JobsStart_MailQueue() == "" and jOS.jMailQueue is None, "Coda avviata"
+                sLog = ""
+                if os.path.exists(jOS.jLog.sLog):
+                    with open(jOS.jLog.sLog, 'r', encoding='utf-8') as hFile:
+                        sLog = hFile.read()
+                    os.remove(jOS.jLog.sLog)
+                assert ("MAIL.DIGEST ignorato" in sLog) == bWarning, f"MAIL.DIGEST={sDigest!r}, log: {sLog!r}"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        if jQueue is not None:
+            jQueue.End()
+    
+    return test_passed
+
+
+def test_acJobsClaim() -> bool:
+    """Test per acJobsClaim.py e per i claim in acJobsOS.Move e Archive"""
+    print("\n" + "=" * 60)
+    print("Test 15: File acJobsClaim.py, NomeTest: Lease delle cartelle")
+    print("=" * 60)
+    
+    import time
+    from acJobsClaim import acJobsClaim, CLAIM_FILE
+    from acJobsInbox import acJobsInbox, INBOX_ENDED
+    
+    test_passed = True
+    ajClaims = []
+    
+    def ClaimStart(sNode, nLease=60):
+        jClaim = acJobsClaim()
+        assert jClaim.Start(sNode, nLease) == "", f"Start {sNode}"
+        ajClaims.append(jClaim)
+        return jClaim
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sPath = os.path.join(sDir, "jobs_1")
+            os.makedirs(sPath)
+            sFile = os.path.join(sPath, CLAIM_FILE)
+            
+            # Test 15.1: Claim esclusivo e rilascio
+            print("\nTest 15.1: Claim e rilascio")
+            jNodeA = ClaimStart("A")
+            jNodeB = ClaimStart("B")
+            assert jNodeA.Claim(sPath), "Claim nodo A"
+            assert jNodeA.Claim(sPath), "Claim già tenuto"
+            assert not jNodeB.Claim(sPath), "Claim doppio del nodo B"
+            assert jNodeA.Owner(sFile) == "A", "Owner"
+            jNodeB.Release(sPath)
+            assert os.path.exists(sFile), "Claim di un altro nodo rimosso"
+            jNodeA.Release(sPath)
+            assert not os.path.exists(sFile) and sPath not in jNodeA.dictHeld, "Claim non rilasciato"
+            assert jNodeB.Claim(sPath), "Claim dopo il rilascio"
+            jNodeB.Release(sPath)
+            print("  OK")
+            
+            # Test 15.2: Claim scaduto rilevato, claim attivo no
+            print("\nTest 15.2: Rilevamento claim scaduto")
+            assert jNodeA.Claim(sPath), "Claim nodo A"
+            os.utime(sFile, (time.time() - 120, time.time() - 120))
+            assert not ClaimStart("C", 300).Claim(sPath), "Claim non scaduto per lease lungo"
+            assert jNodeB.Claim(sPath), "Claim scaduto non rilevato"
+            assert jNodeB.Owner(sFile) == "B", "Owner dopo il rilevamento"
+            assert not [f for f in os.listdir(sPath) if f != CLAIM_FILE], "File temporanei rimasti"
+            jNodeB.Release(sPath)
+            print("  OK")
+            
+            # Test 15.3: Claim dello stesso nodo lasciato da un'esecuzione interrotta
+            print("\nTest 15.3: Ripresa del proprio claim")
+            assert jNodeA.Claim(sPath), "Claim nodo A"
+            jNodeA.End()
+            jNodeA2 = ClaimStart("A")
+            assert jNodeA2.Claim(sPath), "Claim interrotto dello stesso nodo non ripreso"
+            jNodeA2.Release(sPath)
+            print("  OK")
+            
+            # Test 15.4: Heartbeat, claim rilevato da un altro nodo non più tenuto
+            print("\nTest 15.4: Heartbeat e claim perso")
+            jNodeH = ClaimStart("H", 0.4)
+            assert jNodeH.Claim(sPath), "Claim nodo H"
+            os.utime(sFile, (time.time() - 10, time.time() - 10))
+            time.sleep(0.25)
+            assert time.time() - os.stat(sFile).st_mtime < 1, "Claim non rinnovato"
+            os.remove(sFile)
+            assert jNodeB.Claim(sPath), "Claim nodo B"
+            time.sleep(0.25)
+            assert sPath not in jNodeH.dictHeld, "Claim perso ancora tenuto"
+            assert jNodeB.Owner(sFile) == "B", "Claim del nodo B modificato"
+            jNodeB.Release(sPath)
+            print("  OK")
+            
+            # Test 15.5: Move fallito, claim della cartella inbox rilasciato
+            print("\nTest 15.5: Move fallito")
+            sUserPath = os.path.join(sDir, "utente")
+            os.makedirs(sUserPath)
+            with open(os.path.join(sUserPath, "jobs.ini"), 'w', encoding='utf-8') as hFile:
+                hFile.write("[CONFIG]\nPROGRAM = test\n\n[J1]\nFILE.1 = manca.txt\n")
+            jOS = JobsTestOS(sDir)
+            jOS.sSys_PathInbox = os.path.join(sDir, "inbox")
+            # Archivio sotto un file: cartella non creabile
+            with open(os.path.join(sDir, "archivio"), 'w') as hFile:
+                hFile.write("file")
+            jOS.sSys_PathArchive = os.path.join(sDir, "archivio", "jobs")
+            jOS.jInbox = acJobsInbox()
+            assert jOS.jInbox.Start(jOS.sSys_PathInbox) == "", "Start inbox"
+            jOS.jClaim = ClaimStart("N")
+            assert jOS.Move(sUserPath, "utente") != "", "Move senza file associato riuscito"
+            asInbox = [f for f in os.listdir(jOS.sSys_PathInbox) if f.startswith("jobs_")]
+            assert len(asInbox) == 1, f"Cartelle inbox: {asInbox}"
+            sPathInbox = os.path.join(jOS.sSys_PathInbox, asInbox[0])
+            assert not os.path.exists(os.path.join(sPathInbox, CLAIM_FILE)), "Claim rimasto dopo Move fallito"
+            assert not jOS.jClaim.dictHeld, f"Claim tenuti: {jOS.jClaim.dictHeld}"
+            print("  OK")
+            
+            # Test 15.6: Archive fallito, claim della cartella rilasciato
+            print("\nTest 15.6: Archive fallito")
+            jOS.jInbox.Set(sPathInbox, INBOX_ENDED)
+            assert jOS.Archive() != "", "Archive in cartella non creabile riuscito"
+            assert os.path.isdir(sPathInbox), "Cartella spostata"
+            assert not os.path.exists(os.path.join(sPathInbox, CLAIM_FILE)), "Claim rimasto dopo Archive fallito"
+            assert not jOS.jClaim.dictHeld, f"Claim tenuti: {jOS.jClaim.dictHeld}"
+            assert jOS.jInbox.State(sPathInbox) == INBOX_ENDED, "Stato cambiato"
+            os.remove(os.path.join(sDir, "archivio"))
+            os.makedirs(jOS.sSys_PathArchive)
+            assert jOS.Archive() == "", "Archive"
+            sPathArchived = os.path.join(jOS.sSys_PathArchive, asInbox[0])
+            assert os.path.isdir(sPathArchived), "Cartella non archiviata"
+            assert not os.path.exists(os.path.join(sPathArchived, CLAIM_FILE)), "Claim archiviato"
+            jOS.jInbox.End()
+            jOS.jLog.End()
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        for jClaim in ajClaims:
+            jClaim.End()
+    
+    return test_passed
+
+
+def test_aiSysStat() -> bool:
+    """Test per aiSysStat.py (cache delle cartelle e invalidazione)"""
+    print("\n" + "=" * 60)
+    print("Test 16: File aiSysStat.py, NomeTest: Cache delle cartelle")
+    print("=" * 60)
+    
+    import threading
+    from aiSysStat import acStatCache
+    
+    test_passed = True
+    fnScandir = os.scandir
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sFile = os.path.join(sDir, "jobs.ini")
+            
+            # Test 16.1: Una lettura per cartella, poi dalla cache
+            print("\nTest 16.1: Verifiche dalla cache")
+            jStat = acStatCache()
+            os.makedirs(os.path.join(sDir, "sub"))
+            assert not jStat.FileExists(sFile), "File non esistente"
+            assert jStat.DirExists(os.path.join(sDir, "sub")), "Cartella"
+            assert not jStat.FileExists(os.path.join(sDir, "sub")), "Cartella vista come file"
+            assert not jStat.DirExists(os.path.join(sDir, "manca", "sub")), "Cartella non esistente"
+            assert jStat.nScan == 2 and jStat.nHit == 2, f"Letture {jStat.nScan}, hit {jStat.nHit}"
+            print("  OK")
+            
+            # Test 16.2: Invalidate e Clear
+            print("\nTest 16.2: Invalidate e Clear")
+            with open(sFile, 'w') as hFile:
+                hFile.write("[CONFIG]\n")
+            assert not jStat.FileExists(sFile), "Cache non usata"
+            jStat.Invalidate(sFile)
+            assert jStat.FileExists(sFile), "Invalidate senza effetto"
+            os.remove(sFile)
+            jStat.Clear()
+            assert not jStat.FileExists(sFile), "Clear senza effetto"
+            # Invalidate della cartella del job: anche le sottocartelle sono rilette
+            sFileSub = os.path.join(sDir, "sub", "deep", "out.txt")
+            os.makedirs(os.path.dirname(sFileSub))
+            jStat.Clear()
+            assert not jStat.FileExists(sFileSub), "File non esistente"
+            with open(sFileSub, 'w') as hFile:
+                hFile.write("output")
+            jStat.Invalidate(sDir)
+            assert jStat.FileExists(sFileSub), "Sottocartella rimasta in cache dopo Invalidate"
+            # Cartella con lo stesso prefisso nel nome: resta in cache
+            os.makedirs(os.path.join(sDir, "subx"))
+            jStat.FileExists(os.path.join(sDir, "subx", "a.txt"))
+            nScan = jStat.nScan
+            jStat.Invalidate(os.path.join(sDir, "sub"))
+            jStat.FileExists(os.path.join(sDir, "subx", "a.txt"))
+            assert jStat.nScan == nScan, "Cartella con lo stesso prefisso scartata"
+            print("  OK")
+            
+            # Test 16.3: Invalidate durante la lettura, contenuto non messo in cache
+            print("\nTest 16.3: Invalidate durante la lettura")
+            jStat.Clear()
+            evScan = threading.Event()
+            evGo = threading.Event()
+            class acScanList(list):
+                """Contenuto letto subito, come os.scandir usata con with"""
+                def __enter__(self):
+                    return self
+                def __exit__(self, *args):
+                    return False
+            def ScandirSlow(sPath):
+                with fnScandir(sPath) as jScan:
+                    ajEntries = acScanList(jScan)
+                evScan.set()
+                evGo.wait(5)
+                return ajEntries
+            os.scandir = ScandirSlow
+            abResult = []
+            jThread = threading.Thread(target=lambda: abResult.append(jStat.FileExists(sFile)))
+            jThread.start()
+            assert evScan.wait(5), "Lettura non avviata"
+            with open(sFile, 'w') as hFile:
+                hFile.write("[CONFIG]\n")
+            jStat.Invalidate(sFile)
+            evGo.set()
+            jThread.join(5)
+            os.scandir = fnScandir
+            assert abResult == [False], f"Lettura: {abResult}"
+            assert jStat.FileExists(sFile), "Contenuto precedente a Invalidate rimasto in cache"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        os.scandir = fnScandir
+    
+    return test_passed
+
+
+def test_aiSysConfigView() -> bool:
+    """Test per aiSysConfig.py (acConfigView) e acJobsJobs.Config"""
+    print("\n" + "=" * 60)
+    print("Test 17: File aiSysConfig.py, NomeTest: Vista a livelli")
+    print("=" * 60)
+    
+    class dictCount(dict):
+        """Dizionario che conta le scansioni delle chiavi"""
+        nIter = 0
+        def __iter__(self):
+            dictCount.nIter += 1
+            return super().__iter__()
+    
+    test_passed = True
+    
+    try:
+        # Test 17.1: Priorità dei livelli ed espansione
+        print("\nTest 17.1: Priorità ed espansione")
+        dictSys = {"USER": "sistema", "PATH": "/home/$USER", "N": 5, "SOLO_SYS": "s"}
+        dictJobs = {"USER": "mario"}
+        jView = aiSys.acConfigView(dictJobs, dictSys)
+        assert jView["USER"] == "mario", "Priorità del primo livello"
+        assert jView["PATH"] == "/home/mario", f"Espansione: {jView['PATH']}"
+        assert jView["N"] == 5, "Valore non stringa"
+        assert jView.Raw("PATH") == "/home/$USER", "Raw"
+        assert jView.Raw("MANCA", None) is None and jView.get("MANCA", "") == "", "Chiave mancante"
+        assert "SOLO_SYS" in jView and "MANCA" not in jView, "in"
+        assert sorted(jView) == sorted(dictSys) and len(jView) == 4, "Chiavi dei livelli"
+        print("  OK")
+        
+        # Test 17.2: Cache dei valori espansi, livelli non copiati
+        print("\nTest 17.2: Cache")
+        dictJobs["USER"] = "luigi"
+        assert jView["PATH"] == "/home/mario", "Valore espanso non in cache"
+        assert aiSys.acConfigView(dictJobs, dictSys)["PATH"] == "/home/luigi", "Livello copiato"
+        print("  OK")
+        
+        # Test 17.3: NewChild riusa le espansioni del padre
+        print("\nTest 17.3: NewChild")
+        jParent = aiSys.acConfigView(dictSys)
+        jChildSame = jParent.NewChild({"ALTRO": "x"})
+        assert jChildSame["PATH"] == "/home/sistema", "Espansione nel figlio"
+        assert jParent.dictCache.get("PATH") == "/home/sistema", "Espansione non riusata dal padre"
+        jChild = jParent.NewChild({"USER": "anna"})
+        assert jChild["PATH"] == "/home/anna", "Variabile ridefinita nel figlio"
+        assert jParent["PATH"] == "/home/sistema", "Padre modificato dal figlio"
+        print("  OK")
+        
+        # Test 17.4: Config su vista senza scandire i livelli
+        print("\nTest 17.4: acJobsJobs.Config")
+        with tempfile.TemporaryDirectory() as sDir:
+            jOS = JobsTestOS(sDir)
+            jOS.JOBS_TAB_CONFIG = dictCount({"CONFIG": {"MAIL.ADMIN": "admin@x.it"}, "TIMEOUT": "60"})
+            jOS.dictJobs = {"CONFIG": dictCount({"TIMEOUT": "120"})}
+            assert jOS.ConfigUpdate() == "", "ConfigUpdate"
+            dictCount.nIter = 0
+            assert jOS.Config("TIMEOUT") == "120", "Config del jobs.ini"
+            assert jOS.Config("MAIL.ADMIN") == "admin@x.it", "Config di sistema"
+            assert jOS.Config("MANCA") == "", "Config mancante"
+            assert dictCount.nIter == 0, f"Livelli scanditi da Config: {dictCount.nIter}"
+            jOS.dictConfig = None
+            assert jOS.Config("TIMEOUT") == "", "Config senza configurazione"
+            jOS.jLog.End()
+        print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    
+    return test_passed
+
+
+def test_acJobsInbox() -> bool:
+    """Test per acJobsInbox.py e per i jobs.ini non conclusi (acJobsOS.ExecRetry)"""
+    print("\n" + "=" * 60)
+    print("Test 18: File acJobsInbox.py, NomeTest: Indice della inbox")
+    print("=" * 60)
+    
+    from acJobsOS import acJobsOS
+    from acJobsInbox import (acJobsInbox, INBOX_QUEUED, INBOX_RUNNING, INBOX_ENDED,
+                             INBOX_ERROR, INBOX_ARCHIVED)
+    
+    class acJobsOSMail(acJobsOS):
+        """Mail raccolte invece che inviate"""
+        def JobsMail(self, sTo, sSubject, sText, asFiles=[], nDigest=0):
+            self.asMails.append((sTo, sSubject, sText))
+            return ""
+    
+    def FolderMake(sPathInbox, sName, bEnd=False, sUser="mario"):
+        sPath = os.path.join(sPathInbox, sName)
+        os.makedirs(sPath)
+        with open(os.path.join(sPath, "jobs.ini"), 'w', encoding='utf-8') as hFile:
+            hFile.write(f"[CONFIG]\nUSER = {sUser}\n\n[J1]\nACTION = TEST\n")
+        if bEnd:
+            with open(os.path.join(sPath, "jobs.end"), 'w', encoding='utf-8') as hFile:
+                hFile.write("[J1]\nRETURN.TYPE = S\n")
+        return sPath
+    
+    test_passed = True
+    jInbox = None
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sPathInbox = os.path.join(sDir, "inbox")
+            os.makedirs(sPathInbox)
+            FolderMake(sPathInbox, "jobs_1")
+            FolderMake(sPathInbox, "jobs_2", bEnd=True)
+            os.makedirs(os.path.join(sPathInbox, "vuota"))
+            
+            # Test 18.1: Ricostruzione dal disco senza journal
+            print("\nTest 18.1: Rebuild")
+            jInbox = acJobsInbox()
+            assert jInbox.Start(sPathInbox) == "", "Start"
+            assert jInbox.dictState == {"jobs_1": INBOX_QUEUED, "jobs_2": INBOX_ENDED}, f"Indice: {jInbox.dictState}"
+            print("  OK")
+            
+            # Test 18.2: Journal riletto al riavvio, RUNNING torna in coda, ERROR resta
+            print("\nTest 18.2: Load")
+            FolderMake(sPathInbox, "jobs_3")
+            FolderMake(sPathInbox, "jobs_4")
+            jInbox.Set(os.path.join(sPathInbox, "jobs_3"), INBOX_RUNNING)
+            jInbox.Set("jobs_4", INBOX_ERROR)
+            jInbox.Set("jobs_2", INBOX_ARCHIVED)
+            assert jInbox.List(INBOX_QUEUED) == ["jobs_1"], "List"
+            jInbox.End()
+            with open(jInbox.sFileJrn, 'a', encoding='utf-8') as hFile:
+                hFile.write("2026-01-01\tQUEUED")     # Riga interrotta
+            jInbox = acJobsInbox()
+            assert jInbox.Start(sPathInbox) == "", "Start da journal"
+            assert jInbox.dictState == {"jobs_1": INBOX_QUEUED, "jobs_3": INBOX_QUEUED,
+                                        "jobs_4": INBOX_ERROR}, f"Indice: {jInbox.dictState}"
+            print("  OK")
+            
+            # Test 18.3: Compattazione del journal
+            print("\nTest 18.3: Compact")
+            for _ in range(600):
+                jInbox.Set("jobs_1", INBOX_RUNNING)
+                jInbox.Set("jobs_1", INBOX_QUEUED)
+            with open(jInbox.sFileJrn, 'r', encoding='utf-8') as hFile:
+                nLines = len(hFile.readlines())
+            assert nLines < 1100 and jInbox.nJrnLines == nLines, f"Journal non compattato: {nLines} righe"
+            assert jInbox.State("jobs_1") == INBOX_QUEUED, "Stato dopo la compattazione"
+            print(f"  OK: {nLines} righe")
+            
+            # Test 18.4: jobs.ini non concluso, riproposto e poi in errore con mail
+            print("\nTest 18.4: Esecuzioni non concluse")
+            jInbox.End()
+            shutil.rmtree(sPathInbox)
+            os.makedirs(sPathInbox)
+            jOS = acJobsOSMail()
+            jOS.asMails = []
+            jOS.jLog = JobsTestOS(sDir).jLog
+            jOS.dictConfig = {"ADMIN.EMAIL": "admin@x.it"}
+            jOS.JOBS_TAB_USERS = {"mario": {"USER": "", "USER_MAIL": "mario@x.it"}}
+            jOS.sSys_PathInbox = sPathInbox
+            jOS.jInbox = jInbox = acJobsInbox()
+            FolderMake(sPathInbox, "jobs_utente")
+            FolderMake(sPathInbox, "jobs_ignoto", sUser="ignoto")
+            jInbox.Start(sPathInbox)
+            for nRun in range(jOS.nExecRetry):
+                assert sorted(jInbox.List(INBOX_QUEUED)) == ["jobs_ignoto", "jobs_utente"], \
+                    f"Esecuzione {nRun + 1}: {jInbox.dictState}"
+                assert jOS.asMails == [], "Mail prima dell'ultima esecuzione"
+                jOS.jStat.Clear()
+                assert jOS.Get() == "", "Get"
+            assert sorted(jInbox.List(INBOX_ERROR)) == ["jobs_ignoto", "jobs_utente"], f"Stato finale: {jInbox.dictState}"
+            jOS.jStat.Clear()
+            jOS.Get()
+            assert len(jOS.asMails) == 2, f"Mail: {jOS.asMails}"
+            dictMails = {sTo: sText for sTo, _, sText in jOS.asMails}
+            assert "jobs_utente" in dictMails.get("mario@x.it", ""), "Mail all'utente"
+            assert "jobs_ignoto" in dictMails.get("admin@x.it", ""), "Mail all'amministratore"
+            assert not jOS.dictExecTry, f"Contatori rimasti: {jOS.dictExecTry}"
+            # Riavvio: le cartelle in errore non sono rieseguite né notificate di nuovo
+            jInbox.End()
+            jOS.jInbox = jInbox = acJobsInbox()
+            jInbox.Start(sPathInbox)
+            jOS.jStat.Clear()
+            assert jOS.Get() == "" and len(jOS.asMails) == 2, f"Mail dopo il riavvio: {jOS.asMails}"
+            assert sorted(jInbox.List(INBOX_ERROR)) == ["jobs_ignoto", "jobs_utente"], f"Riavvio: {jInbox.dictState}"
+            # Ricostruzione dell'indice (INBOX.REBUILD): di nuovo in coda
+            jInbox.End()
+            jOS.jInbox = jInbox = acJobsInbox()
+            jInbox.Start(sPathInbox, bRebuild=True)
+            assert sorted(jInbox.List(INBOX_QUEUED)) == ["jobs_ignoto", "jobs_utente"], f"Rebuild: {jInbox.dictState}"
+            jOS.jLog.End()
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        if jInbox is not None:
+            jInbox.End()
+    
+    return test_passed
+
+
+def test_acJobsOSSearch() -> bool:
+    """Test per acJobsOS.py (Search con e senza watch, attesa adattiva di CycleEnd)"""
+    print("\n" + "=" * 60)
+    print("Test 19: File acJobsOS.py, NomeTest: Ricerca e attesa del ciclo")
+    print("=" * 60)
+    
+    import time
+    import threading
+    from acJobsInbox import acJobsInbox, INBOX_QUEUED
+    
+    test_passed = True
+    jOS = None
+    
+    def JobsIni(sPath):
+        with open(os.path.join(sPath, "jobs.ini"), 'w', encoding='utf-8') as hFile:
+            hFile.write("[CONFIG]\nPROGRAM = test\n\n[J1]\nACTION = TEST\n")
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            asUserPaths = [os.path.join(sDir, f"utente{n}") for n in range(2)]
+            for sPath in asUserPaths:
+                os.makedirs(sPath)
+            
+            jOS = JobsTestOS(sDir)
+            jOS.sSys_PathInbox = os.path.join(sDir, "inbox")
+            jOS.jInbox = acJobsInbox()
+            jOS.jInbox.Start(jOS.sSys_PathInbox)
+            jOS.asPaths = list(asUserPaths)
+            jOS.dictPaths = {asUserPaths[0]: "mario", asUserPaths[1]: "anna"}
+            jOS.nSearchWait = 900
+            
+            # Test 19.1: Senza watch ogni ciclo scandisce tutti i path
+            print("\nTest 19.1: Polling senza watch")
+            assert jOS.Search() == "" and not jOS.jInbox.List(INBOX_QUEUED), "Prima scansione"
+            JobsIni(asUserPaths[1])
+            assert jOS.Search() == "", "Search"
+            assert len(jOS.jInbox.List(INBOX_QUEUED)) == 1, "jobs.ini non trovato senza watch"
+            assert not os.path.exists(os.path.join(asUserPaths[1], "jobs.ini")), "jobs.ini non spostato"
+            print("  OK")
+            
+            # Test 19.2: Con watch solo i path segnalati, scansione completa ogni SEARCH.WAIT
+            print("\nTest 19.2: Watch e SEARCH.WAIT")
+            jOS.jWatch = aiSys.acWatch()
+            assert jOS.jWatch.Start([asUserPaths[0]], ["jobs.ini"]) == "", "Start watch"
+            if jOS.jWatch.asPathsPoll:
+                print("  inotify non disponibile, test saltato")
+            else:
+                jOS.bSearchFull = True
+                jOS.Search()
+                JobsIni(asUserPaths[1])           # Path non osservato
+                assert jOS.Search() == "" and len(jOS.jInbox.List(INBOX_QUEUED)) == 1, \
+                    "Path non osservato scandito prima di SEARCH.WAIT"
+                JobsIni(asUserPaths[0])           # Path osservato
+                assert jOS.jWatch.Wait(2), "Evento non ricevuto"
+                jOS.Search()
+                assert len(jOS.jInbox.List(INBOX_QUEUED)) == 2, "jobs.ini del path osservato non trovato"
+                jOS.nSearchTime -= 901
+                jOS.Search()
+                assert len(jOS.jInbox.List(INBOX_QUEUED)) == 3, "Scansione completa dopo SEARCH.WAIT"
+            jOS.jWatch.End()
+            jOS.jWatch = None
+            print("  OK")
+            
+            # Test 19.3: Attesa adattiva e risveglio
+            print("\nTest 19.3: CycleEnd")
+            jOS.nCycleWait = 4
+            jOS.nCycleWaitNext = 0
+            jOS.bCycleWork = True
+            jOS.CycleEnd()
+            assert jOS.nCycleWaitNext == 0, "Attesa dopo un ciclo con lavoro"
+            threading.Timer(0.2, jOS.CycleWake).start()
+            tsStart = time.monotonic()
+            jOS.CycleEnd()
+            nElapsed = time.monotonic() - tsStart
+            assert jOS.nCycleWaitNext == 1 and nElapsed < 0.9, f"Attesa {jOS.nCycleWaitNext}, {nElapsed:.2f}s"
+            anWaits = []
+            for _ in range(3):
+                jOS.CycleWake()               # Attesa interrotta subito
+                jOS.CycleEnd()
+                anWaits.append(jOS.nCycleWaitNext)
+            assert anWaits == [2, 4, 4], f"Attese: {anWaits}"
+            print(f"  OK: {nElapsed:.2f}s")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        if jOS is not None:
+            if jOS.jWatch is not None:
+                jOS.jWatch.End()
+            if jOS.jInbox is not None:
+                jOS.jInbox.End()
+            jOS.jLog.End()
+    
+    return test_passed
+
+
+def test_acJobsResident() -> bool:
+    """Test per acJobsResident.py e acJobsApp.Serve (protocollo --serve)"""
+    print("\n" + "=" * 60)
+    print("Test 20: File acJobsResident.py, NomeTest: Worker residenti")
+    print("=" * 60)
+    
+    import io
+    from acJobsAction import acJobsAction
+    from acJobsResident import acJobsResident
+    from acJobsApp import acJobsApp
+    
+    test_passed = True
+    jResident = None
+    asArgv = list(sys.argv)
+    hStdout = sys.stdout
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            # Worker che risponde con i parametri e le sezioni ricevute
+            sScript = os.path.join(sDir, "echo.py")
+            with open(sScript, 'w', encoding='utf-8') as hFile:
+                hFile.write(f"#!{sys.executable}\n"
+                            "import sys, json, os\n"
+                            "for sLine in sys.stdin:\n"
+                            "    d = json.loads(sLine)\n"
+                            "    s = d['params'] + '|' + ','.join(sorted(d['ini'])) + '|' + d['ini']['J1'].get('X', '')\n"
+                            "    t = 'E' if 'errore' in d['params'] else 'S'\n"
+                            "    print(json.dumps({'id': d['id'], 'code': 0, 'end': {'J1': {'RETURN.TYPE': t, 'RETURN.VALUE': s}}}), flush=True)\n")
+            os.chmod(sScript, 0o755)
+            sJobPath = os.path.join(sDir, "job")
+            os.makedirs(sJobPath)
+            
+            # Test 20.1: Job residente, ntjobsapp.ini non scritto, ACT_PARAMS nella richiesta
+            print("\nTest 20.1: Job residente")
+            jOS = JobsTestOS(sDir, {"NAME": "test", "TIMEOUT": "60"})
+            jResident = jOS.jResident = acJobsResident()
+            assert jResident.Start(sDir) == "", "Start"
+            jOS.sJobsPath = sJobPath
+            jOS.sJob = "J1"
+            jOS.sAction = "TEST"
+            jOS.dictJob = {"ACTION": "TEST", "X": "$NAME"}
+            jOS.jAction = acJobsAction({"ACT_ID": "TEST", "ACT_SCRIPT": sScript, "ACT_RESIDENT": "True",
+                                        "ACT_PARAMS": "ntjobsapp.ini --modo 'due parole'"}, {})
+            assert jOS.JobIsResident(), "Azione non residente"
+            assert jOS.JobPrepare() == "", "JobPrepare"
+            assert not os.path.exists(os.path.join(sJobPath, "ntjobsapp.ini")), "ntjobsapp.ini scritto per job residente"
+            sResult, sValue = jOS.JobResident()
+            assert sResult == "", f"JobResident: {sResult}"
+            assert sValue == "ntjobsapp.ini --modo 'due parole'|CONFIG,J1|test", f"Risposta: {sValue}"
+            assert os.path.exists(os.path.join(sJobPath, "ntjobsapp.end")), "ntjobsapp.end non scritto"
+            print("  OK")
+            
+            # Test 20.2: Errore del job e worker riusato
+            print("\nTest 20.2: Errore del job")
+            nPid = jResident.dictWorkers["TEST"]["proc"].pid
+            jOS.jAction = acJobsAction({"ACT_ID": "TEST", "ACT_SCRIPT": sScript, "ACT_RESIDENT": "True",
+                                        "ACT_PARAMS": "errore"}, {})
+            sResult, sValue = jOS.JobResident()
+            assert "errore|CONFIG,J1|test" in sResult, f"Errore non riportato: {sResult}"
+            assert jResident.dictWorkers["TEST"]["proc"].pid == nPid, "Worker riavviato"
+            jResident.End()
+            jOS.jLog.End()
+            print("  OK")
+            
+            # Test 20.3: Serve, parametri in sys.argv durante Run e richieste non valide
+            print("\nTest 20.3: acJobsApp.Serve")
+            jApp = acJobsApp()
+            jApp.sLogFile = os.path.join(sDir, "serve")
+            asSeen = []
+            def Callback(dictJob):
+                asSeen.append(list(sys.argv[1:]))
+                jApp.Return("", dictJob.get("X", ""))
+                return ""
+            dictIni = {"CONFIG": {"NAME": "test", "TYPE": "NTJOBS.APP.TEST", "V": "valore"},
+                       "J1": {"COMMAND": "PROVA", "X": "valore"}}
+            asRequests = [
+                json.dumps({"id": 1, "cwd": sJobPath, "params": "a 'b c'", "ini": dictIni}),
+                "non json",
+                json.dumps({"id": 3, "cwd": sJobPath, "params": "'aperto", "ini": dictIni}),
+                json.dumps({"id": 4, "cwd": sJobPath, "ini": {}}),
+            ]
+            hOut = io.StringIO()
+            sCwd = os.getcwd()
+            try:
+                assert jApp.Serve(Callback, io.StringIO("\n".join(asRequests) + "\n"), hOut) == 0, "Serve"
+            finally:
+                sys.stdout = hStdout
+                os.chdir(sCwd)
+            adictResponses = [json.loads(sLine) for sLine in hOut.getvalue().splitlines()]
+            assert [d["id"] for d in adictResponses] == [1, None, 3, 4], f"Id: {adictResponses}"
+            dictEnd = adictResponses[0]["end"]
+            assert adictResponses[0]["code"] == 0 and dictEnd["J1"]["RETURN.VALUE"] == "valore", f"Risposta: {dictEnd}"
+            assert asSeen == [["a", "b c"]], f"sys.argv durante Run: {asSeen}"
+            assert sys.argv == asArgv, "sys.argv non ripristinato"
+            assert adictResponses[1]["code"] == 1, "Richiesta non JSON"
+            assert adictResponses[2]["code"] == 2 and "Parametri non validi" in \
+                adictResponses[2]["end"]["CONFIG"]["RETURN.VALUE"], f"Parametri non validi: {adictResponses[2]}"
+            assert adictResponses[3]["code"] == 1, "Richiesta senza jobs"
+            assert not os.path.exists(os.path.join(sJobPath, "ntjobsapp.ini")), "File .ini scritto da Serve"
+            jApp.jLog.End()
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        sys.argv = asArgv
+        sys.stdout = hStdout
+        if jResident is not None:
+            jResident.End()
+    
+    return test_passed
+
+
+def test_acJobsStartReload() -> bool:
+    """Test per acJobsStart.py (ricarica delle tabelle CSV e dei path osservati)"""
+    print("\n" + "=" * 60)
+    print("Test 21: File acJobsStart.py, NomeTest: Ricarica tabelle CSV")
+    print("=" * 60)
+    
+    test_passed = True
+    jOS = None
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            asUserPaths = [os.path.join(sDir, f"utente{n}") for n in range(3)]
+            for sPath in asUserPaths:
+                os.makedirs(sPath)
+            
+            def CsvWrite(sName, asLines):
+                with open(os.path.join(sDir, sName), 'w', encoding='utf-8') as hFile:
+                    hFile.write("\n".join(asLines) + "\n")
+            
+            def UsersWrite(asUsers):
+                CsvWrite("ntjobs_users.csv", ["USER;USER_NAME;USER_NOTES;USER_GROUPS;USER_PATHS;USER_MAIL"] +
+                         [f"{sUser};Utente;;{sGroup};{sPath};{sUser}@x.it" for sUser, sGroup, sPath in asUsers])
+            
+            CsvWrite("ntjobs_groups.csv", ["GROUP_ID;GROUP_NAME;GROUP_NOTES", "ADMIN;Amministratori;", "BASE;Utenti;"])
+            CsvWrite("ntjobs_actions.csv", ["ACT_ID;ACT_NAME;ACT_GROUPS;ACT_SCRIPT;ACT_ENABLED;ACT_PATH;ACT_HELP;ACT_TIMEOUT",
+                                            "TEST;Prova;BASE;test.sh;True;;;60"])
+            UsersWrite([("mario", "ADMIN", asUserPaths[0]), ("anna", "BASE", asUserPaths[1])])
+            
+            jOS = JobsTestOS(sDir, {"SNAPSHOT": "False"})
+            jOS.sSys_PathRoot = sDir
+            assert jOS.JobsStart_ReadDat() == "", "ReadDat"
+            jOS.JobsStart_Index()
+            jOS.JobsStart_ReadPaths()
+            jOS.jWatch = aiSys.acWatch()
+            jOS.jWatch.Start(jOS.asPaths, ["jobs.ini"])
+            bInotify = not jOS.jWatch.asPathsPoll
+            
+            # Test 21.1: Tabelle non modificate, nessuna ricarica
+            print("\nTest 21.1: Nessuna modifica")
+            dictUsers = jOS.JOBS_TAB_USERS
+            assert jOS.JobsReload() == "" and jOS.JOBS_TAB_USERS is dictUsers, "Ricarica senza modifiche"
+            print("  OK")
+            
+            # Test 21.2: Utenti modificati, path osservati aggiornati
+            print("\nTest 21.2: Ricarica utenti")
+            UsersWrite([("mario", "ADMIN", asUserPaths[0]), ("luigi", "BASE", asUserPaths[2])])
+            jOS.bSearchFull = False
+            assert jOS.JobsReload() == "", "JobsReload"
+            assert sorted(jOS.JOBS_TAB_USERS) == ["luigi", "mario"], f"Utenti: {list(jOS.JOBS_TAB_USERS)}"
+            assert jOS.dictPaths == {asUserPaths[0]: "mario", asUserPaths[2]: "luigi"}, f"Path: {jOS.dictPaths}"
+            assert jOS.dictUsersMask["luigi"] == jOS.dictGroupsBit["BASE"], "Indici non ricalcolati"
+            assert jOS.bSearchFull, "Scansione completa non richiesta"
+            asObserved = sorted(set(jOS.jWatch.dictWd.values()) | set(jOS.jWatch.asPathsPoll))
+            assert asObserved == [asUserPaths[0], asUserPaths[2]], f"Path osservati: {asObserved}"
+            if bInotify:
+                assert len(jOS.jWatch.dictWd) == 2, f"Watch descriptor: {jOS.jWatch.dictWd}"
+                with open(os.path.join(asUserPaths[1], "jobs.ini"), 'w') as hFile:
+                    hFile.write("[CONFIG]\n")
+                with open(os.path.join(asUserPaths[2], "jobs.ini"), 'w') as hFile:
+                    hFile.write("[CONFIG]\n")
+                jOS.jWatch.Wait(1)
+                assert jOS.jWatch.Events() == [asUserPaths[2]], "Eventi del path rimosso"
+            print("  OK")
+            
+            # Test 21.3: Tabella non corretta, restano le precedenti
+            print("\nTest 21.3: Tabella non corretta")
+            UsersWrite([("mario", "NESSUNO", asUserPaths[0])])
+            sResult = jOS.JobsReload()
+            assert "Tabelle non ricaricate" in sResult, f"Errore non segnalato: {sResult}"
+            assert sorted(jOS.JOBS_TAB_USERS) == ["luigi", "mario"], "Tabella precedente non mantenuta"
+            assert jOS.JobsReload() == "", "Ricarica ripetuta dello stesso file errato"
+            UsersWrite([("mario", "BASE", asUserPaths[0])])
+            assert jOS.JobsReload() == "" and list(jOS.JOBS_TAB_USERS) == ["mario"], "Ricarica dopo la correzione"
+            assert list(jOS.dictPaths) == [asUserPaths[0]], f"Path: {jOS.dictPaths}"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        if jOS is not None:
+            if jOS.jWatch is not None:
+                jOS.jWatch.End()
+            jOS.jLog.End()
+    
+    return test_passed
+
+
+def SmtpTestServer(sDir: str) -> Any:
+    """
+    Server SMTP minimo per i test, in un thread: accetta ogni mittente e
+    destinatario e salva ogni messaggio ricevuto in sDir (msg_N.eml), senza
+    tenerlo in memoria. Conta connessioni e NOOP; Drop chiude le connessioni.
+    """
+    import socket
+    import socketserver
+    import threading
+    
+    class acSmtpHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            jServer = self.server
+            jServer.nConnections += 1
+            jServer.ajSockets.append(self.connection)
+            self.wfile.write(b"220 test ESMTP\r\n")
+            try:
+                for bufLine in self.rfile:
+                    sCmd = bufLine[:4].decode("ascii", "replace").upper()
+                    if sCmd == "EHLO":
+                        self.wfile.write(b"250-test\r\n250 8BITMIME\r\n")
+                    elif sCmd == "NOOP":
+                        jServer.nNoop += 1
+                        self.wfile.write(b"250 OK\r\n")
+                    elif sCmd == "DATA":
+                        self.wfile.write(b"354 Fine con .\r\n")
+                        jServer.nMessages += 1
+                        sFile = os.path.join(sDir, f"msg_{jServer.nMessages}.eml")
+                        with open(sFile, 'wb') as hFile:
+                            for bufData in self.rfile:
+                                if bufData == b".\r\n":
+                                    break
+                                hFile.write(bufData[1:] if bufData.startswith(b"..") else bufData)
+                        self.wfile.write(b"250 Accettato\r\n")
+                    elif sCmd == "QUIT":
+                        self.wfile.write(b"221 Bye\r\n")
+                        return
+                    else:
+                        self.wfile.write(b"250 OK\r\n")
+            except OSError:
+                pass
+    
+    class acSmtpServer(socketserver.ThreadingTCPServer):
+        daemon_threads = True
+        allow_reuse_address = True
+        
+        def Drop(self):
+            for jSocket in self.ajSockets:
+                try:
+                    jSocket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self.ajSockets = []
+        
+        def Connect(self, jMail):
+            """Collega jMail (NC_MailSimple) al server senza STARTTLS e login."""
+            import smtplib
+            import time
+            jMail.smtp = smtplib.SMTP("127.0.0.1", self.server_address[1], timeout=5)
+            jMail.bLogin = True
+            jMail.tsLastUse = time.monotonic()
+            jMail.sSmtp_User = "ntjobs@x.it"
+    
+    jServer = acSmtpServer(("127.0.0.1", 0), acSmtpHandler)
+    jServer.nConnections = 0
+    jServer.nNoop = 0
+    jServer.nMessages = 0
+    jServer.ajSockets = []
+    threading.Thread(target=jServer.serve_forever, daemon=True).start()
+    return jServer
+
+
+def test_acJobsMailSmtp() -> bool:
+    """Test per acJobsMail.py e ncMailSimple.py (connessione SMTP riusata, coda)"""
+    print("\n" + "=" * 60)
+    print("Test 22: File acJobsMail.py, NomeTest: Connessione SMTP riusata")
+    print("=" * 60)
+    
+    import time
+    import email
+    from ncMailSimple import NC_MailSimple
+    from acJobsMailQueue import acJobsMailQueue
+    
+    test_passed = True
+    jServer = None
+    jQueue = None
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            jServer = SmtpTestServer(sDir)
+            jOS = JobsTestOS(sDir)
+            jOS.sMailEngine = "SMTP"
+            jOS.jMail = NC_MailSimple()
+            jServer.Connect(jOS.jMail)
+            
+            # Test 22.1: Invii sulla stessa connessione, NOOP solo dopo MAIL.IDLE
+            print("\nTest 22.1: Connessione riusata")
+            for nMail in range(3):
+                assert jOS.JobsMail("a@x.it", f"Oggetto {nMail}", f"Testo {nMail}") == "", f"Invio {nMail}"
+            assert jServer.nMessages == 3 and jServer.nConnections == 1, \
+                f"Messaggi {jServer.nMessages}, connessioni {jServer.nConnections}"
+            assert jServer.nNoop == 0, f"NOOP su connessione appena usata: {jServer.nNoop}"
+            jOS.jMail.nIdleCheck = 0
+            assert jOS.JobsMail("a@x.it", "Dopo attesa", "Testo") == "", "Invio dopo attesa"
+            assert jServer.nNoop == 1 and jServer.nConnections == 1, f"NOOP {jServer.nNoop}"
+            with open(os.path.join(sDir, "msg_2.eml"), 'rb') as hFile:
+                jMsg = email.message_from_bytes(hFile.read())
+            assert jMsg["Subject"] == "Oggetto 1" and jMsg["To"] == "a@x.it", "Messaggio ricevuto"
+            print("  OK")
+            
+            # Test 22.2: Connessione caduta, invio fallito e connessione chiusa
+            print("\nTest 22.2: Connessione caduta")
+            jOS.jMail.nIdleCheck = 60
+            jOS.jMail.bReconnect = False
+            jServer.Drop()
+            time.sleep(0.1)
+            assert jOS.JobsMail("a@x.it", "Persa", "Testo") != "", "Invio su connessione caduta riuscito"
+            assert not jOS.jMail.bLogin, "Connessione non chiusa dopo l'errore"
+            assert "non attiva" in jOS.JobsMail("a@x.it", "Persa", "Testo"), "Riconnessione non richiesta"
+            print("  OK")
+            
+            # Test 22.3: Coda, nuovi tentativi con attesa doppia e invio alla riconnessione
+            print("\nTest 22.3: Coda con nuovi tentativi")
+            jQueue = jOS.jMailQueue = acJobsMailQueue()
+            assert jQueue.Start(os.path.join(sDir, "spool"), jOS.JobsMailSend, nRetryMax=5, nRetryWait=1) == "", "Start"
+            assert jOS.JobsMail("a@x.it", "In coda", "Testo") == "", "Accodamento"
+            # Orari dei nuovi tentativi: 1 secondo dopo il primo errore, 2 dopo il secondo
+            anNext = [time.time()]
+            tsEnd = time.monotonic() + 5
+            while len(anNext) < 3 and time.monotonic() < tsEnd:
+                for sName in list(jQueue.dictPending):
+                    dictMail = jQueue.MailRead(sName)
+                    if dictMail and dictMail["try"] == len(anNext):
+                        anNext.append(dictMail["next"])
+                time.sleep(0.05)
+            anWaits = [round(nNext - nPrev, 1) for nPrev, nNext in zip(anNext, anNext[1:])]
+            assert len(anWaits) == 2 and abs(anWaits[0] - 1) < 0.3 and abs(anWaits[1] - 2) < 0.3, \
+                f"Attese fra i tentativi: {anWaits}"
+            jServer.Connect(jOS.jMail)
+            tsEnd = time.monotonic() + 5
+            while jServer.nMessages < 5 and time.monotonic() < tsEnd:
+                time.sleep(0.05)
+            assert jServer.nMessages == 5, f"Mail in coda non inviata: {jServer.nMessages}"
+            assert not jQueue.dictPending, "Mail ancora in coda"
+            jOS.jLog.End()
+            print(f"  OK: attese {anWaits}")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        if jQueue is not None:
+            jQueue.End()
+        if jServer is not None:
+            jServer.shutdown()
+            jServer.server_close()
+    
+    return test_passed
+
+
+def test_ncMailSimpleStream() -> bool:
+    """Test per ncMailSimple.py (allegati codificati a blocchi nel comando DATA)"""
+    print("\n" + "=" * 60)
+    print("Test 23: File ncMailSimple.py, NomeTest: Allegati in streaming")
+    print("=" * 60)
+    
+    import gzip
+    import email
+    import tracemalloc
+    from ncMailSimple import NC_MailSimple
+    
+    test_passed = True
+    jServer = None
+    
+    def Attachments(sFile):
+        with open(sFile, 'rb') as hFile:
+            jMsg = email.message_from_bytes(hFile.read())
+        return jMsg, {jPart.get_filename(): jPart.get_payload(decode=True)
+                      for jPart in jMsg.walk() if jPart.get_filename()}
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sDirMsg = os.path.join(sDir, "ricevuti")
+            os.makedirs(sDirMsg)
+            jServer = SmtpTestServer(sDirMsg)
+            jMail = NC_MailSimple()
+            jServer.Connect(jMail)
+            jMail.nStreamSize = 1048576
+            
+            bufBig = os.urandom(3 * 1048576 + 17)
+            sFileBig = os.path.join(sDir, "grande.bin")
+            with open(sFileBig, 'wb') as hFile:
+                hFile.write(bufBig)
+            sFileSmall = os.path.join(sDir, "piccolo.txt")
+            with open(sFileSmall, 'wb') as hFile:
+                hFile.write(b"riga\n" * 100)
+            sBody = "Prima riga\n.riga con punto\n..due punti\nfine"
+            
+            # Test 23.1: Streaming, allegati integri e memoria limitata
+            print("\nTest 23.1: Allegati oltre nStreamSize")
+            tracemalloc.start()
+            sResult = jMail.Send(["a@x.it"], "Grande", [sFileBig, sFileSmall], "TXT", sBody)
+            _, nPeak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert sResult == "", f"Send: {sResult}"
+            assert any("streaming" in sLine for sLine in jMail.asLogging), "Invio non in streaming"
+            jMsg, dictFiles = Attachments(os.path.join(sDirMsg, "msg_1.eml"))
+            assert dictFiles.get("grande.bin") == bufBig, "Allegato grande alterato"
+            assert dictFiles.get("piccolo.txt") == b"riga\n" * 100, "Allegato piccolo alterato"
+            sText = [jPart for jPart in jMsg.walk() if jPart.get_content_type() == "text/plain"][0].get_payload(decode=True)
+            assert sText.decode().replace("\r\n", "\n") == sBody, f"Testo alterato: {sText!r}"
+            assert nPeak < len(bufBig) // 2, f"Memoria usata {nPeak} per allegato di {len(bufBig)}"
+            print(f"  OK: picco {nPeak // 1024} KB per {len(bufBig) // 1024} KB")
+            
+            # Test 23.2: Compressione gzip oltre nZipSize
+            print("\nTest 23.2: Allegato compresso")
+            jMail.nZipSize = 100
+            assert jMail.Send(["a@x.it"], "Zip", [sFileSmall], "TXT", "Testo") == "", "Send zip"
+            _, dictFiles = Attachments(os.path.join(sDirMsg, "msg_2.eml"))
+            assert list(dictFiles) == ["piccolo.txt.gz"], f"Allegati: {list(dictFiles)}"
+            assert gzip.decompress(dictFiles["piccolo.txt.gz"]) == b"riga\n" * 100, "Allegato compresso alterato"
+            print("  OK")
+            
+            # Test 23.3: Allegati piccoli, invio in un solo messaggio in memoria
+            print("\nTest 23.3: Allegati sotto nStreamSize")
+            jMail.nZipSize = 0
+            assert jMail.Send(["a@x.it"], "Piccolo", [sFileSmall], "TXT", "Testo") == "", "Send"
+            _, dictFiles = Attachments(os.path.join(sDirMsg, "msg_3.eml"))
+            assert dictFiles == {"piccolo.txt": b"riga\n" * 100}, "Allegato non in streaming"
+            assert jServer.nConnections == 1, f"Connessioni: {jServer.nConnections}"
+            assert "non trovato" in jMail.Send(["a@x.it"], "Manca", [sFileBig + ".x"], "TXT", ""), "File mancante"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        if jServer is not None:
+            jServer.shutdown()
+            jServer.server_close()
+    
+    return test_passed
+
+
+def test_acJobsStartSnapshot() -> bool:
+    """Test per acJobsStart.py (snapshot delle tabelle verificate per l'avvio a caldo)"""
+    print("\n" + "=" * 60)
+    print("Test 24: File acJobsStart.py, NomeTest: Snapshot delle tabelle")
+    print("=" * 60)
+    
+    test_passed = True
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sPathUser = os.path.join(sDir, "utente")
+            os.makedirs(sPathUser)
+            sFileSnap = os.path.join(sDir, "ntjobs_snapshot.pkl")
+            sFileUsers = os.path.join(sDir, "ntjobs_users.csv")
+            
+            def CsvWrite(sName, asLines):
+                with open(os.path.join(sDir, sName), 'w', encoding='utf-8') as hFile:
+                    hFile.write("\n".join(asLines) + "\n")
+            
+            def UsersWrite(sUser):
+                CsvWrite("ntjobs_users.csv", ["USER;USER_NAME;USER_NOTES;USER_GROUPS;USER_PATHS;USER_MAIL",
+                                              f"{sUser};Utente;;BASE;{sPathUser};{sUser}@x.it"])
+            
+            def TestOS(dictConfig=None):
+                jOS = JobsTestOS(sDir, dictConfig)
+                jOS.sSys_PathRoot = sDir
+                return jOS
+            
+            def ReadAll(jOS):
+                assert jOS.JobsStart_ReadDat() == "", "ReadDat"
+                assert jOS.JobsStart_ReadPaths() == "", "ReadPaths"
+            
+            CsvWrite("ntjobs_groups.csv", ["GROUP_ID;GROUP_NAME;GROUP_NOTES", "ADMIN;Amministratori;", "BASE;Utenti;"])
+            CsvWrite("ntjobs_actions.csv", ["ACT_ID;ACT_NAME;ACT_GROUPS;ACT_SCRIPT;ACT_ENABLED;ACT_PATH;ACT_HELP;ACT_TIMEOUT",
+                                            "TEST;Prova;BASE;test.sh;True;;;60"])
+            UsersWrite("mario")
+            
+            # Test 24.1: Snapshot salvato e ricaricato con le stesse tabelle
+            print("\nTest 24.1: Salvataggio e caricamento")
+            jOS = TestOS()
+            assert not jOS.JobsStart_SnapshotLoad(), "Snapshot inesistente caricato"
+            ReadAll(jOS)
+            jOS.JobsStart_SnapshotSave()
+            assert os.path.isfile(sFileSnap) and not os.path.exists(sFileSnap + ".tmp"), "Snapshot non salvato"
+            jOS2 = TestOS()
+            assert jOS2.JobsStart_SnapshotLoad(), "Snapshot non caricato"
+            assert jOS2.JOBS_TAB_USERS == jOS.JOBS_TAB_USERS, "Utenti diversi"
+            assert jOS2.JOBS_TAB_ACTIONS == jOS.JOBS_TAB_ACTIONS, "Azioni diverse"
+            assert jOS2.asGroups == ["ADMIN", "BASE"], f"Chiavi gruppi: {jOS2.asGroups}"
+            assert jOS2.dictPaths == {sPathUser: "mario"} and jOS2.asPaths == [sPathUser], f"Path: {jOS2.dictPaths}"
+            assert jOS2.dictDatStat == jOS.dictDatStat, "Stat delle tabelle diverse"
+            print("  OK")
+            
+            # Test 24.2: CSV modificato con stessi mtime e dimensione, rilevato dall'hash
+            print("\nTest 24.2: Invalidazione")
+            jStat = os.stat(sFileUsers)
+            UsersWrite("anna_")
+            assert os.path.getsize(sFileUsers) == jStat.st_size, "Dimensione diversa"
+            os.utime(sFileUsers, ns=(jStat.st_atime_ns, jStat.st_mtime_ns))
+            assert not TestOS().JobsStart_SnapshotLoad(), "Snapshot non aggiornato caricato"
+            os.remove(os.path.join(sDir, "ntjobs_groups.csv"))
+            assert not TestOS().JobsStart_SnapshotLoad(), "Snapshot caricato con CSV mancante"
+            CsvWrite("ntjobs_groups.csv", ["GROUP_ID;GROUP_NAME;GROUP_NOTES", "ADMIN;Amministratori;", "BASE;Utenti;"])
+            print("  OK")
+            
+            # Test 24.3: CSV modificato durante la lettura, nessuno snapshot
+            print("\nTest 24.3: Modifica durante la lettura")
+            os.remove(sFileSnap)
+            jOS = TestOS()
+            ReadAll(jOS)
+            UsersWrite("luigi_lungo")
+            jOS.JobsStart_SnapshotSave()
+            assert not os.path.exists(sFileSnap), "Snapshot salvato con dati non aggiornati"
+            print("  OK")
+            
+            # Test 24.4: Snapshot non leggibile o disattivato
+            print("\nTest 24.4: Snapshot non leggibile, SNAPSHOT=False")
+            with open(sFileSnap, 'wb') as hFile:
+                hFile.write(b"non pickle")
+            assert not TestOS().JobsStart_SnapshotLoad(), "Snapshot non leggibile caricato"
+            os.remove(sFileSnap)
+            jOS = TestOS({"SNAPSHOT": "False"})
+            ReadAll(jOS)
+            jOS.JobsStart_SnapshotSave()
+            assert not os.path.exists(sFileSnap), "Snapshot salvato con SNAPSHOT=False"
+            jOS = TestOS()
+            ReadAll(jOS)
+            jOS.JobsStart_SnapshotSave()
+            assert TestOS().JobsStart_SnapshotLoad(), "Snapshot valido non caricato"
+            assert not TestOS({"SNAPSHOT": "False"}).JobsStart_SnapshotLoad(), "Snapshot caricato con SNAPSHOT=False"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    
+    return test_passed
+
+
+def test_acJobsActionMask() -> bool:
+    """Test per acJobsAction.py (maschere di bit dei gruppi e permessi delle azioni)"""
+    print("\n" + "=" * 60)
+    print("Test 25: File acJobsAction.py, NomeTest: Maschere dei gruppi")
+    print("=" * 60)
+    
+    from acJobsAction import acJobsAction, GroupsMask
+    
+    test_passed = True
+    
+    try:
+        # Test 25.1: Maschere dei gruppi
+        print("\nTest 25.1: GroupsMask")
+        dictBit = {"ADMIN": 1, "BASE": 2}
+        assert GroupsMask("ADMIN, BASE", dictBit) == 3, "Maschera di due gruppi"
+        assert GroupsMask("", dictBit) == 0, "Maschera senza gruppi"
+        assert GroupsMask("BASE,NUOVO", dictBit) == 2 | 4 and dictBit["NUOVO"] == 4, f"Gruppo nuovo: {dictBit}"
+        dictBit = {f"G{n}": 1 << n for n in range(70)}
+        assert GroupsMask("G0,G69", dictBit) == 1 | (1 << 69), "Oltre 64 gruppi"
+        print("  OK")
+        
+        # Test 25.2: Permessi del record azione
+        print("\nTest 25.2: isAllowed")
+        dictBit = {"ADMIN": 1, "BASE": 2, "ALTRO": 4}
+        jAction = acJobsAction({"ACT_ID": "A", "ACT_GROUPS": "ADMIN,ALTRO", "ACT_ENABLED": "True"}, dictBit)
+        assert jAction.isAllowed(1) and jAction.isAllowed(4 | 2), "Gruppo in comune non ammesso"
+        assert not jAction.isAllowed(2) and not jAction.isAllowed(0), "Gruppo non in comune ammesso"
+        jAction = acJobsAction({"ACT_ID": "B", "ACT_GROUPS": "", "ACT_ENABLED": "True"}, dictBit)
+        assert jAction.isAllowed(0) and jAction.isAllowed(2), "Azione senza gruppi non ammessa"
+        print("  OK")
+        
+        # Test 25.3: Login e verifica dell'azione con gli indici delle tabelle
+        print("\nTest 25.3: JobsUserLogin e JobAction")
+        with tempfile.TemporaryDirectory() as sDir:
+            jOS = JobsTestOS(sDir)
+            jOS.JobsStart_SetTab("JOBS_TAB_GROUPS", {"ADMIN": {"GROUP_ID": "ADMIN"}, "BASE": {"GROUP_ID": "BASE"}})
+            jOS.JobsStart_SetTab("JOBS_TAB_USERS", {
+                "mario": {"USER": "mario", "USER_GROUPS": "ADMIN,BASE"},
+                "anna": {"USER": "anna", "USER_GROUPS": "BASE"},
+                "ugo": {"USER": "ugo", "USER_GROUPS": ""}})
+            jOS.JobsStart_SetTab("JOBS_TAB_ACTIONS", {
+                "RISERVATA": {"ACT_ID": "RISERVATA", "ACT_GROUPS": "ADMIN", "ACT_ENABLED": "True", "ACT_SCRIPT": "r.sh"},
+                "LIBERA": {"ACT_ID": "LIBERA", "ACT_GROUPS": "", "ACT_ENABLED": "True", "ACT_SCRIPT": "l.sh"}})
+            jOS.JobsStart_Index()
+            assert jOS.dictUsersMask == {"mario": 3, "anna": 2, "ugo": 0}, f"Maschere utenti: {jOS.dictUsersMask}"
+            
+            def Check(sUser, sAction):
+                jOS.dictJobs = {"CONFIG": {"USER": sUser}}
+                assert jOS.JobsUserLogin() == "", f"Login {sUser}"
+                jOS.dictJob = {"ACTION": sAction}
+                sResult = jOS.JobAction()
+                jOS.JobsUserLogoff()
+                return sResult
+            
+            assert Check("mario", "RISERVATA") == "", "Azione negata al gruppo ADMIN"
+            assert "gruppi incompatibili" in Check("anna", "RISERVATA"), "Azione ammessa al gruppo BASE"
+            assert "gruppi incompatibili" in Check("ugo", "RISERVATA"), "Azione ammessa senza gruppi"
+            assert Check("ugo", "LIBERA") == "" and Check("anna", "LIBERA") == "", "Azione per tutti negata"
+            assert jOS.nUserGroups == 0, "Maschera non azzerata al logoff"
+        print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    
+    return test_passed
+
+
+def test_acJobsBilling() -> bool:
+    """Test per acJobsBilling.py (scrittura bufferizzata, header e rotazione)"""
+    print("\n" + "=" * 60)
+    print("Test 26: File acJobsBilling.py, NomeTest: Billing bufferizzato")
+    print("=" * 60)
+    
+    import time
+    import threading
+    from acJobsBilling import acJobsBilling
+    
+    test_passed = True
+    asBills = []
+    asHeader = ["USER", "ACTION", "NOTES"]
+    
+    def Lines(sFile):
+        with open(sFile, 'r', encoding='utf-8') as hFile:
+            return hFile.read().splitlines()
+    
+    def BillStart(sFile, **kwargs):
+        jBill = acJobsBilling()
+        asBills.append(jBill)
+        sResult = jBill.Start(sFile, asHeader, **kwargs)
+        assert sResult == "", f"Start: {sResult}"
+        return jBill
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sFile = os.path.join(sDir, "bill", "billing.csv")
+            
+            # Test 26.1: Header e scrittura a blocchi di nFlushRecords
+            print("\nTest 26.1: Header e soglia dei record")
+            jBill = BillStart(sFile, nFlushRecords=3, nFlushTime=60, bSync=False)
+            assert Lines(sFile) == ["USER;ACTION;NOTES"], "Header non scritto"
+            jBill.Write({"USER": "mario", "ACTION": "A1"})
+            jBill.Write({"USER": "anna", "ACTION": "A2", "NOTES": "con spazi"})
+            assert len(Lines(sFile)) == 1, "Record scritti prima della soglia"
+            assert jBill.Write({"USER": "ugo", "ACTION": "A3"}) == "", "Write"
+            assert Lines(sFile) == ["USER;ACTION;NOTES", "mario;A1;", 'anna;A2;"con spazi"', "ugo;A3;"], \
+                f"Righe: {Lines(sFile)}"
+            print("  OK")
+            
+            # Test 26.2: Scrittura per tempo e a End, header non ripetuto alla riapertura
+            print("\nTest 26.2: Soglia di tempo, End e riapertura")
+            jBill.End()
+            jBill = BillStart(sFile, nFlushRecords=100, nFlushTime=0.2, bSync=True)
+            jBill.Write({"USER": "mario", "ACTION": "A4"})
+            nLimit = time.time() + 3
+            while len(Lines(sFile)) < 5 and time.time() < nLimit:
+                time.sleep(0.05)
+            assert Lines(sFile)[1:] == ["mario;A1;", 'anna;A2;"con spazi"', "ugo;A3;", "mario;A4;"], \
+                f"Record per tempo o header ripetuto: {Lines(sFile)}"
+            jBill.nFlushTime = 60
+            jBill.Write({"USER": "anna", "ACTION": "A5"})
+            assert jBill.End() == "" and Lines(sFile)[-1] == "anna;A5;", "Buffer residuo non scritto a End"
+            print("  OK")
+            
+            # Test 26.3: Rotazione SIZE, file nuovo con header
+            print("\nTest 26.3: Rotazione per dimensione")
+            jBill = BillStart(sFile, nFlushRecords=1, bSync=False, sRotate="size", nRotateSize=50)
+            jBill.Write({"USER": "luigi", "ACTION": "A6"})
+            asRotated = sorted(sName for sName in os.listdir(os.path.dirname(sFile)) if sName != "billing.csv")
+            assert len(asRotated) == 1 and asRotated[0].startswith("billing_"), f"File ruotati: {asRotated}"
+            assert Lines(os.path.join(os.path.dirname(sFile), asRotated[0]))[-1] == "anna;A5;", "File ruotato incompleto"
+            assert Lines(sFile) == ["USER;ACTION;NOTES", "luigi;A6;"], f"Nuovo file: {Lines(sFile)}"
+            jBill.End()
+            print("  OK")
+            
+            # Test 26.4: Rotazione DAY, nome con il giorno senza sovrascrivere
+            print("\nTest 26.4: Rotazione per giorno")
+            for nRotation in range(2):
+                jBill = BillStart(sFile, nFlushRecords=1, bSync=False, sRotate="DAY")
+                jBill.sDay = "20000101"
+                jBill.Write({"USER": "mario", "ACTION": f"D{nRotation}"})
+                jBill.End()
+            sDirBill = os.path.dirname(sFile)
+            assert Lines(os.path.join(sDirBill, "billing_20000101.csv"))[-1] == "luigi;A6;", "Primo file del giorno"
+            assert Lines(os.path.join(sDirBill, "billing_20000101_1.csv")) == ["USER;ACTION;NOTES", "mario;D0;"], \
+                "Secondo file del giorno sovrascritto"
+            assert Lines(sFile) == ["USER;ACTION;NOTES", "mario;D1;"], f"File corrente: {Lines(sFile)}"
+            print("  OK")
+            
+            # Test 26.5: Worker concorrenti, record interi
+            print("\nTest 26.5: Scrittura concorrente")
+            os.remove(sFile)
+            jBill = BillStart(sFile, nFlushRecords=7, bSync=False)
+            
+            def Worker(nWorker):
+                for nRecord in range(250):
+                    jBill.Write({"USER": f"w{nWorker}", "ACTION": f"R{nRecord}"})
+            
+            ajThreads = [threading.Thread(target=Worker, args=(n,)) for n in range(4)]
+            for jThread in ajThreads:
+                jThread.start()
+            for jThread in ajThreads:
+                jThread.join()
+            jBill.End()
+            asLines = Lines(sFile)
+            assert len(asLines) == 1001 and len(set(asLines[1:])) == 1000, f"Record: {len(asLines) - 1}"
+            assert all(sLine.count(";") == 2 for sLine in asLines), "Record interrotti"
+            assert "non valida" in acJobsBilling().Start(sFile, asHeader, sRotate="WEEK"), "Rotazione non valida"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        for jBill in asBills:
+            jBill.End()
+    
+    return test_passed
+
+
+def test_acJobsJobsJournal() -> bool:
+    """Test per acJobsJobs.py (journal jobs.jrn e ripresa di un jobs.ini interrotto)"""
+    print("\n" + "=" * 60)
+    print("Test 27: File acJobsJobs.py, NomeTest: Journal e ripresa")
+    print("=" * 60)
+    
+    from acJobsInbox import acJobsInbox
+    
+    test_passed = True
+    ajOS = []
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sPathJobs = os.path.join(sDir, "jobs_mario")
+            os.makedirs(sPathJobs)
+            sFileJrn = os.path.join(sPathJobs, "jobs.jrn")
+            with open(os.path.join(sPathJobs, "jobs.ini"), 'w', encoding='utf-8') as hFile:
+                hFile.write("[CONFIG]\nUSER = mario\n\n[J1]\nACTION = SYS.A\n\n[J2]\nACTION = SYS.B\n\n[J3]\nACTION = SYS.C\n")
+            
+            def JobsOS():
+                jOS = JobsTestOS(sDir)
+                ajOS.append(jOS)
+                jOS.JobsStart_SetTab("JOBS_TAB_USERS", {"mario": {"USER": "mario", "USER_GROUPS": ""}})
+                sResult = jOS.JobsInit(sPathJobs)
+                assert sResult == "", f"JobsInit: {sResult}"
+                return jOS
+            
+            def JobDone(jOS, sJob, sResult, sValue=""):
+                jOS.sJob = sJob
+                jOS.dictJob = dict(jOS.dictJobs[sJob])
+                jOS.tsJobStart = aiSys.Timestamp()
+                jOS.sAction = jOS.dictJob["ACTION"]
+                jOS.JobEnd(sResult, sValue)
+            
+            def JrnRead():
+                with open(sFileJrn, 'r', encoding='utf-8') as hFile:
+                    return hFile.read()
+            
+            # Test 27.1: Journal aperto con la sola sezione CONFIG
+            print("\nTest 27.1: Apertura del journal")
+            jOS = JobsOS()
+            assert jOS.asJobs == ["J1", "J2", "J3"], f"Jobs: {jOS.asJobs}"
+            _, dictJrn = aiSys.ini_text_to_dict(JrnRead())
+            assert list(dictJrn) == ["CONFIG"], f"Journal iniziale: {list(dictJrn)}"
+            print("  OK")
+            
+            # Test 27.2: Interruzione dopo due jobs, sezione troncata in coda
+            print("\nTest 27.2: Ripresa dopo interruzione")
+            JobDone(jOS, "J1", "", "Primo")
+            JobDone(jOS, "J2", "fallito")
+            jOS.JobsJournalEnd()
+            with open(sFileJrn, 'a', encoding='utf-8') as hFile:
+                hFile.write("[J3]\nACTION = SYS.C\nRETURN.TYPE = S\nRETURN.VAL")
+            jOS = JobsOS()
+            assert jOS.asJobs == ["J3"], f"Jobs da eseguire: {jOS.asJobs}"
+            assert jOS.dictJobs["J1"]["RETURN.VALUE"] == "Primo", f"J1: {jOS.dictJobs['J1']}"
+            assert jOS.dictJobs["J2"]["RETURN.TYPE"] == "E", f"J2: {jOS.dictJobs['J2']}"
+            assert "RETURN.TYPE" not in jOS.dictJobs["J3"], "J3 troncato ripreso come eseguito"
+            _, dictJrn = aiSys.ini_text_to_dict(JrnRead())
+            assert list(dictJrn) == ["CONFIG", "J1", "J2"], f"Journal riscritto: {list(dictJrn)}"
+            print("  OK")
+            
+            # Test 27.3: Seconda interruzione, poi conclusione con tutti i risultati
+            print("\nTest 27.3: Ripresa ripetuta e conclusione")
+            JobDone(jOS, "J3", "", "Terzo")
+            jOS.JobsJournalEnd()
+            jOS = JobsOS()
+            assert jOS.asJobs == [], f"Jobs da eseguire: {jOS.asJobs}"
+            jOS.jInbox = acJobsInbox()
+            assert jOS.jInbox.Start(os.path.join(sDir, "inbox")) == "", "Start inbox"
+            jOS.JobsMailUser = lambda sSubject, sText, sUser="", nDigest=0: ""
+            assert jOS.JobsEnd() == "", "JobsEnd"
+            assert not os.path.exists(sFileJrn), "Journal rimasto"
+            _, dictEnd = aiSys.read_ini_to_dict(os.path.join(sPathJobs, "jobs.end"), bCache=False)
+            assert [dictEnd[sJob]["RETURN.VALUE"] for sJob in ["J1", "J3"]] == ["Primo", "Terzo"], f"jobs.end: {dictEnd}"
+            assert dictEnd["J2"]["RETURN.TYPE"] == "E", "Errore di J2 perso"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        for jOS in ajOS:
+            jOS.JobsJournalEnd()
+            if jOS.jInbox is not None:
+                jOS.jInbox.End()
+    
+    return test_passed
+
+
+def test_acJobsJobsEnd() -> bool:
+    """Test per acJobsJobs.py (jobs.end incrementale con rename atomica)"""
+    print("\n" + "=" * 60)
+    print("Test 28: File acJobsJobs.py, NomeTest: jobs.end incrementale")
+    print("=" * 60)
+    
+    from acJobsInbox import acJobsInbox, INBOX_ENDED
+    
+    test_passed = True
+    jOS = None
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sPathJobs = os.path.join(sDir, "jobs_mario")
+            os.makedirs(sPathJobs)
+            sFileJrn = os.path.join(sPathJobs, "jobs.jrn")
+            sFileEnd = os.path.join(sPathJobs, "jobs.end")
+            asJobs = [f"J{n}" for n in range(1, 21)]
+            with open(os.path.join(sPathJobs, "jobs.ini"), 'w', encoding='utf-8') as hFile:
+                hFile.write("[CONFIG]\nUSER = mario\n\n" + "".join(f"[{sJob}]\nACTION = SYS.T\n\n" for sJob in asJobs))
+            
+            jOS = JobsTestOS(sDir)
+            jOS.JobsStart_SetTab("JOBS_TAB_USERS", {"mario": {"USER": "mario", "USER_GROUPS": ""}})
+            jOS.jInbox = acJobsInbox()
+            assert jOS.jInbox.Start(os.path.join(sDir, "inbox")) == "", "Start inbox"
+            asMails = []
+            jOS.JobsMailUser = lambda sSubject, sText, sUser="", nDigest=0: asMails.append(sSubject) or ""
+            assert jOS.JobsInit(sPathJobs) == "", "JobsInit"
+            
+            # Test 28.1: Ogni job concluso è accodato al journal, leggibile durante l'esecuzione
+            print("\nTest 28.1: Sezioni accodate")
+            for sJob in asJobs[:-1]:
+                nSize = os.path.getsize(sFileJrn)
+                jOS.sJob = sJob
+                jOS.dictJob = dict(jOS.dictJobs[sJob])
+                jOS.tsJobStart = aiSys.Timestamp()
+                jOS.sAction = "SYS.T"
+                jOS.JobEnd("", f"Risultato {sJob}")
+                sSection = jOS.JobsJournalText(sJob, jOS.dictJobs[sJob])
+                assert os.path.getsize(sFileJrn) == nSize + len(sSection.encode("utf-8")), f"Journal riscritto al job {sJob}"
+                with open(sFileJrn, 'r', encoding='utf-8') as hFile:
+                    _, dictJrn = aiSys.ini_text_to_dict(hFile.read())
+                assert dictJrn[sJob]["RETURN.VALUE"] == f"Risultato {sJob}", f"Risultato di {sJob} non visibile"
+            assert not os.path.exists(sFileEnd), "jobs.end prima della conclusione"
+            print("  OK")
+            
+            # Test 28.2: Conclusione, journal rinominato in jobs.end con i jobs non eseguiti
+            print("\nTest 28.2: Rename in jobs.end")
+            assert jOS.JobsEnd() == "", "JobsEnd"
+            assert not os.path.exists(sFileJrn), "Journal rimasto"
+            assert [f for f in os.listdir(sPathJobs) if f.endswith(".tmp")] == [], "File temporanei rimasti"
+            _, dictEnd = aiSys.read_ini_to_dict(sFileEnd, bCache=False)
+            assert list(dictEnd) == ["CONFIG"] + asJobs, f"Sezioni di jobs.end: {list(dictEnd)}"
+            assert all(dictEnd[sJob]["RETURN.TYPE"] == "S" for sJob in asJobs[:-1]), "Risultati persi"
+            assert dictEnd[asJobs[-1]] == {"ACTION": "SYS.T"}, f"Job non eseguito: {dictEnd[asJobs[-1]]}"
+            assert jOS.jInbox.State(sPathJobs) == INBOX_ENDED, "Stato inbox non aggiornato"
+            assert asMails == ["Completamento jobs.ini"], f"Mail: {asMails}"
+            print("  OK")
+            
+            # Test 28.3: Senza journal, jobs.end scritto su file temporaneo e rinominato
+            print("\nTest 28.3: jobs.end senza journal")
+            jOS.sJobsPath = sPathJobs
+            jOS.dictJobs = {"CONFIG": {"USER": "mario"}, "J1": {"RETURN.TYPE": "E"}}
+            assert jOS.JobsJournalFinish(sFileEnd) == "", "JobsJournalFinish"
+            _, dictEnd = aiSys.read_ini_to_dict(sFileEnd, bCache=False)
+            assert dictEnd == jOS.dictJobs, f"jobs.end: {dictEnd}"
+            assert not os.path.exists(sFileEnd + ".tmp"), "File temporaneo rimasto"
+            sResult = jOS.JobsJournalFinish(os.path.join(sDir, "manca", "jobs.end"))
+            assert "Errore scrittura" in sResult, f"Errore non segnalato: {sResult}"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        if jOS is not None:
+            jOS.JobsJournalEnd()
+            if jOS.jInbox is not None:
+                jOS.jInbox.End()
+    
+    return test_passed
+
+
+def test_acJobsOlkSpool() -> bool:
+    """Test per acJobsOlkSpool.py (lotti di mail OLK, un processo alla volta)"""
+    print("\n" + "=" * 60)
+    print("Test 29: File acJobsOlkSpool.py, NomeTest: Spool OLK")
+    print("=" * 60)
+    
+    import time
+    from acJobsOlkSpool import acJobsOlkSpool
+    
+    test_passed = True
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sPathOlk = os.path.join(sDir, "olk")
+            os.makedirs(sPathOlk)
+            sFileSent = os.path.join(sDir, "inviati.log")
+            sFileGate = os.path.join(sDir, "attesa")
+            # Comando OLK: registra i soggetti del lotto, attende finché esiste il file di attesa
+            sScript = os.path.join(sDir, "olk.py")
+            with open(sScript, 'w', encoding='utf-8') as hFile:
+                hFile.write(f"#!{sys.executable}\n"
+                            "import sys, json, os, time\n"
+                            f"sDir = {sDir!r}\n"
+                            "sRun = os.path.join(sDir, 'in_corso')\n"
+                            "bOverlap = os.path.exists(sRun)\n"
+                            "open(sRun, 'w').close()\n"
+                            "while os.path.exists(os.path.join(sDir, 'attesa')):\n"
+                            "    time.sleep(0.05)\n"
+                            "d = json.load(open(sys.argv[1], encoding='utf-8'))\n"
+                            "asSubjects = [v['subject'] for k, v in d.items() if k.startswith('mail_')]\n"
+                            "with open(os.path.join(sDir, 'inviati.log'), 'a') as h:\n"
+                            "    h.write(('SOVRAPPOSTO ' if bOverlap else '') + ','.join(asSubjects) + '\\n')\n"
+                            "os.remove(sRun)\n"
+                            "sys.exit(1 if 'ERR' in asSubjects else 0)\n")
+            os.chmod(sScript, 0o755)
+            
+            def Sent():
+                if not os.path.exists(sFileSent):
+                    return []
+                with open(sFileSent, 'r') as hFile:
+                    return hFile.read().splitlines()
+            
+            def Batches(sExt=".json"):
+                return sorted(f for f in os.listdir(sPathOlk) if f.endswith(sExt))
+            
+            def WaitIdle(jSpool, nLines):
+                nLimit = time.time() + 15
+                while time.time() < nLimit:
+                    with jSpool.lock:
+                        bIdle = jSpool.jProc is None or jSpool.jProc.poll() is not None
+                    if len(Sent()) >= nLines and bIdle and not jSpool.asBatches and not jSpool.adictMails:
+                        # Chiude il processo terminato (lotto rimosso o rinominato)
+                        jSpool.Flush()
+                        return
+                    time.sleep(0.05)
+                raise AssertionError(f"Invio non concluso: {Sent()}")
+            
+            # Test 29.1: Mail arrivate durante un invio, lotti successivi di nBatchMax
+            print("\nTest 29.1: Lotti in sequenza")
+            jSpool = acJobsOlkSpool()
+            assert jSpool.Start(sPathOlk, sScript, nBatchMax=3) == "", "Start"
+            open(sFileGate, 'w').close()
+            assert jSpool.Put("a@x.it", "M1", "Testo") == "", "Put"
+            for nMail in range(2, 6):
+                assert jSpool.Put("a@x.it", f"M{nMail}", "Testo") == "", "Put"
+            assert len(jSpool.adictMails) == 4, f"Mail in attesa: {len(jSpool.adictMails)}"
+            os.remove(sFileGate)
+            WaitIdle(jSpool, 3)
+            assert Sent() == ["M1", "M2,M3,M4", "M5"], f"Lotti inviati: {Sent()}"
+            assert Batches() == [], f"Lotti rimasti: {Batches()}"
+            print("  OK")
+            
+            # Test 29.2: Lotto con errore rinominato in .err
+            print("\nTest 29.2: Lotto con errore")
+            jSpool.Put("a@x.it", "ERR", "Testo")
+            WaitIdle(jSpool, 4)
+            assert len(Batches(".err")) == 1 and Batches() == [], f"Lotti: {os.listdir(sPathOlk)}"
+            print("  OK")
+            
+            # Test 29.3: End scrive le mail in attesa, ripresi al riavvio con i lotti rimasti
+            print("\nTest 29.3: End e ripresa")
+            open(sFileGate, 'w').close()
+            jSpool.Put("a@x.it", "M6", "Testo")
+            jSpool.Put("a@x.it", "M7", "Testo")
+            jSpool.End()
+            assert len(Batches()) == 2 and jSpool.adictMails == [], f"Lotti scritti a End: {Batches()}"
+            os.remove(sFileGate)
+            WaitIdle(jSpool, 6)
+            assert Sent()[-2:] == ["M6", "M7"], f"Lotti inviati: {Sent()}"
+            with open(os.path.join(sPathOlk, "ntjobs_mail_1_1.json.tmp"), 'w') as hFile:
+                hFile.write("{")
+            jSpool.BatchWrite([{"to": ["a@x.it"], "subject": "M8"}])
+            jSpool = acJobsOlkSpool()
+            assert jSpool.Start(sPathOlk, sScript) == "", "Start con lotti rimasti"
+            WaitIdle(jSpool, 7)
+            assert Sent()[-1] == "M8", f"Lotto rimasto non inviato: {Sent()}"
+            assert Batches() == [] and Batches(".tmp") == [], f"Lotti: {os.listdir(sPathOlk)}"
+            assert not any(sLine.startswith("SOVRAPPOSTO") for sLine in Sent()), f"Processi sovrapposti: {Sent()}"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    
+    return test_passed
+
+
+def test_acJobsOSPool() -> bool:
+    """Test per acJobsOS.py (pool di worker e contesti di esecuzione)"""
+    print("\n" + "=" * 60)
+    print("Test 30: File acJobsOS.py, NomeTest: Pool di worker")
+    print("=" * 60)
+    
+    import time
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from acJobsOS import acJobsOS
+    from acJobsInbox import acJobsInbox, INBOX_ENDED, INBOX_QUEUED
+    
+    dictRun = {"nRunning": 0, "nMax": 0, "asThreads": set(), "asErrors": []}
+    lockRun = threading.Lock()
+    
+    class acJobsOSPool(acJobsOS):
+        """Exec lento: conta le esecuzioni contemporanee, conclude con jobs.end"""
+        def Exec(self, sPath):
+            with lockRun:
+                dictRun["nRunning"] += 1
+                dictRun["nMax"] = max(dictRun["nMax"], dictRun["nRunning"])
+                dictRun["asThreads"].add(threading.current_thread().name)
+            self.sJobsPath = sPath
+            time.sleep(0.3)
+            if self.sJobsPath != sPath:
+                dictRun["asErrors"].append(f"Contesto condiviso: {sPath} {self.sJobsPath}")
+            with open(os.path.join(sPath, "jobs.end"), 'w', encoding='utf-8') as hFile:
+                hFile.write("[J1]\nRETURN.TYPE = S\n")
+            self.jInbox.Set(sPath, INBOX_ENDED)
+            self.bExitOS = sPath.endswith("esci")
+            with lockRun:
+                dictRun["nRunning"] -= 1
+            return ""
+    
+    test_passed = True
+    jOS = None
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            sPathInbox = os.path.join(sDir, "inbox")
+            asItems = [f"jobs_{n}" for n in range(5)]
+            for sItem in asItems:
+                os.makedirs(os.path.join(sPathInbox, sItem))
+                with open(os.path.join(sPathInbox, sItem, "jobs.ini"), 'w', encoding='utf-8') as hFile:
+                    hFile.write("[CONFIG]\nUSER = mario\n\n[J1]\nACTION = TEST\n")
+            
+            jOS = acJobsOSPool()
+            jOS.jLog = JobsTestOS(sDir).jLog
+            jOS.sSys_PathInbox = sPathInbox
+            jOS.jInbox = acJobsInbox()
+            assert jOS.jInbox.Start(sPathInbox) == "", "Start inbox"
+            jOS.nWorkers = 3
+            jOS.jPool = ThreadPoolExecutor(max_workers=jOS.nWorkers, thread_name_prefix="aiJobsOS")
+            
+            # Test 30.1: Get affida i jobs.ini al pool senza attenderli
+            print("\nTest 30.1: Invio al pool")
+            nStart = time.monotonic()
+            assert jOS.Get() == "", "Get"
+            assert time.monotonic() - nStart < 0.25, "Get in attesa dei worker"
+            assert sorted(jOS.dictRunning) == [os.path.join(sPathInbox, s) for s in asItems], \
+                f"In esecuzione: {list(jOS.dictRunning)}"
+            assert jOS.Get() == "" and len(jOS.dictRunning) == 5, "jobs.ini in esecuzione inviati di nuovo"
+            print("  OK")
+            
+            # Test 30.2: Al più nWorkers in parallelo, contesti separati
+            print("\nTest 30.2: Esecuzione parallela")
+            jOS.ExecCollect(bWait=True)
+            assert jOS.dictRunning == {}, "Worker non raccolti"
+            assert dictRun["nMax"] == 3, f"Esecuzioni contemporanee: {dictRun['nMax']}"
+            assert all(s.startswith("aiJobsOS") for s in dictRun["asThreads"]), f"Thread: {dictRun['asThreads']}"
+            assert dictRun["asErrors"] == [], dictRun["asErrors"]
+            assert jOS.sJobsPath == "", f"Contesto principale modificato: {jOS.sJobsPath}"
+            assert jOS.jInbox.List(INBOX_QUEUED) == [], f"Stati: {jOS.jInbox.dictState}"
+            assert sorted(jOS.jInbox.List(INBOX_ENDED)) == asItems, f"Stati: {jOS.jInbox.dictState}"
+            assert jOS.evCycle.is_set(), "Attesa del ciclo non interrotta dai worker"
+            assert not jOS.bExitOS, "Uscita senza richiesta"
+            print("  OK")
+            
+            # Test 30.3: Richiesta di uscita da un worker propagata all'istanza principale
+            print("\nTest 30.3: Uscita da un worker")
+            sPath = os.path.join(sPathInbox, "jobs_esci")
+            os.makedirs(sPath)
+            with open(os.path.join(sPath, "jobs.ini"), 'w', encoding='utf-8') as hFile:
+                hFile.write("[CONFIG]\nUSER = mario\n")
+            jOS.jInbox.Set(sPath, INBOX_QUEUED)
+            jOS.jStat.Clear()
+            assert jOS.Get() == "" and not jOS.bExitOS, "Get"
+            jOS.ExecCollect(bWait=True)
+            assert jOS.bExitOS, "Uscita non propagata"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        if jOS is not None:
+            if jOS.jPool is not None:
+                jOS.jPool.shutdown(wait=True)
+            if jOS.jInbox is not None:
+                jOS.jInbox.End()
+    
+    return test_passed
+
+
+def test_acJobsOSLogErr() -> bool:
+    """Test per acJobsOS.py (errori di Exec e Archive nel log con LOG.LEVEL=ERR)"""
+    print("\n" + "=" * 60)
+    print("Test 31: File acJobsOS.py, NomeTest: Errori con livello ERR")
+    print("=" * 60)
+    
+    from acJobsInbox import acJobsInbox, INBOX_ENDED
+    
+    test_passed = True
+    jOS = None
+    
+    try:
+        with tempfile.TemporaryDirectory() as sDir:
+            jOS = JobsTestOS(sDir)
+            jOS.jLog.Options(bEcho=False, sLevel="ERR")
+            
+            def LogRead():
+                with open(jOS.jLog.sLog, 'r', encoding='utf-8') as hFile:
+                    return hFile.read()
+            
+            # Test 31.1: Errore di Exec (jobs.ini non leggibile)
+            print("\nTest 31.1: Exec fallito")
+            jOS.Log1("Riga informativa")
+            sPathJobs = os.path.join(sDir, "jobs_vuota")
+            os.makedirs(sPathJobs)
+            assert "Errore JobsInit" in jOS.Exec(sPathJobs), "Exec senza jobs.ini riuscito"
+            sLog = LogRead()
+            assert "Errore JobsInit" in sLog, f"Errore di Exec non nel log: {sLog!r}"
+            assert "Riga informativa" not in sLog, "Riga INFO scritta con livello ERR"
+            print("  OK")
+            
+            # Test 31.2: Errore di Archive (archivio sotto un file)
+            print("\nTest 31.2: Archive fallito")
+            jOS.sSys_PathInbox = os.path.join(sDir, "inbox")
+            os.makedirs(os.path.join(jOS.sSys_PathInbox, "jobs_fine"))
+            with open(os.path.join(sDir, "archivio"), 'w') as hFile:
+                hFile.write("file")
+            jOS.sSys_PathArchive = os.path.join(sDir, "archivio", "jobs")
+            jOS.jInbox = acJobsInbox()
+            assert jOS.jInbox.Start(jOS.sSys_PathInbox) == "", "Start inbox"
+            jOS.jInbox.Set("jobs_fine", INBOX_ENDED)
+            assert jOS.Archive() != "", "Archive in cartella non creabile riuscito"
+            assert "Errore spostamento, Folder: jobs_fine" in LogRead(), "Errore di Archive non nel log"
+            print("  OK")
+            
+            # Test 31.3: Errore di Exec da un worker, una sola riga nel log
+            print("\nTest 31.3: ExecWorker fallito")
+            sPathJobs = os.path.join(sDir, "jobs_worker")
+            os.makedirs(sPathJobs)
+            jOS.ExecWorker(sPathJobs)
+            nLines = sum("Errore JobsInit" in sLine and sPathJobs in sLine for sLine in LogRead().splitlines())
+            assert nLines == 1, f"Errore di Exec scritto {nLines} volte"
+            print("  OK")
+        
+    except AssertionError as e:
+        print(f"  ❌ Assert fallito: {e}")
+        test_passed = False
+    except Exception as e:
+        print(f"  ❌ Errore durante il test: {e}")
+        test_passed = False
+    finally:
+        if jOS is not None and jOS.jInbox is not None:
+            jOS.jInbox.End()
+    
+    return test_passed
+
+
 # Esegui i test quando il file viene eseguito direttamente
 if __name__ == "__main__":
     run_tests()
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""Modulo per l'osservazione di cartelle tramite inotify (solo Linux)"""
+from typing import Dict, Any, Optional, Union, List
+import os
+import sys
+import select
+import struct
+import ctypes
+import ctypes.util
+from aiSysBase import ErrorProc
+
+# Crea alias locali
+loc_ErrorProc = ErrorProc
+
+# Costanti inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o00004000
+IN_CLOEXEC = 0o02000000
+
+# Evento: int wd, uint32 mask, uint32 cookie, uint32 len, char name[len]
+WATCH_EVENT = struct.Struct("iIII")
+
+
+class acWatch:
+    """Classe per l'osservazione di file in arrivo in un insieme di cartelle"""
+
+    def __init__(self):
+        """Inizializza l'oggetto watch"""
+        self.nFd = -1
+        self.bActive = False
+        self.dictWd = {}          # Watch descriptor -> path osservato
+        self.asNames = []         # Nomi file attesi (minuscoli)
+        self.asPathsPoll = []     # Path non osservabili, da scandire a polling
+        self.asEvents = []        # Path con file in arrivo non ancora consumati
+        self.bOverflow = False    # Coda eventi del kernel persa
+        self.libc = None
+        self.nWakeR = -1          # Pipe di risveglio di Wait da altri thread
+        self.nWakeW = -1
+
+    def Start(self, asPaths: List[str], asNames: List[str]) -> str:
+        """
+        Avvia l'osservazione delle cartelle per i file indicati.
+
+        Args:
+            asPaths: Cartelle da osservare
+            asNames: Nomi dei file attesi (es. jobs.ini)
+
+        Returns:
+            str: sResult, vuoto se inotify disponibile
+        """
+        sProc = "Start"
+        sResult = ""
+
+        self.asNames = [sName.lower() for sName in asNames]
+        self.asPathsPoll = list(asPaths)
+
+        try:
+            if not sys.platform.startswith("linux"):
+                sResult = f"inotify non disponibile su {sys.platform}"
+            else:
+                sLibc = ctypes.util.find_library("c")
+                self.libc = ctypes.CDLL(sLibc, use_errno=True)
+                self.nFd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+                if self.nFd < 0:
+                    sResult = f"inotify_init1 fallita: {os.strerror(ctypes.get_errno())}"
+        except Exception as e:
+            sResult = f"Errore inizializzazione inotify: {str(e)}"
+
+        if sResult != "":
+            self.nFd = -1
+            return loc_ErrorProc(sResult, sProc)
+
+        self.nWakeR, self.nWakeW = os.pipe()
+        os.set_blocking(self.nWakeR, False)
+        os.set_blocking(self.nWakeW, False)
+
+        self.bActive = True
+        self.asPathsPoll = []
+
+        for sPath in asPaths:
+            if not self.Add(sPath):
+                self.asPathsPoll.append(sPath)
+
+        return sResult
+
+    def Add(self, sPath: str) -> bool:
+        """
+        Aggiunge una cartella all'osservazione.
+
+        Args:
+            sPath: Cartella da osservare
+
+        Returns:
+            bool: True se la cartella è osservata, False se va scandita a polling
+        """
+        if not self.bActive:
+            return False
+
+        try:
+            nWd = self.libc.inotify_add_watch(self.nFd, os.fsencode(sPath),
+                                              IN_CLOSE_WRITE | IN_MOVED_TO)
+        except Exception:
+            return False
+
+        if nWd < 0:
+            return False
+
+        self.dictWd[nWd] = sPath
+        return True
+
+    def Remove(self, sPath: str) -> None:
+        """
+        Toglie una cartella dall'osservazione (e dal polling).
+
+        Args:
+            sPath: Cartella da non osservare più
+        """
+        for nWd in [nWd for nWd, sPathWd in self.dictWd.items() if sPathWd == sPath]:
+            del self.dictWd[nWd]
+            try:
+                self.libc.inotify_rm_watch(self.nFd, nWd)
+            except Exception:
+                pass
+        if sPath in self.asPathsPoll:
+            self.asPathsPoll.remove(sPath)
+        if sPath in self.asEvents:
+            self.asEvents.remove(sPath)
+
+    def Wait(self, nTimeout: float) -> bool:
+        """
+        Attende l'arrivo di file per al massimo nTimeout secondi.
+
+        Args:
+            nTimeout: Secondi massimi di attesa
+
+        Returns:
+            bool: True se ci sono eventi da consumare
+        """
+        if not self.bActive:
+            return False
+
+        if not self.asEvents:
+            try:
+                select.select([self.nFd, self.nWakeR], [], [], max(0, nTimeout))
+            except InterruptedError:
+                pass
+
+        # Svuota la pipe di risveglio
+        try:
+            while os.read(self.nWakeR, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+        self._read()
+        return bool(self.asEvents) or self.bOverflow
+
+    def Wake(self) -> None:
+        """Interrompe una Wait in corso (chiamabile da altri thread)."""
+        if self.nWakeW < 0:
+            return
+        try:
+            os.write(self.nWakeW, b"w")
+        except (BlockingIOError, OSError):
+            pass
+
+    def Events(self) -> List[str]:
+        """
+        Ritorna e azzera le cartelle in cui sono arrivati i file attesi.
+
+        Returns:
+            List[str]: Cartelle con eventi, senza duplicati
+        """
+        self._read()
+        asEvents = self.asEvents
+        self.asEvents = []
+        return asEvents
+
+    def _read(self) -> None:
+        """Legge tutti gli eventi disponibili senza bloccare."""
+        if not self.bActive:
+            return
+
+        while True:
+            try:
+                data = os.read(self.nFd, 65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+
+            if not data:
+                return
+
+            nPos = 0
+            while nPos + WATCH_EVENT.size <= len(data):
+                nWd, nMask, _, nLen = WATCH_EVENT.unpack_from(data, nPos)
+                nPos += WATCH_EVENT.size
+                sName = os.fsdecode(data[nPos:nPos + nLen].rstrip(b"\0"))
+                nPos += nLen
+
+                if nMask & IN_Q_OVERFLOW:
+                    # Eventi persi: il chiamante deve riscandire tutto
+                    self.bOverflow = True
+                    continue
+
+                if nMask & IN_IGNORED:
+                    # Cartella rimossa o smontata: passa a polling
+                    sPath = self.dictWd.pop(nWd, "")
+                    if sPath and sPath not in self.asPathsPoll:
+                        self.asPathsPoll.append(sPath)
+                    continue
+
+                sPath = self.dictWd.get(nWd, "")
+                if sPath and sName.lower() in self.asNames and sPath not in self.asEvents:
+                    self.asEvents.append(sPath)
+
+    def End(self) -> None:
+        """Chiude il descrittore inotify."""
+        if self.nFd >= 0:
+            try:
+                os.close(self.nFd)
+            except OSError:
+                pass
+        for nFd in (self.nWakeR, self.nWakeW):
+            if nFd >= 0:
+                try:
+                    os.close(nFd)
+                except OSError:
+                    pass
+        self.nFd = -1
+        self.nWakeR = -1
+        self.nWakeW = -1
+        self.bActive = False
+        self.dictWd = {}
@@ -3,6 +3,11 @@
 
 import smtplib
 import socket
+import re
+import uuid
+import zlib
+import base64
+import email.policy
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
@@ -30,6 +35,11 @@ class NC_MailSimple:
         self.bReconnect = True  # Default: tentativo di riconnessione automatica
         self.bLogin = False
         self.smtp = None
+        self.nIdleCheck = 60  # Secondi di inattività oltre i quali la connessione è verificata con NOOP
+        self.tsLastUse = 0.0  # Ultimo uso riuscito della connessione (monotonic)
+        self.nStreamSize = 1048576  # Allegati oltre questa dimensione totale: invio in streaming
+        self.nZipSize = 0  # Allegati oltre questa dimensione compressi con gzip (0 = mai)
+        self.nChunkSize = 57 * 1024  # Byte letti per blocco (multiplo di 57: righe base64 complete)
         self.asLogging = []  # Log delle operazioni
 
     def _add_log(self, sMessage: str):
@@ -76,6 +86,7 @@ class NC_MailSimple:
             
             self.smtp.login(self.sSmtp_User, self.sSmtp_Password)
             self.bLogin = True
+            self.tsLastUse = time.monotonic()
             self._add_log("Connessione e login effettuati con successo")
             return self.sResult
             
@@ -125,7 +136,12 @@ class NC_MailSimple:
 
     def _ensure_connection(self) -> bool:
         """Garantisce che la connessione sia attiva (con riconnessione se necessario)"""
+        # Connessione usata di recente: nessun NOOP
+        if self.bLogin and self.smtp and time.monotonic() - self.tsLastUse < self.nIdleCheck:
+            return True
+        
         if self.VerifyConnect():
+            self.tsLastUse = time.monotonic()
             return True
         
         if not self.bReconnect:
@@ -182,6 +198,17 @@ class NC_MailSimple:
             msg.attach(MIMEText(self.sBody, 'html' if self.sFormat == "HTML" else 'plain'))
             self._add_log(f"Aggiunto corpo messaggio (formato: {self.sFormat})")
             
+            # Allegati grandi o da comprimere: invio in streaming a memoria costante
+            if self._stream_needed():
+                self.sResult = self._send_stream(msg)
+                if not self.sResult:
+                    self.tsLastUse = time.monotonic()
+                    self._add_log("Email inviata con successo (streaming)")
+                    return self.sResult
+                self._add_log(self.sResult)
+                self._safe_quit()
+                return self.sResult
+            
             # Aggiunta allegati
             for file_path in self.asAttach:
                 try:
@@ -207,6 +234,7 @@ class NC_MailSimple:
             # Invio email
             self._add_log("Invio email in corso...")
             self.smtp.sendmail(self.sSmtp_User, self.asTo, msg.as_string())
+            self.tsLastUse = time.monotonic()
             self._add_log("Email inviata con successo")
             return self.sResult
             
@@ -218,8 +246,96 @@ class NC_MailSimple:
             self.sResult = f"{self.sProc}: Errore generico durante l'invio - {str(e)}"
         
         self._add_log(f"Errore durante l'invio: {self.sResult}")
+        # Connessione in stato incerto: il prossimo invio si riconnette
+        self._safe_quit()
         return self.sResult
 
+    def _stream_needed(self) -> bool:
+        """Verifica se gli allegati vanno inviati in streaming"""
+        nTotal = 0
+        for file_path in self.asAttach:
+            if os.path.isfile(file_path):
+                nSize = os.path.getsize(file_path)
+                if self.nZipSize > 0 and nSize > self.nZipSize:
+                    return True
+                nTotal += nSize
+        return nTotal > self.nStreamSize
+
+    def _encode_chunks(self, file_path: str, bZip: bool):
+        """Legge il file a blocchi e restituisce righe base64 (CRLF), compresse con gzip se bZip"""
+        jZip = zlib.compressobj(6, zlib.DEFLATED, 31) if bZip else None
+        bufPending = b""
+        with open(file_path, "rb") as f:
+            while True:
+                bufRead = f.read(self.nChunkSize)
+                if jZip is not None:
+                    bufPending += jZip.compress(bufRead) if bufRead else jZip.flush()
+                else:
+                    bufPending += bufRead
+                # Solo multipli di 57 byte: ogni blocco termina a fine riga base64
+                nLen = len(bufPending) if not bufRead else len(bufPending) - len(bufPending) % 57
+                if nLen:
+                    yield base64.encodebytes(bufPending[:nLen]).replace(b"\n", b"\r\n")
+                    bufPending = bufPending[nLen:]
+                if not bufRead:
+                    break
+
+    def _send_stream(self, msg: MIMEMultipart) -> str:
+        """
+        Invia il messaggio scrivendo gli allegati, codificati a blocchi,
+        direttamente nel comando DATA della connessione SMTP.
+        """
+        sProc = "SendStream"
+        
+        for file_path in self.asAttach:
+            if not os.path.isfile(file_path):
+                return f"{sProc}: Errore - File non trovato: {file_path}"
+        
+        # Intestazioni e testo: il messaggio senza allegati, senza il boundary finale
+        sBoundary = f"=_ntjobs_{uuid.uuid4().hex}"
+        msg.set_boundary(sBoundary)
+        bufHead = msg.as_bytes(policy=email.policy.SMTP)
+        bufHead = bufHead[:bufHead.rindex(f"--{sBoundary}--".encode())]
+        bufHead = re.sub(rb"(?m)^\.", b"..", bufHead)
+        
+        self.smtp.ehlo_or_helo_if_needed()
+        nCode, bufResp = self.smtp.mail(self.sSmtp_User)
+        if nCode != 250:
+            raise smtplib.SMTPSenderRefused(nCode, bufResp, self.sSmtp_User)
+        dictRefused = {}
+        for sTo in self.asTo:
+            nCode, bufResp = self.smtp.rcpt(sTo)
+            if nCode not in (250, 251):
+                dictRefused[sTo] = (nCode, bufResp)
+        if len(dictRefused) == len(self.asTo):
+            self.smtp.rset()
+            raise smtplib.SMTPRecipientsRefused(dictRefused)
+        nCode, bufResp = self.smtp.docmd("DATA")
+        if nCode != 354:
+            raise smtplib.SMTPDataError(nCode, bufResp)
+        
+        self.smtp.send(bufHead)
+        for file_path in self.asAttach:
+            filename = os.path.basename(file_path)
+            bZip = self.nZipSize > 0 and os.path.getsize(file_path) > self.nZipSize
+            part = MIMEBase("application", "gzip" if bZip else "octet-stream")
+            part["Content-Transfer-Encoding"] = "base64"
+            part.add_header("Content-Disposition", "attachment",
+                            filename=filename + ".gz" if bZip else filename)
+            bufPart = f"--{sBoundary}\r\n".encode()
+            for sKey, sValue in part.items():
+                bufPart += email.policy.SMTP.fold_binary(sKey, sValue)
+            self.smtp.send(bufPart + b"\r\n")
+            for bufChunk in self._encode_chunks(file_path, bZip):
+                self.smtp.send(bufChunk)
+            self._add_log(f"Aggiunto allegato in streaming: {filename}{' (gzip)' if bZip else ''}")
+        self.smtp.send(f"--{sBoundary}--\r\n.\r\n".encode())
+        
+        nCode, bufResp = self.smtp.getreply()
+        if nCode != 250:
+            raise smtplib.SMTPDataError(nCode, bufResp)
+        return ""
+
     def Logoff(self) -> str:
         """Effettua il logout dal server SMTP"""
         self.sProc = "Logoff"